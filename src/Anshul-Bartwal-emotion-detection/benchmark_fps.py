@@ -0,0 +1,88 @@
+# FPS benchmark on a recorded video.
+#
+# Runs the same frames through two inference paths and prints frames per second:
+#   per-face : the original approach, one Keras model.predict() call per face
+#   batched  : EmotionClassifier, all faces of a frame in one compiled call
+#
+# Usage:
+#   python benchmark_fps.py recording.mp4 --frames 300
+
+import time
+import argparse
+
+import cv2
+import numpy as np
+
+from emotion_pipeline import EMOTION_LABELS, FACE_SIZE, EmotionClassifier, load_face_cascade, detect_faces
+
+
+def read_frames(video_path, max_frames):
+    # Decode up front so decoding speed does not affect the comparison
+    cap = cv2.VideoCapture(video_path)
+    frames = []
+    while len(frames) < max_frames:
+        ret, frame = cap.read()
+        if not ret:
+            break
+        frames.append(frame)
+    cap.release()
+    return frames
+
+
+def predict_per_face(model, gray, faces):
+    # The original code path: preprocess and predict every face separately
+    emotions = []
+    for (x, y, w, h) in faces:
+        face = cv2.resize(gray[y:y+h, x:x+w], (FACE_SIZE, FACE_SIZE)) / 255.0
+        predictions = model.predict(np.reshape(face, (1, FACE_SIZE, FACE_SIZE, 1)), verbose=0)
+        emotions.append(EMOTION_LABELS[np.argmax(predictions)])
+    return emotions
+
+
+def run(frames, face_cascade, predict):
+    """Detect and classify every frame; returns (seconds, faces seen, labels per frame)"""
+    face_count = 0
+    labels = []
+    start = time.perf_counter()
+    for frame in frames:
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        faces = detect_faces(face_cascade, gray)
+        face_count += len(faces)
+        labels.append(predict(gray, faces))
+    return time.perf_counter() - start, face_count, labels
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Emotion detection FPS benchmark on a recorded video")
+    parser.add_argument("video", help="path to a video file with faces in it")
+    parser.add_argument("--frames", type=int, default=300, help="maximum number of frames to use")
+    args = parser.parse_args()
+
+    frames = read_frames(args.video, args.frames)
+    if not frames:
+        print(f"Error: could not read any frames from {args.video}")
+        return
+
+    face_cascade = load_face_cascade()
+    classifier = EmotionClassifier()
+
+    # Warm up Keras predict() so its first-call setup is not counted
+    classifier.model.predict(np.zeros((1, FACE_SIZE, FACE_SIZE, 1), np.float32), verbose=0)
+
+    results = {
+        'per-face': run(frames, face_cascade, lambda gray, faces: predict_per_face(classifier.model, gray, faces)),
+        'batched': run(frames, face_cascade, classifier.predict),
+    }
+
+    faces_per_frame = results['batched'][1] / len(frames)
+    print(f"{len(frames)} frames, {faces_per_frame:.2f} faces per frame on average\n")
+    print(f"{'mode':<10}{'FPS':>10}{'ms/frame':>12}")
+    for mode, (seconds, _, _) in results.items():
+        print(f"{mode:<10}{len(frames) / seconds:>10.1f}{seconds / len(frames) * 1000:>12.2f}")
+
+    matching = sum(a == b for a, b in zip(results['per-face'][2], results['batched'][2]))
+    print(f"\nFrames with identical labels in both modes: {matching}/{len(frames)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+# Shared face detection and batched emotion inference used by EmotionDetection.py,
+# benchmark_fps.py and offline.py.
+#
+# All faces found in a frame are preprocessed into one preallocated float32 batch
+# and classified with a single call of a compiled tf.function, instead of one
+# Keras model.predict() call per face.
+
+import os
+import cv2
+import numpy as np
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+MODEL_FILE = os.path.join(BASE_DIR, "_mini_XCEPTION.102-0.66.hdf5")
+
+# Emotion labels (assumes 7 emotions as per the dataset)
+EMOTION_LABELS = ['Angry', 'Disgust', 'Fear', 'Happy', 'Sad', 'Surprise', 'Neutral']
+
+# The model expects 64x64 grayscale faces scaled to [0, 1]
+FACE_SIZE = 64
+
+
+def load_face_cascade():
+    # OpenCV's pre-trained Haar Cascade classifier for face detection
+    return cv2.CascadeClassifier(cv2.data.haarcascades + 'haarcascade_frontalface_default.xml')
+
+
+def detect_faces(face_cascade, gray):
+    # Returns an array of (x, y, w, h) boxes for the faces in a grayscale frame
+    return face_cascade.detectMultiScale(gray, 1.3, 5)
+
+
+def annotate(frame, faces, emotions):
+    for (x, y, w, h), emotion in zip(faces, emotions):
+        # Draw a rectangle around the face
+        cv2.rectangle(frame, (x, y), (x+w, y+h), (255, 255, 255), 2)
+
+        # Display the predicted emotion label above the rectangle
+        cv2.putText(frame, emotion, (x, y-10), cv2.FONT_HERSHEY_DUPLEX, 1, (255, 255, 255), 2)
+
+
+class FaceTracker:
+    """
+    Runs the Haar detector on a downscaled copy of the frame every
+    `detect_every` frames and follows the faces in between by template
+    matching near their last position, which is much cheaper than detecting.
+    """
+
+    def __init__(self, face_cascade, scale=0.5, detect_every=5, min_match=0.6):
+        self.face_cascade = face_cascade
+        self.scale = scale
+        self.detect_every = detect_every
+        self.min_match = min_match
+        self.faces = []
+        self.templates = []
+        self.frames_since_detect = 0
+
+    def detect(self, gray):
+        small = cv2.resize(gray, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        faces = detect_faces(self.face_cascade, small)
+        self.faces = [tuple(int(round(v / self.scale)) for v in face) for face in faces]
+        self.templates = [gray[y:y+h, x:x+w].copy() for (x, y, w, h) in self.faces]
+        self.frames_since_detect = 0
+
+    def track(self, gray):
+        frame_h, frame_w = gray.shape
+        faces = []
+        templates = []
+        for (x, y, w, h), template in zip(self.faces, self.templates):
+            # Look for the face within half its size around the old position
+            margin_x, margin_y = w // 2, h // 2
+            left, top = max(0, x - margin_x), max(0, y - margin_y)
+            right, bottom = min(frame_w, x + w + margin_x), min(frame_h, y + h + margin_y)
+            region = gray[top:bottom, left:right]
+            if region.shape[0] < h or region.shape[1] < w:
+                continue
+            result = cv2.matchTemplate(region, template, cv2.TM_CCOEFF_NORMED)
+            _, score, _, (match_x, match_y) = cv2.minMaxLoc(result)
+            if score >= self.min_match:
+                faces.append((left + match_x, top + match_y, w, h))
+                templates.append(template)
+        self.faces = faces
+        self.templates = templates
+        self.frames_since_detect += 1
+
+    def update(self, gray):
+        """Face boxes (x, y, w, h) in full-resolution coordinates for this frame"""
+        if not self.faces or self.frames_since_detect + 1 >= self.detect_every:
+            self.detect(gray)
+        else:
+            self.track(gray)
+        return self.faces
+
+
+class EmotionClassifier:
+    """
+    Classifies every face in a frame with one model call.
+    The input batch is allocated once and grown only when a frame has more
+    faces than ever seen before.
+    """
+
+    def __init__(self, model_path=MODEL_FILE, max_faces=8):
+        # this might take a while the first time: TensorFlow is imported and the graph is traced
+        import tensorflow as tf
+        from tensorflow.keras.models import load_model
+
+        # Inference only, so the optimizer state is not needed
+        self.model = load_model(model_path, compile=False)
+
+        # A compiled graph with a dynamic batch size avoids the per-call overhead
+        # of model.predict() and is traced only once for any number of faces
+        self._infer = tf.function(
+            lambda batch: self.model(batch, training=False),
+            input_signature=[tf.TensorSpec([None, FACE_SIZE, FACE_SIZE, 1], tf.float32)],
+        )
+
+        self.batch = np.empty((max_faces, FACE_SIZE, FACE_SIZE, 1), np.float32)
+        self._resized = np.empty((FACE_SIZE, FACE_SIZE), np.uint8)
+
+        # Warm up so the first real frame does not pay for tracing
+        self._infer(self.batch[:1])
+
+    def preprocess(self, gray, faces):
+        """Write the faces of a grayscale frame into the batch buffer; returns the face count"""
+        count = len(faces)
+        if count > len(self.batch):
+            self.batch = np.empty((max(count, 2 * len(self.batch)), FACE_SIZE, FACE_SIZE, 1), np.float32)
+
+        for i, (x, y, w, h) in enumerate(faces):
+            # Resize to 64x64 and normalize pixel values (0-255 to 0-1) in place
+            cv2.resize(gray[y:y+h, x:x+w], (FACE_SIZE, FACE_SIZE), dst=self._resized)
+            np.multiply(self._resized, 1 / 255.0, out=self.batch[i, :, :, 0], casting='unsafe')
+        return count
+
+    def infer(self, count):
+        """Emotion probabilities for the first `count` faces in the batch buffer"""
+        if count == 0:
+            return np.empty((0, len(EMOTION_LABELS)), np.float32)
+        return self._infer(self.batch[:count]).numpy()
+
+    def predict_probabilities(self, gray, faces):
+        """Emotion probabilities, one row per face"""
+        return self.infer(self.preprocess(gray, faces))
+
+    def predict(self, gray, faces):
+        """Emotion label of every face in a grayscale frame"""
+        probabilities = self.predict_probabilities(gray, faces)
+        return [EMOTION_LABELS[i] for i in np.argmax(probabilities, axis=1)]
@@ -0,0 +1,130 @@
+# Threaded capture -> detect -> infer pipeline for live emotion detection.
+#
+# A capture thread reads frames and a detection thread finds or tracks faces.
+# Inference runs on the caller's thread, because cv2.imshow has to be called
+# from there as well. The stages are connected by queues that hold a single
+# item: when a stage falls behind, the stale frame waiting for it is dropped.
+# It always works on the newest frame, so latency does not build up.
+
+import time
+import queue
+import threading
+
+import cv2
+
+# Put on a queue to tell the next stage that the input has ended. Unlike
+# frames it is never dropped: it waits until the next stage has room for it.
+END_OF_STREAM = None
+
+
+def put_latest(q, item):
+    """Put an item on a bounded queue, dropping the oldest one if it is full; returns True if a frame was dropped"""
+    dropped = False
+    while True:
+        try:
+            q.put_nowait(item)
+            return dropped
+        except queue.Full:
+            try:
+                q.get_nowait()
+                dropped = True
+            except queue.Empty:
+                pass
+
+
+class LivePipeline:
+    """
+    source is a webcam index or a video file path. Video files are played back
+    at their own frame rate when realtime is True, so they behave like a camera.
+    """
+
+    def __init__(self, source, classifier, tracker, realtime=True):
+        self.source = source
+        self.classifier = classifier
+        self.tracker = tracker
+        self.realtime = realtime
+
+        self.frames = queue.Queue(maxsize=1)
+        self.detections = queue.Queue(maxsize=1)
+        self.stop_event = threading.Event()
+        self.error = None
+
+        # Statistics
+        self.captured = 0
+        self.dropped = 0
+        self.processed = 0
+        self.latencies = []
+
+        self.threads = [
+            threading.Thread(target=self._capture, name="capture", daemon=True),
+            threading.Thread(target=self._detect, name="detect", daemon=True),
+        ]
+
+    def start(self):
+        for thread in self.threads:
+            thread.start()
+        return self
+
+    def stop(self):
+        self.stop_event.set()
+
+    def _capture(self):
+        cap = cv2.VideoCapture(self.source)
+        if not cap.isOpened():
+            self.error = f"Error: could not open video source {self.source!r}"
+            self.frames.put(END_OF_STREAM)
+            return
+
+        is_file = isinstance(self.source, str)
+        fps = cap.get(cv2.CAP_PROP_FPS) or 30
+        start = time.perf_counter()
+        while not self.stop_event.is_set():
+            ret, frame = cap.read()
+            if not ret:
+                if not is_file:
+                    self.error = "Error: Failed to capture frame from camera."
+                break
+            if is_file and self.realtime:
+                # Wait until this frame would have been shown by a camera
+                delay = start + self.captured / fps - time.perf_counter()
+                if delay > 0:
+                    time.sleep(delay)
+            self.captured += 1
+            if put_latest(self.frames, (time.perf_counter(), frame)):
+                self.dropped += 1
+        cap.release()
+        self.frames.put(END_OF_STREAM)
+
+    def _detect(self):
+        while True:
+            item = self.frames.get()
+            if item is END_OF_STREAM:
+                break
+            captured_at, frame = item
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            faces = self.tracker.update(gray)
+            if put_latest(self.detections, (captured_at, frame, gray, faces)):
+                self.dropped += 1
+        self.detections.put(END_OF_STREAM)
+
+    def results(self):
+        """Yield (frame, faces, emotions) for the newest frames until the input ends or stop() is called"""
+        while not self.stop_event.is_set():
+            item = self.detections.get()
+            if item is END_OF_STREAM:
+                break
+            captured_at, frame, gray, faces = item
+            emotions = self.classifier.predict(gray, faces)
+            self.processed += 1
+            self.latencies.append(time.perf_counter() - captured_at)
+            yield frame, faces, emotions
+        self.stop()
+
+    def summary(self):
+        if not self.latencies:
+            return f"Captured {self.captured} frames, none processed."
+        latencies = sorted(self.latencies)
+        average = sum(latencies) / len(latencies)
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        return (f"Captured {self.captured} frames, processed {self.processed}, dropped {self.dropped} stale frames. "
+                f"Latency: avg {average * 1000:.1f} ms, p95 {p95 * 1000:.1f} ms")
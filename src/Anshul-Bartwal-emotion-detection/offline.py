@@ -0,0 +1,275 @@
+# Offline emotion annotation for video files and image directories.
+#
+# No webcam or display is needed. The inputs are split into work units (video
+# segments or chunks of images) that are processed by a pool of worker
+# processes, each loading the model once. The results are written per frame
+# to JSONL or CSV, and the time spent in every stage (decode, detect,
+# preprocess, infer) is reported at the end.
+#
+# Usage:
+#   python offline.py clips/interview.mp4 photos/ -o annotations.jsonl
+#   python offline.py archive/ -o annotations.csv --workers 4 --stats throughput.jsonl
+
+import os
+import csv
+import json
+import time
+import argparse
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+
+import cv2
+
+from emotion_pipeline import EMOTION_LABELS, EmotionClassifier, FaceTracker, load_face_cascade
+
+VIDEO_EXTENSIONS = {'.mp4', '.avi', '.mov', '.mkv', '.webm', '.m4v', '.mpg', '.mpeg', '.wmv'}
+IMAGE_EXTENSIONS = {'.jpg', '.jpeg', '.png', '.bmp', '.tif', '.tiff', '.webp'}
+STAGES = ('decode', 'detect', 'preprocess', 'infer')
+
+# Set up once in every worker process by init_worker()
+_classifier = None
+_face_cascade = None
+
+
+def init_worker(threads_per_worker):
+    global _classifier, _face_cascade
+    # Several workers share the CPU, so keep each one from starting a thread per core
+    cv2.setNumThreads(threads_per_worker)
+    import tensorflow as tf
+    tf.config.threading.set_intra_op_parallelism_threads(threads_per_worker)
+    tf.config.threading.set_inter_op_parallelism_threads(threads_per_worker)
+    _classifier = EmotionClassifier()
+    _face_cascade = load_face_cascade()
+
+
+def collect_work(inputs, segment_frames, images_per_task):
+    """
+    Split the inputs into work units:
+    ('video', path, first_frame, frame_count) or ('images', [paths]).
+    """
+    work = []
+    images = []
+    for path in inputs:
+        if os.path.isdir(path):
+            for root, _, files in os.walk(path):
+                for name in sorted(files):
+                    extension = os.path.splitext(name)[1].lower()
+                    full_path = os.path.join(root, name)
+                    if extension in IMAGE_EXTENSIONS:
+                        images.append(full_path)
+                    elif extension in VIDEO_EXTENSIONS:
+                        work.extend(video_segments(full_path, segment_frames))
+        elif os.path.splitext(path)[1].lower() in IMAGE_EXTENSIONS:
+            images.append(path)
+        else:
+            work.extend(video_segments(path, segment_frames))
+
+    for start in range(0, len(images), images_per_task):
+        work.append(('images', images[start:start + images_per_task]))
+    return work
+
+
+def video_segments(path, segment_frames):
+    # Long videos are cut into segments so several workers can share one file
+    cap = cv2.VideoCapture(path)
+    total = int(cap.get(cv2.CAP_PROP_FRAME_COUNT)) if cap.isOpened() else 0
+    cap.release()
+    if total <= 0:
+        # Unknown length: process the whole file in one unit
+        return [('video', path, 0, None)]
+    return [('video', path, start, min(segment_frames, total - start))
+            for start in range(0, total, segment_frames)]
+
+
+def classify(gray, faces, timings):
+    start = time.perf_counter()
+    count = _classifier.preprocess(gray, faces)
+    timings['preprocess'] += time.perf_counter() - start
+
+    start = time.perf_counter()
+    probabilities = _classifier.infer(count)
+    timings['infer'] += time.perf_counter() - start
+    return probabilities
+
+
+def frame_record(source, frame_index, time_s, faces, probabilities):
+    return {
+        'source': source,
+        'frame': frame_index,
+        'time_s': time_s,
+        'faces': [
+            {
+                'box': [int(v) for v in face],
+                'emotion': EMOTION_LABELS[int(row.argmax())],
+                'confidence': round(float(row.max()), 4),
+            }
+            for face, row in zip(faces, probabilities)
+        ],
+    }
+
+
+def process_video(path, first_frame, frame_count, detect_every, scale):
+    timings = dict.fromkeys(STAGES, 0.0)
+    records = []
+    cap = cv2.VideoCapture(path)
+    if not cap.isOpened():
+        return records, timings, f"could not open {path}"
+    fps = cap.get(cv2.CAP_PROP_FPS) or 0
+    if first_frame:
+        cap.set(cv2.CAP_PROP_POS_FRAMES, first_frame)
+
+    tracker = FaceTracker(_face_cascade, scale=scale, detect_every=detect_every)
+    frame_index = first_frame
+    while frame_count is None or frame_index < first_frame + frame_count:
+        start = time.perf_counter()
+        ret, frame = cap.read()
+        if not ret:
+            break
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+        timings['decode'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        faces = tracker.update(gray)
+        timings['detect'] += time.perf_counter() - start
+
+        probabilities = classify(gray, faces, timings)
+        time_s = round(frame_index / fps, 3) if fps else None
+        records.append(frame_record(path, frame_index, time_s, faces, probabilities))
+        frame_index += 1
+    cap.release()
+    return records, timings, None
+
+
+def process_images(paths, scale):
+    timings = dict.fromkeys(STAGES, 0.0)
+    records = []
+    errors = []
+    # Every image is detected on its own, there is nothing to track between them
+    tracker = FaceTracker(_face_cascade, scale=scale, detect_every=1)
+    for path in paths:
+        start = time.perf_counter()
+        image = cv2.imread(path)
+        if image is None:
+            errors.append(f"could not read {path}")
+            continue
+        gray = cv2.cvtColor(image, cv2.COLOR_BGR2GRAY)
+        timings['decode'] += time.perf_counter() - start
+
+        start = time.perf_counter()
+        faces = tracker.update(gray)
+        timings['detect'] += time.perf_counter() - start
+
+        probabilities = classify(gray, faces, timings)
+        records.append(frame_record(path, 0, None, faces, probabilities))
+    return records, timings, "; ".join(errors) or None
+
+
+def process_unit(unit, detect_every, scale):
+    """Runs in a worker process; returns (frame records, stage timings, error message or None)"""
+    if unit[0] == 'video':
+        _, path, first_frame, frame_count = unit
+        return process_video(path, first_frame, frame_count, detect_every, scale)
+    return process_images(unit[1], scale)
+
+
+class AnnotationWriter:
+    """Writes frame records as JSONL (one line per frame) or CSV (one row per face)"""
+
+    CSV_FIELDS = ['source', 'frame', 'time_s', 'face', 'x', 'y', 'w', 'h', 'emotion', 'confidence']
+
+    def __init__(self, path):
+        self.file = open(path, 'w', newline='', encoding='utf-8')
+        self.csv = None
+        if path.lower().endswith('.csv'):
+            self.csv = csv.DictWriter(self.file, fieldnames=self.CSV_FIELDS)
+            self.csv.writeheader()
+
+    def write(self, record):
+        if self.csv is None:
+            self.file.write(json.dumps(record) + '\n')
+            return
+        base = {'source': record['source'], 'frame': record['frame'], 'time_s': record['time_s']}
+        if not record['faces']:
+            # Keep frames without faces so every frame appears in the output
+            self.csv.writerow(base)
+        for i, face in enumerate(record['faces']):
+            x, y, w, h = face['box']
+            self.csv.writerow({**base, 'face': i, 'x': x, 'y': y, 'w': w, 'h': h,
+                               'emotion': face['emotion'], 'confidence': face['confidence']})
+
+    def close(self):
+        self.file.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline emotion annotation for videos and image directories")
+    parser.add_argument("inputs", nargs='+', help="video files, image files or directories")
+    parser.add_argument("-o", "--output", default="annotations.jsonl",
+                        help="output file; .csv writes CSV, anything else JSONL (default: annotations.jsonl)")
+    parser.add_argument("--workers", type=int, default=os.cpu_count() or 1, help="worker processes")
+    parser.add_argument("--detect-every", type=int, default=1,
+                        help="run the face detector every N video frames and track faces in between")
+    parser.add_argument("--scale", type=float, default=1.0, help="downscale factor of the frame used for detection")
+    parser.add_argument("--segment-frames", type=int, default=500, help="video frames per work unit")
+    parser.add_argument("--images-per-task", type=int, default=64, help="images per work unit")
+    parser.add_argument("--stats", help="append a JSON line with this run's throughput and timings to this file")
+    args = parser.parse_args()
+
+    work = collect_work(args.inputs, args.segment_frames, args.images_per_task)
+    if not work:
+        print("Error: no videos or images found in the given inputs.")
+        return
+
+    workers = max(1, min(args.workers, len(work)))
+    threads_per_worker = max(1, (os.cpu_count() or 1) // workers)
+    print(f"Processing {len(work)} work unit(s) with {workers} worker process(es)...")
+
+    totals = dict.fromkeys(STAGES, 0.0)
+    frames = faces = 0
+    start = time.perf_counter()
+    writer = AnnotationWriter(args.output)
+    # 'spawn' gives every worker a clean TensorFlow instead of a forked copy
+    context = multiprocessing.get_context('spawn')
+    try:
+        with ProcessPoolExecutor(max_workers=workers, mp_context=context,
+                                 initializer=init_worker, initargs=(threads_per_worker,)) as pool:
+            futures = [pool.submit(process_unit, unit, args.detect_every, args.scale) for unit in work]
+            # Results are written in input order
+            for future in futures:
+                records, timings, error = future.result()
+                if error:
+                    print(f"Warning: {error}")
+                for record in records:
+                    writer.write(record)
+                    frames += 1
+                    faces += len(record['faces'])
+                for stage in STAGES:
+                    totals[stage] += timings[stage]
+    finally:
+        writer.close()
+    elapsed = time.perf_counter() - start
+
+    print(f"\nWrote annotations for {frames} frames ({faces} faces) to {args.output}")
+    print(f"Wall time {elapsed:.2f}s (including model loading), {frames / elapsed:.1f} frames/s\n")
+    print(f"{'stage':<12}{'total s':>10}{'ms/frame':>10}")
+    for stage in STAGES:
+        per_frame = totals[stage] / frames * 1000 if frames else 0.0
+        print(f"{stage:<12}{totals[stage]:>10.2f}{per_frame:>10.2f}")
+
+    if args.stats:
+        stats = {
+            'finished_at': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'inputs': args.inputs,
+            'workers': workers,
+            'frames': frames,
+            'faces': faces,
+            'wall_s': round(elapsed, 3),
+            'frames_per_s': round(frames / elapsed, 2),
+            'stage_s': {stage: round(totals[stage], 3) for stage in STAGES},
+        }
+        with open(args.stats, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(stats) + '\n')
+
+
+if __name__ == "__main__":
+    main()
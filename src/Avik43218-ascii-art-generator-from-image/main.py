@@ -1,56 +1,182 @@
+import os
+import sys
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
 from PIL import Image
 
+IMAGE_EXTENSIONS = ('.jpg', '.jpeg', '.png', '.bmp', '.gif', '.tif', '.tiff', '.webp')
+
 class ascii_art_generator:
 
     ASCII_CHARACTERS = ' _.,-=+:;cba!?0123456789$W#@Ñ'
 
+    # Character for every gray value 0-255, so a whole image is mapped with one indexing operation
+    LOOKUP_TABLE = np.array(list(ASCII_CHARACTERS))[np.arange(256) // 15]
+
     def _resize_image(self, image, new_width: float):
 
         width, height = image.size
         aspect_ratio = height / width
         new_height = int(new_width * aspect_ratio * 0.43)   # 0.43 is correction factor
-        
+
         resized_image = image.resize((new_width, new_height))
 
         return resized_image
-    
+
     def _read_image(self, image):
 
         image = image.convert("L")    # Convert image to grayscale
-        pixels_data = image.getdata()
-
-        return list(pixels_data)
-    
-    def display_ascii_image(self, path: str, new_width: int = 110):
 
-        image = self._resize_image(image=Image.open(path), new_width=new_width)
+        return np.asarray(image)      # 2D uint8 array, no per-pixel Python objects
 
-        pixels_data = self._read_image(image=image)
-        pixel_count = len(pixels_data)
+    def pixels_to_ascii(self, pixels):
 
         # Normalize pixel color values and map ASCII characters
-        characters = "".join([self.ASCII_CHARACTERS[pixel // 15] for pixel in pixels_data])
-        ascii_image = "\n".join(characters[i : (i + new_width)] for i in range(0, pixel_count, new_width))
+        characters = self.LOOKUP_TABLE[pixels]
+
+        # View every row of single characters as one string of the row's width
+        height, width = characters.shape
+        rows = np.ascontiguousarray(characters).view(f'<U{width}').reshape(height)
 
-        return ascii_image
-    
-    def save_image(self, path: str):
+        return "\n".join(rows.tolist())
 
-        ascii_image = self.display_ascii_image(path=path)
+    def image_to_ascii(self, image, new_width: int = 110):
 
-        with open("ascii_image.txt", 'w') as file:
+        image = self._resize_image(image=image, new_width=new_width)
+
+        return self.pixels_to_ascii(self._read_image(image=image))
+
+    def display_ascii_image(self, path: str, new_width: int = 110):
+
+        with Image.open(path) as image:
+            return self.image_to_ascii(image=image, new_width=new_width)
+
+    def save_image(self, path: str, output: str = "ascii_image.txt", new_width: int = 110):
+
+        ascii_image = self.display_ascii_image(path=path, new_width=new_width)
+
+        with open(output, 'w', encoding='utf-8') as file:
             file.write(ascii_image)
 
         return None
-    
-if __name__ == "__main__":
 
-    # path = input("Enter image path: ")
-    default_path = r"D:\Programs\PythonPrograms\hacktoberfest_2025\beginner-python-mini-projects-hacktoberfest-2025\src\Avik43218-ascii-art-generator-from-image\image.jpg"
+
+def _convert_file(job):
+
+    # Runs in a worker process
+    path, output, new_width = job
+    ascii_art_generator().save_image(path=path, output=output, new_width=new_width)
+
+    return output
+
+
+def convert_folder(folder: str, output_folder: str, new_width: int = 110, workers: int = None):
+
+    """Convert every image in a folder to a .txt file in output_folder, in parallel"""
+
+    os.makedirs(output_folder, exist_ok=True)
+    # Keep the image's extension (photo.jpg -> photo.jpg.txt) so photo.png and photo.jpg don't share a file
+    jobs = [
+        (os.path.join(folder, name), os.path.join(output_folder, name + ".txt"), new_width)
+        for name in sorted(os.listdir(folder))
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    ]
+
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        # Small images finish quickly, so hand them out in chunks
+        chunksize = max(1, len(jobs) // (4 * (workers or os.cpu_count() or 1)))
+        return list(pool.map(_convert_file, jobs, chunksize=chunksize))
+
+
+def play_video(path, new_width: int = 110, out=sys.stdout):
+
+    """
+    Render a video (or webcam index) as ASCII in the terminal at the video's
+    own frame rate. When rendering falls behind, frames are skipped instead of
+    slowing the playback down.
+    """
+
+    try:
+        import cv2
+    except ImportError:
+        print("Video needs OpenCV: pip install opencv-python")
+        return
 
     generator = ascii_art_generator()
+    video = cv2.VideoCapture(int(path) if str(path).isdigit() else path)
+    if not video.isOpened():
+        print(f"Could not open video: {path}")
+        return
+
+    fps = video.get(cv2.CAP_PROP_FPS) or 30
+    shown = skipped = 0
+    frame_index = 0
+    start = time.perf_counter()
+    out.write("\x1b[2J")   # Clear the terminal once, then redraw in place
+
+    try:
+        while True:
+            # Skip the frames whose time has already passed
+            due = int((time.perf_counter() - start) * fps)
+            while frame_index < due:
+                if not video.grab():
+                    break
+                frame_index += 1
+                skipped += 1
+
+            ret, frame = video.read()
+            if not ret:
+                break
+            frame_index += 1
+
+            gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY)
+            height, width = gray.shape
+            new_height = max(1, int(new_width * height / width * 0.43))
+            small = cv2.resize(gray, (new_width, new_height), interpolation=cv2.INTER_AREA)
+
+            out.write("\x1b[H" + generator.pixels_to_ascii(small) + "\n")
+            out.flush()
+            shown += 1
+
+            delay = start + frame_index / fps - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        video.release()
+
+    elapsed = time.perf_counter() - start
+    print(f"\nShowed {shown} frames in {elapsed:.1f}s ({shown / elapsed:.1f} FPS), skipped {skipped}")
 
-    ascii_image = generator.display_ascii_image(path=default_path)
-    generator.save_image(path=default_path)
 
-    print(ascii_image)
+if __name__ == "__main__":
+
+    parser = argparse.ArgumentParser(description="Generate ASCII art from images or videos")
+    parser.add_argument("path", nargs="?", help="image file, image folder or video (with --video)")
+    parser.add_argument("--width", type=int, default=110, help="width of the ASCII art in characters")
+    parser.add_argument("--output", default="ascii_image.txt", help="text file for a single image")
+    parser.add_argument("--output-folder", help="convert every image in the folder into this folder")
+    parser.add_argument("--workers", type=int, help="processes for folder conversion (default: one per CPU)")
+    parser.add_argument("--video", action="store_true", help="play a video file or webcam index as ASCII")
+    args = parser.parse_args()
+
+    path = args.path or input("Enter image path: ")
+
+    if args.video:
+        play_video(path, new_width=args.width)
+    elif os.path.isdir(path):
+        start = time.perf_counter()
+        outputs = convert_folder(path, args.output_folder or os.path.normpath(path) + "_ascii", args.width, args.workers)
+        print(f"Converted {len(outputs)} images in {time.perf_counter() - start:.2f}s")
+    else:
+        generator = ascii_art_generator()
+
+        ascii_image = generator.display_ascii_image(path=path, new_width=args.width)
+        with open(args.output, 'w', encoding='utf-8') as file:
+            file.write(ascii_image)
+
+        print(ascii_image)
@@ -0,0 +1,158 @@
+import os
+import struct
+import hashlib
+import threading
+import pygame
+from config import *
+
+# Cached images start with this header: magic, width, height
+CACHE_HEADER = struct.Struct("<4sII")
+CACHE_MAGIC = b"ASC1"
+
+def _cache_prefix(filename):
+    """
+    Start of the cache file names for an image: its name plus a hash of its
+    full path, so images with the same name in different folders do not share
+    (and remove) each other's cache entries
+    """
+    digest = hashlib.sha1(os.path.abspath(filename).encode("utf-8")).hexdigest()[:12]
+    return f"{os.path.basename(filename)}.{digest}."
+
+def _cache_path(filename):
+    """Cache file for an image, named after the source file's path, size and mtime"""
+    stat = os.stat(filename)
+    return os.path.join(ASSET_CACHE_DIR, f"{_cache_prefix(filename)}{stat.st_size}.{stat.st_mtime_ns}.raw")
+
+def load_cached_image(filename):
+    """
+    Load an image as a pygame surface, using a raw RGBA copy on disk when
+    the source file has not changed since it was cached. Raw pixels load
+    much faster than decoding PNG/JPG again.
+    """
+    cache_file = _cache_path(filename)
+
+    if os.path.exists(cache_file):
+        try:
+            with open(cache_file, "rb") as f:
+                data = f.read()
+            magic, width, height = CACHE_HEADER.unpack_from(data)
+            if magic == CACHE_MAGIC:
+                pixels = data[CACHE_HEADER.size:]
+                return pygame.image.frombuffer(pixels, (width, height), "RGBA").convert_alpha()
+        except (OSError, struct.error, ValueError, pygame.error) as e:
+            print(f"Ignoring broken asset cache {cache_file}: {e}")
+
+    image = pygame.image.load(filename).convert_alpha()
+
+    try:
+        os.makedirs(ASSET_CACHE_DIR, exist_ok=True)
+        # Remove cache entries left over from older versions of this file
+        prefix = _cache_prefix(filename)
+        for old in os.listdir(ASSET_CACHE_DIR):
+            if old.startswith(prefix) and old.endswith(".raw"):
+                os.remove(os.path.join(ASSET_CACHE_DIR, old))
+
+        width, height = image.get_size()
+        with open(cache_file, "wb") as f:
+            f.write(CACHE_HEADER.pack(CACHE_MAGIC, width, height))
+            f.write(pygame.image.tobytes(image, "RGBA"))
+    except (OSError, pygame.error) as e:
+        print(f"Could not write asset cache for {filename}: {e}")
+
+    return image
+
+def build_atlas(sprites, max_width=ATLAS_MAX_WIDTH, padding=1):
+    """
+    Pack small sprites into one texture atlas.
+    `sprites` maps names to surfaces; returns a dict mapping the same names
+    to subsurfaces of the atlas. Sprites are placed on shelves, tallest first.
+    """
+    order = sorted(sprites, key=lambda name: sprites[name].get_height(), reverse=True)
+
+    # First pass: work out where every sprite goes
+    positions = {}
+    x = y = shelf_height = atlas_width = 0
+    for name in order:
+        width, height = sprites[name].get_size()
+        if x and x + width > max_width:
+            y += shelf_height + padding
+            x = shelf_height = 0
+        positions[name] = (x, y)
+        x += width + padding
+        shelf_height = max(shelf_height, height)
+        atlas_width = max(atlas_width, x)
+    atlas_height = y + shelf_height
+
+    # Second pass: copy the sprites in
+    atlas = pygame.Surface((max(atlas_width, 1), max(atlas_height, 1)), pygame.SRCALPHA).convert_alpha()
+    regions = {}
+    for name in order:
+        sprite = sprites[name]
+        atlas.blit(sprite, positions[name])
+        regions[name] = atlas.subsurface(pygame.Rect(positions[name], sprite.get_size()))
+    return regions
+
+class DeferredSound:
+    """
+    Sound that is decoded in a background thread.
+    Until decoding finishes play() is silently skipped, so the game can
+    start without waiting for the mixer.
+    """
+
+    def __init__(self):
+        self.sound = None
+        self.volume = None
+        self.ready = threading.Event()
+
+    def _set(self, sound):
+        if self.volume is not None:
+            sound.set_volume(self.volume)
+        self.sound = sound
+        self.ready.set()
+
+    def play(self, *args, **kwargs):
+        if self.sound:
+            return self.sound.play(*args, **kwargs)
+        return None
+
+    def stop(self):
+        if self.sound:
+            self.sound.stop()
+
+    def set_volume(self, volume):
+        self.volume = volume
+        if self.sound:
+            self.sound.set_volume(volume)
+
+def load_sounds_async(files, loader):
+    """
+    Start decoding sound files in a background thread.
+    `files` maps names to paths; returns a dict of DeferredSound objects.
+    Names that share a path share one DeferredSound. loader(path) must
+    return a pygame Sound; a path it fails on gets a silent sound, so one
+    missing file does not stop the others from loading.
+    """
+    by_path = {}
+    sounds = {}
+    for name, path in files.items():
+        if path not in by_path:
+            by_path[path] = DeferredSound()
+        sounds[name] = by_path[path]
+
+    def worker():
+        for path, deferred in by_path.items():
+            try:
+                sound = loader(path)
+            except Exception as e:
+                # Missing files raise FileNotFoundError rather than pygame.error
+                print(f"Error loading sound {path}: {e}")
+                try:
+                    sound = pygame.mixer.Sound(buffer=bytearray(100))
+                except pygame.error:
+                    # No mixer: play() stays a no-op
+                    deferred.ready.set()
+                    continue
+            deferred._set(sound)
+
+    threading.Thread(target=worker, name="sound-loader", daemon=True).start()
+    return sounds
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+Headless frame-time benchmark for Astro Space.
+
+Runs the gameplay loop without a window at a fixed timestep, as fast as
+possible, with a seeded random generator and scripted input, then prints
+percentiles of the update, entity, collision, UI and render timings.
+
+Example:
+    python benchmark.py --frames 3000 --scale 10
+"""
+import os
+import math
+import random
+import argparse
+
+# Use SDL's dummy drivers so no window or sound card is needed
+os.environ.setdefault("SDL_VIDEODRIVER", "dummy")
+os.environ.setdefault("SDL_AUDIODRIVER", "dummy")
+
+import pygame
+import numpy as np
+from config import *
+from profiler import FrameProfiler
+
+class SimulatedClock:
+    """Stands in for pygame.time.get_ticks so the game sees a fixed timestep"""
+
+    def __init__(self, fps=FPS):
+        self.step = 1000 / fps
+        self.ticks = 0.0
+
+    def advance(self):
+        self.ticks += self.step
+
+    def get_ticks(self):
+        return int(self.ticks)
+
+def run_benchmark(frames=1800, seed=42, scale=1, render=True):
+    """Simulate `frames` gameplay frames and return the game's profiler"""
+    random.seed(seed)
+    np.random.seed(seed)
+
+    # Every module reads time through pygame.time.get_ticks
+    clock = SimulatedClock()
+    pygame.time.get_ticks = clock.get_ticks
+
+    # Imported here so the game picks up the dummy drivers and the patched clock
+    from main import Game
+
+    class HeadlessGame(Game):
+        """Game driven by a scripted player instead of the keyboard"""
+
+        def fire_pressed(self):
+            return True
+
+        def save_high_score(self):
+            # Benchmark scores are not real scores
+            pass
+
+        def save_display_preferences(self):
+            pass
+
+    game = HeadlessGame()
+    # Keep gameplay log messages off the console
+    game.event_log.stream = open(os.devnull, "w")
+    game.profiler = FrameProfiler(history=frames)
+    game.max_enemies = MAX_ENEMIES * scale
+    game.state = STATE_GAMEPLAY
+    game.rendered_state = STATE_GAMEPLAY
+
+    def start_round():
+        game.reset_game()
+        game.state = STATE_GAMEPLAY
+        # More enemies need more bullets: fire double shots faster as the scale grows
+        game.player.shoot_delay = PLAYER_SHOOT_DELAY / scale
+        game.player.double_shot = True
+        game.player.powerup_end_times['double'] = float('inf')
+        # Start with a full wave; destroyed or escaped enemies are respawned by the game
+        while len(game.enemies) < game.max_enemies:
+            game.spawn_enemy()
+
+    start_round()
+
+    for frame in range(frames):
+        clock.advance()
+
+        # Scripted input: sweep the ship left and right across the screen
+        direction = math.sin(frame / 45)
+        game.player.dx = PLAYER_SPEED if direction > 0 else -PLAYER_SPEED
+
+        with game.profiler.section('update'):
+            game.update_gameplay()
+        if render:
+            with game.profiler.section('render'):
+                game.render()
+        game.profiler.current['enemies'] = len(game.enemies)
+        game.profiler.current['bullets'] = len(game.bullets)
+        game.profiler.end_frame()
+
+        if game.state != STATE_GAMEPLAY:
+            start_round()
+
+    return game.profiler
+
+def print_report(profiler, sections=('update', 'entities', 'collisions', 'ui', 'render')):
+    """Print p50/p90/p99/max per section in milliseconds"""
+    print(f"{'section':<12}{'p50':>10}{'p90':>10}{'p99':>10}{'max':>10}")
+    for name in sections:
+        values = [profiler.percentile(name, p) * 1000 for p in (50, 90, 99, 100)]
+        print(f"{name:<12}" + "".join(f"{value:>10.3f}" for value in values))
+
+    frame_count = len(profiler.history)
+    print(f"\nframes: {frame_count}, "
+          f"avg enemies: {profiler.average('enemies'):.1f}, "
+          f"avg bullets: {profiler.average('bullets'):.1f}")
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless Astro Space frame-time benchmark")
+    parser.add_argument("--frames", type=int, default=1800, help="number of frames to simulate")
+    parser.add_argument("--seed", type=int, default=42, help="random seed")
+    parser.add_argument("--scale", type=int, default=1,
+                        help="multiply the enemy cap and fire rate by this factor")
+    parser.add_argument("--no-render", action="store_true", help="skip rendering")
+    args = parser.parse_args()
+
+    profiler = run_benchmark(args.frames, args.seed, args.scale, not args.no_render)
+    print_report(profiler)
+    pygame.quit()
+
+if __name__ == "__main__":
+    main()
@@ -1,31 +1,67 @@
 import pygame
+import numpy as np
 from config import *
+from particles import ParticleArray
 
-class Bullet:
-    def __init__(self, x, y, direction):
-        self.rect = pygame.Rect(0, 0, 5, 10)
-        self.rect.centerx = x
-        self.rect.centery = y
-        
+BULLET_WIDTH = 5
+BULLET_HEIGHT = 10
+
+class BulletSystem(ParticleArray):
+    """
+    All bullets in the game stored as NumPy arrays.
+    Bullets are moved, culled, collided and drawn in batches instead of
+    one Python object per bullet.
+    """
+
+    def __init__(self, capacity=256):
+        super().__init__(capacity)
         # Direction: -1 for up (player bullet), 1 for down (enemy bullet)
-        self.direction = direction
-        self.speed = BULLET_SPEED
-        
-        # Bullet color
-        self.color = BLUE if direction < 0 else RED
-    
+        self.direction = np.zeros(capacity, dtype=np.int8)
+
+        # Bullet sprites: blue for the player, red for enemies
+        self.sprites = {}
+        for direction, color in ((-1, BLUE), (1, RED)):
+            sprite = pygame.Surface((BULLET_WIDTH, BULLET_HEIGHT))
+            sprite.fill(color)
+            self.sprites[direction] = sprite
+
+    def _arrays(self):
+        return ['pos', 'vel', 'direction']
+
+    def spawn(self, x, y, direction, dx=0.0):
+        """Fire a bullet centered on (x, y); dx gives it a sideways drift"""
+        batch = self._reserve(1)
+        self.pos[batch] = (x, y)
+        self.vel[batch] = (dx, direction * BULLET_SPEED)
+        self.direction[batch] = direction
+
     def update(self):
-        # Move the bullet
-        self.rect.y += self.direction * self.speed
-    
-    def is_off_screen(self):
-        # Check if the bullet has gone off the screen
-        return self.rect.bottom < 0 or self.rect.top > SCREEN_HEIGHT
-    
-    def check_collision(self, sprite):
-        # Check if the bullet has collided with another sprite
-        return self.rect.colliderect(sprite.rect)
-    
+        """Move every bullet and drop the ones that left the screen"""
+        if self.count == 0:
+            return
+        live = slice(0, self.count)
+        self.pos[live] += self.vel[live]
+        self.keep(self.on_screen_mask(margin=BULLET_HEIGHT))
+
+    def player_bullets(self):
+        """Boolean mask of live bullets fired by the player"""
+        return self.direction[:self.count] < 0
+
+    def overlapping(self, rect, mask=None):
+        """Boolean mask of live bullets whose rect overlaps the given pygame.Rect"""
+        pos = self.pos[:self.count]
+        half_w = BULLET_WIDTH / 2
+        half_h = BULLET_HEIGHT / 2
+        hits = ((pos[:, 0] + half_w > rect.left) & (pos[:, 0] - half_w < rect.right) &
+                (pos[:, 1] + half_h > rect.top) & (pos[:, 1] - half_h < rect.bottom))
+        if mask is not None:
+            hits &= mask
+        return hits
+
     def draw(self, surface):
-        # Draw the bullet
-        pygame.draw.rect(surface, self.color, self.rect)
+        """Draw all bullets with a single blits() call per frame"""
+        if self.count == 0:
+            return
+        sprites = [self.sprites[-1], self.sprites[1]]
+        sprite_index = (self.direction[:self.count] > 0).astype(np.int32)
+        self._blit_all(surface, sprites, sprite_index, (BULLET_WIDTH / 2, BULLET_HEIGHT / 2))
@@ -24,6 +24,7 @@ MAX_ENEMIES = 10
 ENEMY_SPAWN_RATE = 1000  # milliseconds
 ENEMY_SPEED_INCREASE_INTERVAL = 15000  # milliseconds
 ENEMY_SPEED_INCREASE_AMOUNT = 0.5
+ENEMY_ROTATION_STEP = 3  # degrees between pre-rendered rotation frames
 
 # Bullet settings
 BULLET_SPEED = 10
@@ -70,8 +71,13 @@ EXPLOSION_SOUND = os.path.join(SOUNDS_DIR, "boom.wav")
 BACKGROUND_MUSIC = os.path.join(SOUNDS_DIR, "Cool Space Music.mp3")
 POWERUP_SOUND = os.path.join(SOUNDS_DIR, "shot.ogg")  # Reusing existing sound as placeholder
 
+# Asset pipeline: decoded images are cached here, small sprites share one atlas
+ASSET_CACHE_DIR = os.path.join(BASE_DIR, ".asset_cache")
+ATLAS_MAX_WIDTH = 512
+
 # Font files
 MAIN_FONT = os.path.join(FONTS_DIR, "simkai.ttf")
+TEXT_CACHE_SIZE = 256  # rendered text surfaces kept in the LRU cache
 
 # Game states
 STATE_SPLASH = 0
@@ -2,6 +2,20 @@ import pygame
 import random
 from config import *
 
+# Pre-rendered rotation frames shared by every asteroid using the same image.
+# Maps id(image) -> (image, frames); the image is kept so the id stays valid.
+_rotation_cache = {}
+
+def get_rotation_frames(image, step=ENEMY_ROTATION_STEP):
+    """Return the list of rotated copies of image, one every `step` degrees."""
+    key = id(image)
+    cached = _rotation_cache.get(key)
+    if cached is None or cached[0] is not image:
+        frames = [pygame.transform.rotate(image, angle) for angle in range(0, 360, step)]
+        cached = (image, frames)
+        _rotation_cache[key] = cached
+    return cached[1]
+
 class Enemy:
     """
     Represents an asteroid in the game.
@@ -17,12 +31,23 @@ class Enemy:
             placeholder.fill((0, 255, 0))  # Green square
             self.original_image = placeholder
             self.image = placeholder
+            self.rotation_frames = [placeholder]
         else:
             # Store the original image
             self.original_image = assets['enemy_ship']
-            # Make a copy for initial use
-            self.image = self.original_image.copy()
             
+            # Rotation frames are rendered once per image and shared between asteroids
+            try:
+                self.rotation_frames = get_rotation_frames(self.original_image)
+            except Exception as e:
+                print(f"Error pre-rendering asteroid rotations: {e}")
+                self.rotation_frames = [self.original_image]
+        
+        self.reset(assets)
+    
+    def reset(self, assets):
+        """Give the asteroid a fresh position and motion (used when recycled from a pool)"""
+        self.image = self.rotation_frames[0]
         self.rect = self.image.get_rect()
         
         # Position the asteroid at a random location at the top of the screen
@@ -66,17 +91,13 @@ class Enemy:
         # Rotate the asteroid for tumbling effect
         self.angle = (self.angle + self.rotation_speed) % 360
         
-        try:
-            # Create a rotated copy of the original image
-            self.image = pygame.transform.rotate(self.original_image, self.angle)
-            
-            # Update the rectangle and maintain the center position
-            self.rect = self.image.get_rect(center=center)
-        except Exception as e:
-            print(f"Error rotating asteroid: {e}")
-            # If rotation fails, keep the original image
-            self.image = self.original_image
-            self.rect = self.image.get_rect(center=center)
+        # Pick the closest pre-rendered frame instead of rotating every frame
+        frame_count = len(self.rotation_frames)
+        frame_index = round(self.angle * frame_count / 360) % frame_count
+        self.image = self.rotation_frames[frame_index]
+        
+        # Update the rectangle and maintain the center position
+        self.rect = self.image.get_rect(center=center)
     
     def draw(self, surface):
         """Draw the asteroid on the given surface"""
@@ -0,0 +1,46 @@
+import sys
+import time
+import threading
+from collections import deque
+
+class EventLog:
+    """
+    Ring buffer of game log messages.
+    log() only appends to an in-memory deque, so it is cheap enough to call
+    inside the frame; a background thread writes the messages out.
+    If messages come in faster than they are flushed the oldest are dropped.
+    """
+
+    def __init__(self, capacity=1000, flush_interval=0.5, stream=None):
+        self.messages = deque(maxlen=capacity)
+        self.flush_interval = flush_interval
+        self.stream = stream or sys.stdout
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="event-log", daemon=True)
+        self._thread.start()
+
+    def log(self, message):
+        self.messages.append((time.time(), message))
+
+    def flush(self):
+        """Write out every buffered message"""
+        lines = []
+        while self.messages:
+            try:
+                timestamp, message = self.messages.popleft()
+            except IndexError:
+                break
+            lines.append(f"[{time.strftime('%H:%M:%S', time.localtime(timestamp))}] {message}\n")
+        if lines:
+            self.stream.write("".join(lines))
+            self.stream.flush()
+
+    def _run(self):
+        while not self._stop.wait(self.flush_interval):
+            self.flush()
+
+    def close(self):
+        """Stop the writer thread and write out anything left"""
+        self._stop.set()
+        self._thread.join(timeout=1)
+        self.flush()
@@ -6,11 +6,17 @@ import random
 import json
 from player import Player
 from enemy import Enemy
-from bullet import Bullet
+from bullet import BulletSystem
+from particles import ParticleSystem
 from powerup import PowerUp, spawn_random_powerup
-from ui import Button, HealthBar, ScoreDisplay, LivesDisplay, PowerupIndicator, EnergyBar
+from pool import ObjectPool, EntityList
+from renderer import Renderer
+from profiler import FrameProfiler
+from eventlog import EventLog
+from ui import Button, HealthBar, ScoreDisplay, LivesDisplay, PowerupIndicator, EnergyBar, ProfilerOverlay
 from config import *
-from utils import load_assets, check_collisions, create_floating_text, update_floating_texts, draw_floating_texts
+from utils import (load_assets, check_collisions, create_floating_text, update_floating_texts,
+                   draw_floating_texts, get_font, render_text)
 
 class Game:
     def __init__(self):
@@ -19,11 +25,21 @@ class Game:
         pygame.mixer.init()
         pygame.display.set_caption("Astro Space Game")
         
+        # Gameplay messages are buffered and written out by a background thread
+        self.event_log = EventLog()
+        
         # Set up the game window
         self.fullscreen = False
         self.screen = pygame.display.set_mode((SCREEN_WIDTH, SCREEN_HEIGHT))
         self.clock = pygame.time.Clock()
         
+        # Cached static layers and dirty-rect display updates
+        self.renderer = Renderer(self.screen)
+        self.rendered_state = None
+        
+        # Per-frame timings of the main systems
+        self.profiler = FrameProfiler()
+        
         # Store original window size for toggling fullscreen
         self.window_size = (SCREEN_WIDTH, SCREEN_HEIGHT)
         
@@ -40,6 +56,19 @@ class Game:
         self.state = STATE_SPLASH
         self.splash_start_time = pygame.time.get_ticks()
         
+        # Enemy cap (raised by the benchmark to stress-test bigger waves)
+        self.max_enemies = MAX_ENEMIES
+        
+        # Object pools and entity lists; dead entities are recycled instead of reallocated
+        self.enemy_pool = ObjectPool(Enemy)
+        self.powerup_pool = ObjectPool(PowerUp)
+        self.enemies = EntityList(self.enemy_pool)
+        self.powerups = EntityList(self.powerup_pool)
+        
+        # Bullets and explosion sparks are stored as NumPy arrays
+        self.bullets = BulletSystem()
+        self.particles = ParticleSystem()
+        
         # Initialize UI elements first so they exist when reset_game is called
         self.init_ui()
         
@@ -104,6 +133,9 @@ class Game:
             self.screen = pygame.display.set_mode(self.window_size)
             print(f"Switched to windowed mode: {self.window_size[0]}x{self.window_size[1]}")
         
+        # Cached layers were built for the old screen size
+        self.renderer.set_screen(self.screen)
+        
         # Recalculate UI positions based on new screen size
         self.adjust_ui_for_screen()
         
@@ -123,19 +155,20 @@ class Game:
     
     def reset_game(self):
         """Reset the game state for a new game"""
-        print("Resetting game...")
+        self.event_log.log("Resetting game...")
         
         # Create player
         self.player = Player(self.assets)
-        print(f"Player created with {self.player.lives} lives")
+        self.event_log.log(f"Player created with {self.player.lives} lives")
         
         # Reset score
         self.player.score = 0
         
-        # Create lists for game objects
-        self.enemies = []
-        self.bullets = []
-        self.powerups = []
+        # Return game objects from the previous round to their pools
+        self.enemies.clear()
+        self.bullets.clear()
+        self.powerups.clear()
+        self.particles.clear()
         
         # Reset floating texts
         self.floating_texts = []
@@ -151,8 +184,8 @@ class Game:
         self.energy_bar.current_energy = 0
         self.energy_bar.is_charged = False
         
-        print(f"Lives display updated with {self.player.lives} lives")
-        print(f"Score reset to {self.player.score}")
+        self.event_log.log(f"Lives display updated with {self.player.lives} lives")
+        self.event_log.log(f"Score reset to {self.player.score}")
         
         # Spawn initial enemies
         for _ in range(5):
@@ -161,18 +194,18 @@ class Game:
     def spawn_enemy(self):
         """Spawn a new enemy at a random position"""
         try:
-            if len(self.enemies) < MAX_ENEMIES:
-                enemy = Enemy(self.assets)
+            if len(self.enemies) < self.max_enemies:
+                enemy = self.enemy_pool.acquire(self.assets)
                 self.enemies.append(enemy)
         except Exception as e:
-            print(f"Error spawning enemy: {e}")
+            self.event_log.log(f"Error spawning enemy: {e}")
     
     def init_ui(self):
         """Initialize UI elements"""
         # Fonts
         self.main_font = self.assets['main_font']
-        self.small_font = pygame.font.Font(None, 24)
-        self.large_font = pygame.font.Font(None, 48)
+        self.small_font = get_font(None, 24)
+        self.large_font = get_font(None, 48)
         
         # UI elements
         self.health_bar = HealthBar(SCREEN_WIDTH - 150, 20, 130, 20, PLAYER_LIVES)
@@ -180,6 +213,7 @@ class Game:
         self.lives_display = LivesDisplay(20, 60, self.small_font, self.assets['player_ship'])
         self.powerup_indicator = PowerupIndicator(SCREEN_WIDTH - 200, 50, self.small_font)
         self.energy_bar = EnergyBar(20, 100, 150, 20, ENERGY_MAX)
+        self.profiler_overlay = ProfilerOverlay(SCREEN_WIDTH - 220, 60)
         
         # Menu buttons
         button_width, button_height = 200, 50
@@ -267,6 +301,11 @@ class Game:
             self.energy_bar.width = int(150 * scale_x)
             self.energy_bar.height = int(20 * scale_y)
         
+        # Profiler overlay
+        if hasattr(self, 'profiler_overlay'):
+            self.profiler_overlay.x = int(screen_width - 220 * scale_x)
+            self.profiler_overlay.y = int(60 * scale_y)
+        
         # Menu buttons
         button_width, button_height = int(200 * scale_x), int(50 * scale_y)
         center_x = screen_width // 2 - button_width // 2
@@ -370,6 +409,10 @@ class Game:
                         None
                     )
                 
+                # Toggle the profiler overlay with F3
+                if event.key == pygame.K_F3:
+                    self.profiler_overlay.toggle()
+                
                 # Energy Blast trigger with X key
                 if event.key == pygame.K_x and self.state == STATE_GAMEPLAY:
                     if self.player.trigger_blast():
@@ -488,8 +531,8 @@ class Game:
         self.screen.blit(dialog_bg, (dialog_x, dialog_y))
         
         # Draw message
-        message_font = pygame.font.Font(None, int(30 * scale_y))
-        message_text = message_font.render(message, True, WHITE)
+        message_font = get_font(None, int(30 * scale_y))
+        message_text = render_text(message, message_font, WHITE)
         message_rect = message_text.get_rect(center=(screen_width // 2, dialog_y + dialog_height // 3))
         self.screen.blit(message_text, message_rect)
         
@@ -503,7 +546,7 @@ class Game:
         pygame.draw.rect(self.screen, (100, 200, 100), yes_button)  # Green
         pygame.draw.rect(self.screen, (200, 255, 200), yes_button, 2)  # Light green border
         
-        yes_text = message_font.render("Yes", True, WHITE)
+        yes_text = render_text("Yes", message_font, WHITE)
         yes_text_rect = yes_text.get_rect(center=yes_button.center)
         self.screen.blit(yes_text, yes_text_rect)
         
@@ -513,7 +556,7 @@ class Game:
         pygame.draw.rect(self.screen, (200, 100, 100), no_button)  # Red
         pygame.draw.rect(self.screen, (255, 200, 200), no_button, 2)  # Light red border
         
-        no_text = message_font.render("No", True, WHITE)
+        no_text = render_text("No", message_font, WHITE)
         no_text_rect = no_text.get_rect(center=no_button.center)
         self.screen.blit(no_text, no_text_rect)
         
@@ -550,10 +593,14 @@ class Game:
                         waiting = False
                         if no_action:
                             no_action()
+        
+        # The dialog was drawn straight onto the screen, so redraw everything next frame
+        self.renderer.invalidate()
     
     def update_gameplay(self):
         """Update game objects during gameplay"""
         current_time = pygame.time.get_ticks()
+        self.profiler.begin('entities')
         
         # Update player
         self.player.update()
@@ -564,45 +611,41 @@ class Game:
         # Update energy bar
         self.update_energy_bar()
         
-        # Update bullets
-        for bullet in self.bullets[:]:
-            bullet.update()
-            if bullet.is_off_screen():
-                self.bullets.remove(bullet)
+        # Update bullets and particles (vectorized, off-screen ones are culled)
+        self.bullets.update()
+        self.particles.update()
         
         # Update enemies
-        for enemy in self.enemies[:]:
+        for enemy in self.enemies:
             enemy.update()
-            
-            # Respawn enemies that go off screen
-            if enemy.rect.top > SCREEN_HEIGHT:
-                self.enemies.remove(enemy)
-                self.spawn_enemy()
         
-        # Update powerups
-        for powerup in self.powerups[:]:
-            if powerup.update():
-                self.powerups.remove(powerup)
+        # Respawn enemies that go off screen
+        enemies_left = self.enemies.remove_if(lambda enemy: enemy.rect.top > SCREEN_HEIGHT)
+        for _ in range(enemies_left):
+            self.spawn_enemy()
+        
+        # Update powerups (update() returns True once a power-up leaves the screen)
+        self.powerups.remove_if(PowerUp.update)
+        self.profiler.end('entities')
         
         # Check collisions
-        collision_results = check_collisions(self.player, self.enemies, self.bullets, self.powerups)
+        with self.profiler.section('collisions'):
+            collision_results = check_collisions(self.player, self.enemies, self.bullets, self.powerups)
         
         # Handle enemy destruction
+        enemies_to_respawn = 0
         for enemy in collision_results['enemies_destroyed']:
             if enemy in self.enemies:
                 # Play explosion sound
                 if enemy.explosion_sound:
                     enemy.explosion_sound.play()
                 
-                # Remove the enemy
-                self.enemies.remove(enemy)
-                
                 # Add energy when destroying an asteroid
                 self.player.add_energy(1)
                 
                 # Add score for destroying asteroid
                 self.player.score += SCORE_ASTEROID_DESTROYED
-                print(f"Asteroid destroyed, score increased to {self.player.score}")
+                self.event_log.log(f"Asteroid destroyed, score increased to {self.player.score}")
                 
                 # Create floating score text
                 self.floating_texts.append(
@@ -610,18 +653,25 @@ class Game:
                                         (enemy.rect.centerx, enemy.rect.centery))
                 )
                 
+                # Explosion sparks
+                self.particles.burst(enemy.rect.centerx, enemy.rect.centery)
+                
                 # Chance to spawn powerup
-                powerup = spawn_random_powerup(enemy.rect.centerx, enemy.rect.centery, self.assets)
+                powerup = spawn_random_powerup(enemy.rect.centerx, enemy.rect.centery,
+                                               self.assets, self.powerup_pool)
                 if powerup:
                     self.powerups.append(powerup)
                 
-                # Spawn a new enemy
-                self.spawn_enemy()
+                # Remove the enemy (this hands it back to the pool, so do it last)
+                self.enemies.remove(enemy)
+                enemies_to_respawn += 1
+        
+        # Spawn new enemies once the destroyed ones are no longer referenced
+        for _ in range(enemies_to_respawn):
+            self.spawn_enemy()
         
         # Handle bullet removal
-        for bullet in collision_results['bullets_to_remove']:
-            if bullet in self.bullets:
-                self.bullets.remove(bullet)
+        self.bullets.remove(collision_results['bullets_to_remove'])
         
         # Handle player hit
         if collision_results['player_hit']:
@@ -654,8 +704,7 @@ class Game:
             powerup.apply(self.player)
             
             # Remove the powerup
-            if powerup in self.powerups:
-                self.powerups.remove(powerup)
+            self.powerups.remove(powerup)
             
             # Add score
             self.player.score += SCORE_POWERUP_COLLECTED
@@ -668,6 +717,7 @@ class Game:
             )
         
         # Update player score
+        self.profiler.begin('ui')
         self.score_display.update(self.player.score)
         
         # Force immediate update of displayed score for better feedback
@@ -684,17 +734,20 @@ class Game:
         
         # Update floating texts
         update_floating_texts(self.floating_texts)
+        self.profiler.end('ui')
         
         # Check for continuous shooting
-        keys = pygame.key.get_pressed()
-        if keys[pygame.K_SPACE]:
-            new_bullets = self.player.shoot()
-            self.bullets.extend(new_bullets)
+        if self.fire_pressed():
+            self.player.shoot(self.bullets)
         
         # Spawn enemies over time
-        if len(self.enemies) < MAX_ENEMIES and random.random() < 0.02:
+        if len(self.enemies) < self.max_enemies and random.random() < 0.02:
             self.spawn_enemy()
     
+    def fire_pressed(self):
+        """Whether the fire button is held down this frame"""
+        return pygame.key.get_pressed()[pygame.K_SPACE]
+    
     def update_splash(self):
         """Update splash screen"""
         current_time = pygame.time.get_ticks()
@@ -771,45 +824,67 @@ class Game:
         elif self.state == STATE_INSTRUCTIONS:
             self.update_instructions()
     
-    def render_splash(self):
-        """Render the splash screen"""
+    def draw_splash_layer(self, surface):
+        """Draw the static splash screen onto a layer"""
         # Draw background
-        self.screen.fill(BLACK)
+        surface.fill(BLACK)
         
         # Draw logo
-        logo_text = self.large_font.render("ASTRO SPACE", True, WHITE)
+        logo_text = render_text("ASTRO SPACE", self.large_font, WHITE)
         logo_rect = logo_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2))
-        self.screen.blit(logo_text, logo_rect)
+        surface.blit(logo_text, logo_rect)
         
         # Draw loading text
-        loading_text = self.small_font.render("Loading...", True, WHITE)
+        loading_text = render_text("Loading...", self.small_font, WHITE)
         loading_rect = loading_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT // 2 + 50))
-        self.screen.blit(loading_text, loading_rect)
+        surface.blit(loading_text, loading_rect)
     
-    def render_menu(self):
-        """Render the menu screen"""
+    def render_splash(self):
+        """Render the splash screen"""
+        layer = self.renderer.get_layer('splash', self.draw_splash_layer)
+        self.renderer.draw_static_screen(layer, [])
+    
+    def draw_menu_layer(self, surface):
+        """Draw the static part of the menu screen onto a layer"""
         # Draw background
-        self.screen.blit(self.assets['background_menu'], (0, 0))
+        surface.blit(self.assets['background_menu'], (0, 0))
         
         # Draw title
-        title_text = self.large_font.render("ASTRO SPACE", True, WHITE)
+        title_text = render_text("ASTRO SPACE", self.large_font, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        self.screen.blit(title_text, title_rect)
-        
-        # Draw buttons
-        for button in self.menu_buttons:
-            button.draw(self.screen)
+        surface.blit(title_text, title_rect)
         
         # Draw F1 shortcut hint
-        hint_text = self.small_font.render("Press F1 to toggle fullscreen mode", True, (200, 200, 200))
+        hint_text = render_text("Press F1 to toggle fullscreen mode", self.small_font, (200, 200, 200))
         hint_rect = hint_text.get_rect(center=(SCREEN_WIDTH // 2, SCREEN_HEIGHT - 30))
-        self.screen.blit(hint_text, hint_rect)
+        surface.blit(hint_text, hint_rect)
+    
+    def render_menu(self):
+        """Render the menu screen"""
+        layer = self.renderer.get_layer('menu', self.draw_menu_layer)
+        self.renderer.draw_static_screen(layer, self.menu_buttons)
+    
+    def draw_background_strip(self, surface):
+        """
+        Draw the scrolling background as one tall strip: the visible frame
+        for any bg_y is a single window into it instead of two full blits.
+        """
+        surface.blit(self.assets['background'], (0, SCREEN_HEIGHT))
+        surface.blit(self.assets['background'], (0, 0))
     
     def render_gameplay(self):
         """Render the gameplay screen"""
         # Draw scrolling background
-        self.screen.blit(self.assets['background'], (0, self.bg_y))
-        self.screen.blit(self.assets['background'], (0, self.bg_y - SCREEN_HEIGHT))
+        background = self.assets['background']
+        strip = self.renderer.get_layer(
+            'background_strip', self.draw_background_strip,
+            (background.get_width(), SCREEN_HEIGHT * 2)
+        )
+        visible = pygame.Rect(0, SCREEN_HEIGHT - self.bg_y, background.get_width(), SCREEN_HEIGHT)
+        playfield = self.screen.blit(strip, (0, 0), visible)
+        
+        # Everything below is drawn over the background, so the playfield is always dirty
+        self.renderer.mark_dirty(playfield)
         
         # Apply screen shake if active
         offset_x, offset_y = self.screen_shake_offset
@@ -818,8 +893,7 @@ class Game:
         self.player.draw(self.screen)
         
         # Draw bullets
-        for bullet in self.bullets:
-            bullet.draw(self.screen)
+        self.bullets.draw(self.screen)
         
         # Draw enemies
         for enemy in self.enemies:
@@ -829,11 +903,16 @@ class Game:
         for powerup in self.powerups:
             powerup.draw(self.screen)
         
-        # Draw UI elements
-        self.health_bar.draw(self.screen)
-        self.score_display.draw(self.screen)
-        self.lives_display.draw(self.screen)
-        self.energy_bar.draw(self.screen)
+        # Draw explosion sparks
+        self.particles.draw(self.screen)
+        
+        # Draw UI elements (they can sit outside the playfield in fullscreen)
+        self.profiler.begin('ui')
+        self.renderer.mark_dirty(self.health_bar.draw(self.screen))
+        self.renderer.mark_dirty(self.score_display.draw(self.screen))
+        self.renderer.mark_dirty(self.lives_display.draw(self.screen))
+        self.renderer.mark_dirty(self.energy_bar.draw(self.screen))
+        self.profiler.end('ui')
         
         # Draw energy blast effect if active
         if self.player.is_blasting:
@@ -841,131 +920,151 @@ class Game:
         
         # Draw floating texts
         draw_floating_texts(self.screen, self.floating_texts)
+        
+        # Draw the profiler overlay (F3) on top of everything
+        counts = {
+            'enemies': len(self.enemies),
+            'bullets': len(self.bullets),
+            'powerups': len(self.powerups),
+            'particles': len(self.particles)
+        }
+        self.renderer.mark_dirty(self.profiler_overlay.draw(self.screen, self.profiler, counts))
     
-    def render_pause(self):
-        """Render the pause screen overlay"""
-        # Draw semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 128))  # Semi-transparent black
-        self.screen.blit(overlay, (0, 0))
+    def draw_pause_layer(self, surface):
+        """Draw the static pause overlay onto a transparent layer"""
+        # Semi-transparent black
+        surface.fill((0, 0, 0, 128))
         
         # Draw pause text
-        pause_text = self.large_font.render("PAUSED", True, WHITE)
+        pause_text = render_text("PAUSED", self.large_font, WHITE)
         pause_rect = pause_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
-        self.screen.blit(pause_text, pause_rect)
+        surface.blit(pause_text, pause_rect)
+    
+    def render_pause(self):
+        """Render the pause screen overlay"""
+        overlay = self.renderer.get_layer('pause', self.draw_pause_layer,
+                                          (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=True)
+        self.screen.blit(overlay, (0, 0))
         
         # Draw buttons
         for button in self.pause_buttons:
             button.draw(self.screen)
+            self.renderer.mark_dirty(button.rect)
     
-    def render_game_over(self):
-        """Render the game over screen overlay"""
-        # Draw semi-transparent overlay
-        overlay = pygame.Surface((SCREEN_WIDTH, SCREEN_HEIGHT), pygame.SRCALPHA)
-        overlay.fill((0, 0, 0, 192))  # More opaque black
-        self.screen.blit(overlay, (0, 0))
+    def draw_game_over_layer(self, surface):
+        """Draw the game over overlay for the current scores onto a transparent layer"""
+        # More opaque black
+        surface.fill((0, 0, 0, 192))
         
         # Draw game over text
-        game_over_text = self.large_font.render("GAME OVER", True, RED)
+        game_over_text = render_text("GAME OVER", self.large_font, RED)
         game_over_rect = game_over_text.get_rect(center=(SCREEN_WIDTH // 2, 150))
-        self.screen.blit(game_over_text, game_over_rect)
+        surface.blit(game_over_text, game_over_rect)
         
         # Format scores with commas for better readability
         formatted_score = f"{self.final_score:,}"
         formatted_high_score = f"{self.high_score:,}"
         
         # Draw score text
-        score_text = self.main_font.render(f"Score: {formatted_score}", True, WHITE)
+        score_text = render_text(f"Score: {formatted_score}", self.main_font, WHITE)
         score_rect = score_text.get_rect(center=(SCREEN_WIDTH // 2, 220))
-        self.screen.blit(score_text, score_rect)
+        surface.blit(score_text, score_rect)
         
         # Draw high score text
-        high_score_text = self.main_font.render(f"High Score: {formatted_high_score}", True, WHITE)
+        high_score_text = render_text(f"High Score: {formatted_high_score}", self.main_font, WHITE)
         high_score_rect = high_score_text.get_rect(center=(SCREEN_WIDTH // 2, 260))
-        self.screen.blit(high_score_text, high_score_rect)
+        surface.blit(high_score_text, high_score_rect)
         
         # Draw new high score text if applicable
         if self.final_score >= self.high_score:
-            new_high_score_text = self.main_font.render("New High Score!", True, YELLOW)
+            new_high_score_text = render_text("New High Score!", self.main_font, YELLOW)
             new_high_score_rect = new_high_score_text.get_rect(center=(SCREEN_WIDTH // 2, 300))
-            self.screen.blit(new_high_score_text, new_high_score_rect)
+            surface.blit(new_high_score_text, new_high_score_rect)
+    
+    def render_game_over(self):
+        """Render the game over screen overlay"""
+        # The overlay shows the scores, so it is redrawn when they change
+        overlay = self.renderer.get_layer('game_over', self.draw_game_over_layer,
+                                          (SCREEN_WIDTH, SCREEN_HEIGHT), alpha=True,
+                                          version=(self.final_score, self.high_score))
+        self.screen.blit(overlay, (0, 0))
         
         # Draw buttons
         for button in self.game_over_buttons:
             button.draw(self.screen)
+            self.renderer.mark_dirty(button.rect)
     
-    def render_settings(self):
-        """Render the settings screen"""
+    def draw_settings_layer(self, surface):
+        """Draw the static part of the settings screen onto a layer"""
         # Draw background
-        self.screen.blit(self.assets['background_menu'], (0, 0))
+        surface.blit(self.assets['background_menu'], (0, 0))
         
         # Draw title
-        title_text = self.large_font.render("SETTINGS", True, WHITE)
+        title_text = render_text("SETTINGS", self.large_font, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        self.screen.blit(title_text, title_rect)
+        surface.blit(title_text, title_rect)
         
         # Draw settings options
-        settings_text = self.main_font.render("Display Settings", True, WHITE)
+        settings_text = render_text("Display Settings", self.main_font, WHITE)
         settings_rect = settings_text.get_rect(center=(SCREEN_WIDTH // 2, 200))
-        self.screen.blit(settings_text, settings_rect)
-        
-        # Draw fullscreen option
-        self.settings_fullscreen_button.draw(self.screen)
+        surface.blit(settings_text, settings_rect)
         
-        # Draw current display mode
+        # Draw current display mode (layers are rebuilt whenever the mode changes)
         mode_text = "Current mode: " + ("Fullscreen" if self.fullscreen else "Windowed")
-        mode_display = self.small_font.render(mode_text, True, WHITE)
+        mode_display = render_text(mode_text, self.small_font, WHITE)
         mode_rect = mode_display.get_rect(center=(SCREEN_WIDTH // 2, 240))
-        self.screen.blit(mode_display, mode_rect)
+        surface.blit(mode_display, mode_rect)
         
         # Draw resolution info
         current_w, current_h = self.screen.get_size()
         res_text = f"Resolution: {current_w}x{current_h}"
-        res_display = self.small_font.render(res_text, True, WHITE)
+        res_display = render_text(res_text, self.small_font, WHITE)
         res_rect = res_display.get_rect(center=(SCREEN_WIDTH // 2, 320))
-        self.screen.blit(res_display, res_rect)
-        
-        # Draw buttons
-        for button in self.settings_buttons:
-            button.draw(self.screen)
+        surface.blit(res_display, res_rect)
     
-    def render_best_score(self):
-        """Render the best score screen"""
+    def render_settings(self):
+        """Render the settings screen"""
+        layer = self.renderer.get_layer('settings', self.draw_settings_layer)
+        self.renderer.draw_static_screen(layer, [self.settings_fullscreen_button] + self.settings_buttons)
+    
+    def draw_best_score_layer(self, surface):
+        """Draw the best score screen onto a layer"""
         # Draw background
-        self.screen.blit(self.assets['background_menu'], (0, 0))
+        surface.blit(self.assets['background_menu'], (0, 0))
         
         # Draw title
-        title_text = self.large_font.render("BEST SCORE", True, WHITE)
+        title_text = render_text("BEST SCORE", self.large_font, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 100))
-        self.screen.blit(title_text, title_rect)
+        surface.blit(title_text, title_rect)
         
         # Format high score with commas for better readability
         formatted_high_score = f"{self.high_score:,}"
         
         # Draw high score
-        high_score_text = self.main_font.render(f"High Score: {formatted_high_score}", True, WHITE)
+        high_score_text = render_text(f"High Score: {formatted_high_score}", self.main_font, WHITE)
         high_score_rect = high_score_text.get_rect(center=(SCREEN_WIDTH // 2, 250))
-        self.screen.blit(high_score_text, high_score_rect)
-        
-        # Draw buttons
-        for button in self.best_score_buttons:
-            button.draw(self.screen)
+        surface.blit(high_score_text, high_score_rect)
     
-    def render_instructions(self):
-        """Render the instructions screen"""
+    def render_best_score(self):
+        """Render the best score screen"""
+        layer = self.renderer.get_layer('best_score', self.draw_best_score_layer, version=self.high_score)
+        self.renderer.draw_static_screen(layer, self.best_score_buttons)
+    
+    def draw_instructions_layer(self, surface):
+        """Draw the static part of the instructions screen onto a layer"""
         # Draw background
-        self.screen.blit(self.assets['background_menu'], (0, 0))
+        surface.blit(self.assets['background_menu'], (0, 0))
         
         # Draw title
-        title_text = self.large_font.render("INSTRUCTIONS", True, WHITE)
+        title_text = render_text("INSTRUCTIONS", self.large_font, WHITE)
         title_rect = title_text.get_rect(center=(SCREEN_WIDTH // 2, 70))
-        self.screen.blit(title_text, title_rect)
+        surface.blit(title_text, title_rect)
         
         # Create a semi-transparent white background for instructions
         instructions_bg = pygame.Surface((500, 300), pygame.SRCALPHA)  # Width and height for the background
         instructions_bg.fill((255, 255, 255, 180))  # Semi-transparent white
         instructions_bg_rect = instructions_bg.get_rect(center=(SCREEN_WIDTH // 2, 300))
-        self.screen.blit(instructions_bg, instructions_bg_rect)
+        surface.blit(instructions_bg, instructions_bg_rect)
         
         # Draw instructions
         instructions = [
@@ -983,17 +1082,23 @@ class Game:
         
         y_pos = 180
         for instruction in instructions:
-            text = self.small_font.render(instruction, True, BLACK)  # Black text on white background
+            text = render_text(instruction, self.small_font, BLACK)  # Black text on white background
             rect = text.get_rect(center=(SCREEN_WIDTH // 2, y_pos))
-            self.screen.blit(text, rect)
+            surface.blit(text, rect)
             y_pos += 30
-        
-        # Draw buttons
-        for button in self.instructions_buttons:
-            button.draw(self.screen)
+    
+    def render_instructions(self):
+        """Render the instructions screen"""
+        layer = self.renderer.get_layer('instructions', self.draw_instructions_layer)
+        self.renderer.draw_static_screen(layer, self.instructions_buttons)
     
     def render(self):
         """Render the game based on current state"""
+        # A new screen has to be drawn and presented in full once
+        if self.state != self.rendered_state:
+            self.renderer.invalidate()
+            self.rendered_state = self.state
+        
         if self.state == STATE_SPLASH:
             self.render_splash()
         
@@ -1024,8 +1129,8 @@ class Game:
         elif self.state == STATE_INSTRUCTIONS:
             self.render_instructions()
         
-        # Update the display
-        pygame.display.flip()
+        # Update the display (only the changed areas when possible)
+        self.renderer.present()
     
     def load_high_score(self):
         """Load high score from file"""
@@ -1064,6 +1169,7 @@ class Game:
                     )
                 else:
                     self.screen = pygame.display.set_mode(self.window_size)
+                self.renderer.set_screen(self.screen)
                 
                 print(f"Display preferences loaded: fullscreen={self.fullscreen}, size={self.window_size}")
                 return True
@@ -1093,6 +1199,9 @@ class Game:
         if SAVE_DISPLAY_PREFERENCES:
             self.save_display_preferences()
         
+        # Write out any buffered log messages
+        self.event_log.close()
+        
         pygame.quit()
         sys.exit()
     
@@ -1119,7 +1228,7 @@ class Game:
                                         color=(0, 255, 255))
                 )
                 
-                print(f"Energy blast destroyed {asteroids_destroyed} asteroids, adding {total_points} points")
+                self.event_log.log(f"Energy blast destroyed {asteroids_destroyed} asteroids, adding {total_points} points")
             
             # Apply screen shake
             if self.player.screen_shake > 0:
@@ -1137,9 +1246,13 @@ class Game:
     def run(self):
         """Main game loop"""
         while True:
-            self.handle_events()
-            self.update()
-            self.render()
+            with self.profiler.section('input'):
+                self.handle_events()
+            with self.profiler.section('update'):
+                self.update()
+            with self.profiler.section('render'):
+                self.render()
+            self.profiler.end_frame()
             self.clock.tick(FPS)
 
 if __name__ == "__main__":
@@ -0,0 +1,120 @@
+import pygame
+import numpy as np
+from config import *
+
+class ParticleArray:
+    """
+    Structure-of-arrays storage for lots of small moving things.
+    Positions and velocities live in NumPy arrays so a whole batch can be
+    moved, culled and drawn with a handful of vectorized operations.
+    """
+
+    def __init__(self, capacity=256):
+        self.count = 0
+        self.pos = np.zeros((capacity, 2), dtype=np.float32)
+        self.vel = np.zeros((capacity, 2), dtype=np.float32)
+
+    def __len__(self):
+        return self.count
+
+    def _arrays(self):
+        """All per-entry arrays; subclasses add their own extra columns"""
+        return ['pos', 'vel']
+
+    def _reserve(self, amount):
+        """Make room for `amount` more entries and return the slice to fill"""
+        needed = self.count + amount
+        capacity = len(self.pos)
+        if needed > capacity:
+            while capacity < needed:
+                capacity *= 2
+            for name in self._arrays():
+                old = getattr(self, name)
+                new = np.zeros((capacity,) + old.shape[1:], dtype=old.dtype)
+                new[:self.count] = old[:self.count]
+                setattr(self, name, new)
+        start = self.count
+        self.count = needed
+        return slice(start, needed)
+
+    def keep(self, mask):
+        """Drop every live entry where mask is False, keeping the rest packed at the front"""
+        kept = int(mask.sum())
+        if kept == self.count:
+            return
+        for name in self._arrays():
+            array = getattr(self, name)
+            array[:kept] = array[:self.count][mask]
+        self.count = kept
+
+    def remove(self, mask):
+        """Drop every live entry where mask is True"""
+        if mask.any():
+            self.keep(~mask)
+
+    def clear(self):
+        self.count = 0
+
+    def on_screen_mask(self, margin=0):
+        """Boolean mask of live entries that are still inside the screen"""
+        pos = self.pos[:self.count]
+        return ((pos[:, 0] >= -margin) & (pos[:, 0] <= SCREEN_WIDTH + margin) &
+                (pos[:, 1] >= -margin) & (pos[:, 1] <= SCREEN_HEIGHT + margin))
+
+    def _blit_all(self, surface, sprites, sprite_index, offset):
+        """Draw every live entry with one blits() call"""
+        if self.count == 0:
+            return
+        top_left = (self.pos[:self.count] - offset).astype(np.int32).tolist()
+        indices = sprite_index.tolist()
+        surface.blits([(sprites[i], xy) for i, xy in zip(indices, top_left)], doreturn=False)
+
+class ParticleSystem(ParticleArray):
+    """Short-lived explosion sparks that fade out over their lifetime"""
+
+    FADE_LEVELS = 8
+
+    def __init__(self, capacity=512, size=3, color=YELLOW):
+        super().__init__(capacity)
+        self.life = np.zeros(capacity, dtype=np.float32)
+        self.max_life = np.ones(capacity, dtype=np.float32)
+        self.size = size
+
+        # One pre-rendered sprite per fade level instead of a surface per particle
+        self.sprites = []
+        for level in range(self.FADE_LEVELS):
+            sprite = pygame.Surface((size, size), pygame.SRCALPHA)
+            alpha = int(255 * (level + 1) / self.FADE_LEVELS)
+            sprite.fill((color[0], color[1], color[2], alpha))
+            self.sprites.append(sprite)
+
+    def _arrays(self):
+        return ['pos', 'vel', 'life', 'max_life']
+
+    def burst(self, x, y, amount=12, speed=3.0, life=30):
+        """Spawn `amount` particles flying out from (x, y) in random directions"""
+        batch = self._reserve(amount)
+        angles = np.random.uniform(0, 2 * np.pi, amount)
+        speeds = np.random.uniform(0.3, 1.0, amount) * speed
+        self.pos[batch] = (x, y)
+        self.vel[batch, 0] = np.cos(angles) * speeds
+        self.vel[batch, 1] = np.sin(angles) * speeds
+        self.life[batch] = life
+        self.max_life[batch] = life
+
+    def update(self):
+        """Move, age and cull all particles at once"""
+        if self.count == 0:
+            return
+        live = slice(0, self.count)
+        self.pos[live] += self.vel[live]
+        self.life[live] -= 1
+        self.keep((self.life[live] > 0) & self.on_screen_mask())
+
+    def draw(self, surface):
+        if self.count == 0:
+            return
+        live = slice(0, self.count)
+        fade = self.life[live] / self.max_life[live]
+        levels = np.clip((fade * self.FADE_LEVELS).astype(np.int32), 0, self.FADE_LEVELS - 1)
+        self._blit_all(surface, self.sprites, levels, self.size / 2)
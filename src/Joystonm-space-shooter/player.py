@@ -1,5 +1,4 @@
 import pygame
-from bullet import Bullet
 from config import *
 
 class Player:
@@ -24,7 +23,6 @@ class Player:
         # Shooting attributes
         self.last_shot = 0
         self.shoot_delay = PLAYER_SHOOT_DELAY
-        self.bullets = []
         
         # Player stats
         self.lives = PLAYER_LIVES
@@ -136,26 +134,25 @@ class Player:
         elif self.rect.bottom > SCREEN_HEIGHT:
             self.rect.bottom = SCREEN_HEIGHT
     
-    def shoot(self):
+    def shoot(self, bullets):
         """
-        Attempt to fire a bullet. Returns a list of bullets fired or an empty list if on cooldown.
+        Attempt to fire into the given BulletSystem. Returns the number of
+        bullets fired, or 0 if on cooldown.
         """
         # Check if enough time has passed since the last shot
         now = pygame.time.get_ticks()
         if now - self.last_shot > self.shoot_delay:
             self.last_shot = now
             
-            bullets_fired = []
-            
             if self.double_shot:
                 # Create two bullets side by side
-                bullet1 = Bullet(self.rect.left + 10, self.rect.top, -1)
-                bullet2 = Bullet(self.rect.right - 10, self.rect.top, -1)
-                bullets_fired.extend([bullet1, bullet2])
+                bullets.spawn(self.rect.left + 10, self.rect.top, -1)
+                bullets.spawn(self.rect.right - 10, self.rect.top, -1)
+                bullets_fired = 2
             else:
                 # Create a single bullet at the player's position
-                bullet = Bullet(self.rect.centerx, self.rect.top, -1)
-                bullets_fired.append(bullet)
+                bullets.spawn(self.rect.centerx, self.rect.top, -1)
+                bullets_fired = 1
             
             # Play shoot sound if available
             if self.shoot_sound:
@@ -163,7 +160,7 @@ class Player:
             
             return bullets_fired
         
-        return []
+        return 0
     
     def hit(self):
         """Handle player being hit by an enemy"""
@@ -223,13 +220,12 @@ class Player:
         current_radius = (self.blast_frame / self.blast_max_frames) * self.blast_radius
         
         # Check for enemy collisions with the blast
-        enemies_destroyed = 0
-        for enemy in enemies[:]:
+        def in_blast(enemy):
             distance = ((enemy.rect.centerx - self.rect.centerx) ** 2 + 
                        (enemy.rect.centery - self.rect.centery) ** 2) ** 0.5
-            if distance <= current_radius:
-                enemies.remove(enemy)
-                enemies_destroyed += 1
+            return distance <= current_radius
+        
+        enemies_destroyed = enemies.remove_if(in_blast)
         
         # End blast animation when complete
         if self.blast_frame >= self.blast_max_frames:
@@ -281,13 +277,12 @@ class Player:
         current_radius = (self.blast_frame / self.blast_max_frames) * self.blast_radius
         
         # Check for enemy collisions with the blast
-        enemies_destroyed = 0
-        for enemy in enemies[:]:
+        def in_blast(enemy):
             distance = ((enemy.rect.centerx - self.rect.centerx) ** 2 + 
                        (enemy.rect.centery - self.rect.centery) ** 2) ** 0.5
-            if distance <= current_radius:
-                enemies.remove(enemy)
-                enemies_destroyed += 1
+            return distance <= current_radius
+        
+        enemies_destroyed = enemies.remove_if(in_blast)
         
         # End blast animation when complete
         if self.blast_frame >= self.blast_max_frames:
@@ -0,0 +1,91 @@
+class ObjectPool:
+    """
+    Keeps released game objects on a free list so they can be reused.
+    Pooled classes must provide a reset(*args) method that takes the same
+    arguments as their constructor.
+    """
+
+    def __init__(self, factory):
+        self.factory = factory
+        self.free = []
+
+    def acquire(self, *args):
+        """Return a recycled object reset with args, or build a new one"""
+        if self.free:
+            obj = self.free.pop()
+            obj.reset(*args)
+            return obj
+        return self.factory(*args)
+
+    def release(self, obj):
+        """Hand an object back to the pool"""
+        self.free.append(obj)
+
+    def clear(self):
+        self.free.clear()
+
+class EntityList:
+    """
+    Unordered container of game entities with O(1) removal.
+    Removing an entity moves the last entity into its slot instead of
+    shifting the whole list. Removed entities go back to the pool if one is set.
+    """
+
+    def __init__(self, pool=None):
+        self.items = []
+        self.pool = pool
+
+    def __len__(self):
+        return len(self.items)
+
+    def __iter__(self):
+        return iter(self.items)
+
+    def __getitem__(self, index):
+        return self.items[index]
+
+    def __contains__(self, entity):
+        slot = getattr(entity, '_slot', -1)
+        return 0 <= slot < len(self.items) and self.items[slot] is entity
+
+    def append(self, entity):
+        entity._slot = len(self.items)
+        self.items.append(entity)
+
+    def extend(self, entities):
+        for entity in entities:
+            self.append(entity)
+
+    def remove(self, entity):
+        """Swap-remove an entity; does nothing if it is not in the list"""
+        if entity not in self:
+            return
+        slot = entity._slot
+        last = self.items.pop()
+        if last is not entity:
+            self.items[slot] = last
+            last._slot = slot
+        entity._slot = -1
+        if self.pool:
+            self.pool.release(entity)
+
+    def remove_if(self, predicate):
+        """
+        Remove every entity for which predicate(entity) is true in one pass.
+        Returns the number of entities removed.
+        """
+        removed = 0
+        # Walk backwards so entities swapped into a slot were already checked
+        for index in range(len(self.items) - 1, -1, -1):
+            entity = self.items[index]
+            if predicate(entity):
+                self.remove(entity)
+                removed += 1
+        return removed
+
+    def clear(self):
+        for entity in self.items:
+            entity._slot = -1
+            if self.pool:
+                self.pool.release(entity)
+        self.items.clear()
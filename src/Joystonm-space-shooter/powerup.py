@@ -34,6 +34,10 @@ class PowerUp:
     
     def __init__(self, x, y, powerup_type, assets):
         """Initialize a power-up at the given position"""
+        self.reset(x, y, powerup_type, assets)
+    
+    def reset(self, x, y, powerup_type, assets):
+        """Set up the power-up (also used when it is recycled from a pool)"""
         self.type = powerup_type
         self.info = self.TYPES[powerup_type]
         
@@ -79,9 +83,11 @@ class PowerUp:
         """Draw the power-up"""
         surface.blit(self.image, self.rect)
 
-def spawn_random_powerup(x, y, assets):
+def spawn_random_powerup(x, y, assets, pool=None):
     """Spawn a random power-up at the given position with the given chance"""
     if random.random() < POWERUP_SPAWN_CHANCE:
         powerup_type = random.choice(list(PowerUp.TYPES.keys()))
+        if pool:
+            return pool.acquire(x, y, powerup_type, assets)
         return PowerUp(x, y, powerup_type, assets)
     return None
@@ -0,0 +1,58 @@
+import time
+from collections import deque
+from contextlib import contextmanager
+
+class FrameProfiler:
+    """
+    Collects how long named parts of each frame take.
+    Wrap code in `with profiler.section('name'):` (or call begin/end
+    around it) and call end_frame() once per frame; the last `history`
+    frames are kept for statistics.
+    """
+
+    def __init__(self, history=600):
+        self.current = {}
+        self.history = deque(maxlen=history)
+        self.started = {}
+
+    @contextmanager
+    def section(self, name):
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            elapsed = time.perf_counter() - start
+            self.current[name] = self.current.get(name, 0.0) + elapsed
+
+    def begin(self, name):
+        self.started[name] = time.perf_counter()
+
+    def end(self, name):
+        elapsed = time.perf_counter() - self.started.pop(name)
+        self.current[name] = self.current.get(name, 0.0) + elapsed
+
+    def end_frame(self):
+        """Store the timings of the frame that just finished and start a new one"""
+        self.history.append(self.current)
+        self.current = {}
+
+    def samples(self, name):
+        """Timings in seconds of one section over the stored frames"""
+        return [frame.get(name, 0.0) for frame in self.history]
+
+    def average(self, name):
+        samples = self.samples(name)
+        return sum(samples) / len(samples) if samples else 0.0
+
+    def percentile(self, name, percent):
+        """Nearest-rank percentile (0-100) of a section's timings in seconds"""
+        samples = sorted(self.samples(name))
+        if not samples:
+            return 0.0
+        rank = max(0, min(len(samples) - 1, round(percent / 100 * len(samples)) - 1))
+        return samples[rank]
+
+    def reset(self):
+        self.current = {}
+        self.started = {}
+        self.history.clear()
@@ -0,0 +1,89 @@
+import pygame
+from config import *
+
+class Renderer:
+    """
+    Keeps pre-rendered static layers and the list of screen areas that
+    changed this frame, so only those areas are sent to the display.
+    """
+
+    def __init__(self, screen):
+        self.screen = screen
+        self.layers = {}
+        self.dirty = []
+        self.full_redraw = True
+        # Last drawn look of each button on a static screen, keyed by id(button)
+        self.button_states = {}
+
+    def set_screen(self, screen):
+        """Use a new display surface (after a fullscreen toggle) and rebuild everything"""
+        self.screen = screen
+        self.layers.clear()
+        self.invalidate()
+
+    def invalidate(self):
+        """Force the next frame to be drawn and presented in full"""
+        self.full_redraw = True
+        self.button_states.clear()
+
+    def get_layer(self, key, build, size=None, alpha=False, version=None):
+        """
+        Return the cached layer for key, calling build(surface) to draw it
+        the first time. Layers are screen-sized unless a size is given;
+        alpha layers start fully transparent.
+        A layer that shows changing values (such as scores) passes them as
+        version: it is redrawn on the same surface when they change, so each
+        key keeps a single surface.
+        """
+        cached = self.layers.get(key)
+        if cached is not None and cached[0] == version:
+            return cached[1]
+
+        size = size or self.screen.get_size()
+        if cached is not None and cached[1].get_size() == size:
+            layer = cached[1]
+            layer.fill((0, 0, 0, 0) if alpha else (0, 0, 0))
+        elif alpha:
+            layer = pygame.Surface(size, pygame.SRCALPHA).convert_alpha()
+        else:
+            layer = pygame.Surface(size).convert()
+        build(layer)
+        self.layers[key] = (version, layer)
+        return layer
+
+    def mark_dirty(self, rect):
+        if rect:
+            self.dirty.append(pygame.Rect(rect))
+
+    def draw_static_screen(self, layer, buttons):
+        """
+        Draw a menu-like screen: a cached layer plus buttons. After the
+        first frame only buttons whose look changed are redrawn.
+        """
+        if self.full_redraw:
+            self.screen.blit(layer, (0, 0))
+
+        for button in buttons:
+            state = (button.is_hovered, button.text, tuple(button.rect))
+            if not self.full_redraw and self.button_states.get(id(button)) == state:
+                continue
+
+            previous = self.button_states.get(id(button))
+            if previous and not self.full_redraw:
+                # Restore the layer where the button used to be
+                old_rect = pygame.Rect(previous[2])
+                self.screen.blit(layer, old_rect, old_rect)
+                self.mark_dirty(old_rect)
+
+            button.draw(self.screen)
+            self.mark_dirty(button.rect)
+            self.button_states[id(button)] = state
+
+    def present(self):
+        """Push this frame to the display: everything, or only the dirty areas"""
+        if self.full_redraw:
+            pygame.display.flip()
+        elif self.dirty:
+            pygame.display.update(self.dirty)
+        self.dirty = []
+        self.full_redraw = False
@@ -1,5 +1,6 @@
 import pygame
 from config import *
+from utils import get_font, render_text
 
 class Button:
     def __init__(self, x, y, width, height, text, font, action):
@@ -36,7 +37,7 @@ class Button:
         pygame.draw.rect(surface, WHITE, self.rect, 2)
         
         # Draw button text
-        text_surface = self.font.render(self.text, True, self.text_color)
+        text_surface = render_text(self.text, self.font, self.text_color)
         text_rect = text_surface.get_rect(center=self.rect.center)
         surface.blit(text_surface, text_rect)
 
@@ -72,13 +73,15 @@ class HealthBar:
             pygame.draw.rect(surface, color, (self.x, self.y, health_width, self.height))
         
         # Draw border
-        pygame.draw.rect(surface, WHITE, (self.x, self.y, self.width, self.height), 2)
+        bar_rect = pygame.draw.rect(surface, WHITE, (self.x, self.y, self.width, self.height), 2)
         
         # Draw text
-        font = pygame.font.Font(None, 20)
-        text = font.render(f"Health: {self.current_health}/{self.max_health}", True, WHITE)
+        font = get_font(None, 20)
+        text = render_text(f"Health: {self.current_health}/{self.max_health}", font, WHITE)
         text_rect = text.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2))
-        surface.blit(text, text_rect)
+        
+        # Return the area drawn so the renderer can update just that part of the screen
+        return bar_rect.union(surface.blit(text, text_rect))
 
 class ScoreDisplay:
     def __init__(self, x, y, font):
@@ -111,8 +114,8 @@ class ScoreDisplay:
         formatted_score = f"{self.display_score:,}"
         
         # Draw score
-        text = self.font.render(f"Score: {formatted_score}", True, WHITE)
-        surface.blit(text, (self.x, self.y))
+        text = render_text(f"Score: {formatted_score}", self.font, WHITE)
+        return surface.blit(text, (self.x, self.y))
 
 class LivesDisplay:
     def __init__(self, x, y, font, ship_image):
@@ -130,12 +133,13 @@ class LivesDisplay:
     
     def draw(self, surface):
         # Draw text
-        text = self.font.render("Lives:", True, WHITE)
-        surface.blit(text, (self.x, self.y))
+        text = render_text("Lives:", self.font, WHITE)
+        drawn = surface.blit(text, (self.x, self.y))
         
         # Draw ship icons
         for i in range(self.lives):
-            surface.blit(self.scaled_ship, (self.x + 60 + i * 25, self.y))
+            drawn.union_ip(surface.blit(self.scaled_ship, (self.x + 60 + i * 25, self.y)))
+        return drawn
 
 class PowerupIndicator:
     def __init__(self, x, y, font):
@@ -152,7 +156,7 @@ class PowerupIndicator:
             return
         
         # Draw header
-        text = self.font.render("Active Power-ups:", True, WHITE)
+        text = render_text("Active Power-ups:", self.font, WHITE)
         surface.blit(text, (self.x, self.y))
         
         # Draw each active powerup
@@ -177,7 +181,7 @@ class PowerupIndicator:
             pygame.draw.rect(surface, color, (self.x, self.y + y_offset, 10, 10))
             
             # Draw powerup name and timer
-            text = self.font.render(f"{name}: {remaining}s", True, color)
+            text = render_text(f"{name}: {remaining}s", self.font, color)
             surface.blit(text, (self.x + 15, self.y + y_offset - 2))
             
             y_offset += 20
@@ -232,14 +236,63 @@ class EnergyBar:
         
         # Draw border
         border_color = (0, 255, 255) if self.is_charged else WHITE
-        pygame.draw.rect(surface, border_color, (self.x, self.y, self.width, self.height), 2)
+        bar_rect = pygame.draw.rect(surface, border_color, (self.x, self.y, self.width, self.height), 2)
         
         # Draw text
-        font = pygame.font.Font(None, 20)
+        font = get_font(None, 20)
         if self.is_charged:
-            text = font.render("ENERGY BLAST READY! (X)", True, (0, 255, 255))
+            text = render_text("ENERGY BLAST READY! (X)", font, (0, 255, 255))
         else:
-            text = font.render(f"Energy: {self.current_energy}/{self.max_energy}", True, WHITE)
+            text = render_text(f"Energy: {self.current_energy}/{self.max_energy}", font, WHITE)
         
         text_rect = text.get_rect(center=(self.x + self.width // 2, self.y + self.height // 2))
-        surface.blit(text, text_rect)
+        return bar_rect.union(surface.blit(text, text_rect))
+
+class ProfilerOverlay:
+    """Toggleable panel with average per-system frame timings and entity counts"""
+    
+    SECTIONS = ['input', 'entities', 'collisions', 'ui', 'update', 'render']
+    
+    def __init__(self, x, y):
+        self.x = x
+        self.y = y
+        self.visible = False
+        self.width = 210
+        self.line_height = 18
+        self.background = None
+        self.lines = []
+        self.last_refresh = 0
+        self.refresh_interval = 250  # milliseconds between text updates
+    
+    def toggle(self):
+        self.visible = not self.visible
+    
+    def draw(self, surface, profiler, counts):
+        if not self.visible:
+            return None
+        
+        # Refresh the numbers a few times per second so they stay readable
+        current_time = pygame.time.get_ticks()
+        if not self.lines or current_time - self.last_refresh > self.refresh_interval:
+            self.last_refresh = current_time
+            self.lines = []
+            for name in self.SECTIONS:
+                average_ms = profiler.average(name) * 1000
+                self.lines.append((f"{name}: {average_ms:.2f} ms", WHITE))
+            for name, count in counts.items():
+                self.lines.append((f"{name}: {count}", YELLOW))
+        
+        font = get_font(None, 20)
+        
+        # Semi-transparent background, created once per size
+        height = len(self.lines) * self.line_height + 10
+        if self.background is None or self.background.get_height() != height:
+            self.background = pygame.Surface((self.width, height), pygame.SRCALPHA)
+            self.background.fill((0, 0, 0, 160))
+        drawn = surface.blit(self.background, (self.x, self.y))
+        
+        y = self.y + 5
+        for text, color in self.lines:
+            surface.blit(render_text(text, font, color), (self.x + 5, y))
+            y += self.line_height
+        return drawn
@@ -1,19 +1,24 @@
 import pygame
+import numpy as np
 import os
 import random
+from collections import OrderedDict
 from config import *
+from asset_cache import load_cached_image, build_atlas, load_sounds_async
+
+# Fonts are loaded once per (file, size) and shared by every caller
+_font_registry = {}
+
+# Rendered text surfaces keyed by (text, font, color, antialias), least recently used first
+_text_cache = OrderedDict()
 
 def load_image(filename):
-    """Load an image and convert it for optimal use in pygame."""
+    """Load an image (through the on-disk asset cache) and convert it for optimal use in pygame."""
     try:
-        print(f"Attempting to load image: {filename}")
         if not os.path.exists(filename):
-            print(f"File does not exist: {filename}")
             raise FileNotFoundError(f"Image file not found: {filename}")
             
-        image = pygame.image.load(filename).convert_alpha()
-        print(f"Successfully loaded image: {filename}")
-        return image
+        return load_cached_image(filename)
     except Exception as e:
         print(f"Error loading image {filename}: {e}")
         # Return a placeholder colored rectangle if image can't be loaded
@@ -41,6 +46,32 @@ def load_font(filename, size=36):
         # Return the default font if custom font can't be loaded
         return pygame.font.Font(None, size)
 
+def get_font(filename=None, size=36):
+    """Return a shared font object, loading it the first time it is asked for."""
+    key = (filename, size)
+    font = _font_registry.get(key)
+    if font is None:
+        font = load_font(filename, size) if filename else pygame.font.Font(None, size)
+        _font_registry[key] = font
+    return font
+
+def render_text(text, font, color, antialias=True):
+    """
+    Render text with the given font, reusing the surface if the same
+    text was rendered recently. The returned surface is shared, so don't draw on it.
+    """
+    key = (text, font, tuple(color), antialias)
+    surface = _text_cache.get(key)
+    if surface is not None:
+        _text_cache.move_to_end(key)
+        return surface
+    
+    surface = font.render(text, antialias, color)
+    _text_cache[key] = surface
+    if len(_text_cache) > TEXT_CACHE_SIZE:
+        _text_cache.popitem(last=False)
+    return surface
+
 def ensure_dir_exists(directory):
     """Ensure that a directory exists, creating it if necessary."""
     if not os.path.exists(directory):
@@ -53,37 +84,44 @@ def check_collision(obj1, obj2):
 def check_collisions(player, enemies, bullets, powerups=None):
     """
     Check all game collisions and handle their effects.
+    `bullets` is a BulletSystem; 'bullets_to_remove' in the result is a
+    boolean mask over its live bullets.
     Returns a dictionary with collision results.
     """
     results = {
         'player_hit': False,
         'enemies_destroyed': [],
-        'bullets_to_remove': [],
+        'bullets_to_remove': None,
         'powerup_collected': None,
         'score_change': 0
     }
     
-    # Check bullet collisions with enemies
-    for bullet in bullets[:]:
-        if bullet.direction < 0:  # Player bullets go up
-            for enemy in enemies[:]:
-                if check_collision(bullet, enemy):
-                    results['enemies_destroyed'].append(enemy)
-                    results['bullets_to_remove'].append(bullet)
-                    results['score_change'] += 10
-                    break
+    # Check bullet collisions with enemies, one vectorized test per enemy.
+    # Only player bullets (going up) count, and each bullet can hit one enemy.
+    available = bullets.player_bullets()
+    bullets_hit = np.zeros_like(available)
+    for enemy in enemies:
+        hits = bullets.overlapping(enemy.rect, available)
+        hit_count = int(hits.sum())
+        if hit_count:
+            results['enemies_destroyed'].append(enemy)
+            results['score_change'] += 10 * hit_count
+            available &= ~hits
+            bullets_hit |= hits
+    results['bullets_to_remove'] = bullets_hit
     
     # Check player collision with enemies
     for enemy in enemies:
         if check_collision(player, enemy) and not player.invincible:
             results['player_hit'] = True
-            results['enemies_destroyed'].append(enemy)
+            if enemy not in results['enemies_destroyed']:
+                results['enemies_destroyed'].append(enemy)
             results['score_change'] -= 50
             break
     
     # Check player collision with powerups
     if powerups:
-        for powerup in powerups[:]:
+        for powerup in powerups:
             if check_collision(player, powerup):
                 results['powerup_collected'] = powerup
                 results['score_change'] += 20
@@ -136,6 +174,11 @@ def load_assets():
         life_powerup = pygame.Surface(powerup_size)
         life_powerup.fill(RED)
         assets['powerup_life'] = life_powerup
+        
+        # Pack the small sprites into one atlas; backgrounds stay separate surfaces
+        sprite_keys = ['player_ship', 'enemy_ship', 'bullet', 'player_exploded',
+                       'powerup_double', 'powerup_shield', 'powerup_speed', 'powerup_life']
+        assets.update(build_atlas({key: assets[key] for key in sprite_keys}))
     except Exception as e:
         print(f"Error loading images: {e}")
         # Create placeholder images
@@ -179,12 +222,14 @@ def load_assets():
         red_powerup.fill(RED)
         assets['powerup_life'] = red_powerup
     
-    # Load sounds
+    # Load sounds (decoded in a background thread; they play once ready)
     try:
         pygame.mixer.init()
-        assets['shoot_sound'] = load_sound(SHOOT_SOUND)
-        assets['explosion_sound'] = load_sound(EXPLOSION_SOUND)
-        assets['powerup_sound'] = load_sound(POWERUP_SOUND)
+        assets.update(load_sounds_async({
+            'shoot_sound': SHOOT_SOUND,
+            'explosion_sound': EXPLOSION_SOUND,
+            'powerup_sound': POWERUP_SOUND
+        }, load_sound))
         
         # Handle background music separately to avoid pygame.error
         if os.path.exists(BACKGROUND_MUSIC):
@@ -203,11 +248,11 @@ def load_assets():
     
     # Load fonts
     try:
-        assets['main_font'] = load_font(MAIN_FONT, 36)
+        assets['main_font'] = get_font(MAIN_FONT, 36)
     except Exception as e:
         print(f"Error loading fonts: {e}")
         # Use default font
-        assets['main_font'] = pygame.font.Font(None, 36)
+        assets['main_font'] = get_font(None, 36)
     
     return assets
 
@@ -234,8 +279,10 @@ def update_floating_texts(floating_texts):
 
 def draw_floating_texts(surface, floating_texts):
     """Draw all floating text effects."""
-    font = pygame.font.Font(None, 24)
+    font = get_font(None, 24)
     for text in floating_texts:
-        text_surface = font.render(text['text'], True, text['color'])
+        text_surface = render_text(text['text'], font, text['color'])
+        # The surface is cached and shared, so clear the fade again after drawing
         text_surface.set_alpha(text['alpha'])
         surface.blit(text_surface, text['position'])
+        text_surface.set_alpha(None)
@@ -0,0 +1,312 @@
+"""
+Training, on-disk artifacts and batch prediction for the real estate price model.
+
+The fitted model, scaler and location encoder are saved under
+artifacts/v<MODEL_VERSION>/ together with a metadata.json that records the
+dataset hash and scikit-learn version they were built from. load_artifacts()
+reuses them as long as both still match, so the app does not retrain the
+random forest on every cold start.
+
+Command line usage:
+    python price_model.py train
+    python price_model.py predict listings.csv -o predictions.csv --jobs -1
+    python price_model.py benchmark
+
+See price_server.py for the same batch scoring over HTTP.
+"""
+import os
+import sys
+import copy
+import json
+import time
+import hashlib
+import argparse
+from datetime import datetime, timezone
+
+import joblib
+import numpy as np
+import pandas as pd
+import sklearn
+from sklearn.model_selection import train_test_split
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.preprocessing import LabelEncoder, StandardScaler
+
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(BASE_DIR, "real_estate_india.csv")
+ARTIFACT_DIR = os.path.join(BASE_DIR, "artifacts")
+
+# Bump this when the features or the model change so old artifacts are not reused
+MODEL_VERSION = 1
+
+FEATURE_COLUMNS = ['Area', 'Bedrooms', 'Bathrooms', 'Location']
+REQUIRED_COLUMNS = set(FEATURE_COLUMNS) | {'Price'}
+
+# Batches smaller than this are predicted on one thread; below it the
+# cost of starting worker threads outweighs the parallel tree evaluation
+PARALLEL_MIN_BATCH = 1000
+
+
+def file_hash(path):
+    """SHA-256 of a file, used to tell whether saved artifacts match the dataset"""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def load_filtered_data(csv_path=DATA_FILE, price_threshold=None):
+    """
+    Load the dataset and drop price outliers above the 99th quantile
+    (or above price_threshold when it is given).
+    Here we assume all prices in the dataset are in ten lakhs.
+    """
+    data = pd.read_csv(csv_path)
+    if not REQUIRED_COLUMNS.issubset(data.columns):
+        raise ValueError("Dataset is missing one or more required columns: "
+                         "'Area', 'Bedrooms', 'Bathrooms', 'Location', 'Price'")
+    if price_threshold is None:
+        price_threshold = data['Price'].quantile(0.99)
+    return data[data['Price'] <= price_threshold], price_threshold
+
+
+def train_artifacts(csv_path=DATA_FILE):
+    """Fit the encoder, scaler and model on the dataset and return them as a dict"""
+    data, price_threshold = load_filtered_data(csv_path)
+    data = data.copy()
+
+    # Encode the 'Location' column
+    le = LabelEncoder()
+    data['Location'] = le.fit_transform(data['Location'])
+
+    # Separate features and target
+    X = data[FEATURE_COLUMNS]
+    y = data['Price']
+
+    # Split into training and test sets
+    X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+
+    # Scale features
+    scaler = StandardScaler()
+    X_train = scaler.fit_transform(X_train)
+
+    model = RandomForestRegressor(n_estimators=100, random_state=42)
+    model.fit(X_train, y_train)
+
+    return {
+        'model': model,
+        'scaler': scaler,
+        'encoder': le,
+        'location_codes': location_codes(le),
+        'price_threshold': float(price_threshold),
+    }
+
+
+def location_codes(encoder):
+    """Lookup table from location name to its encoded value, built once per encoder"""
+    return {location: code for code, location in enumerate(encoder.classes_)}
+
+
+def _version_dir(directory):
+    return os.path.join(directory, f"v{MODEL_VERSION}")
+
+
+def save_artifacts(artifacts, data_hash, directory=ARTIFACT_DIR):
+    """Write the model, scaler and encoder plus their metadata to disk"""
+    target = _version_dir(directory)
+    os.makedirs(target, exist_ok=True)
+    joblib.dump(artifacts['model'], os.path.join(target, "model.joblib"))
+    joblib.dump(artifacts['scaler'], os.path.join(target, "scaler.joblib"))
+    joblib.dump(artifacts['encoder'], os.path.join(target, "encoder.joblib"))
+
+    metadata = {
+        'model_version': MODEL_VERSION,
+        'data_hash': data_hash,
+        'sklearn_version': sklearn.__version__,
+        'price_threshold': artifacts['price_threshold'],
+        'trained_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+    }
+    # Metadata is written last so a half-written set of artifacts is never picked up
+    with open(os.path.join(target, "metadata.json"), 'w') as f:
+        json.dump(metadata, f, indent=2)
+    return target
+
+
+def read_metadata(directory=ARTIFACT_DIR):
+    try:
+        with open(os.path.join(_version_dir(directory), "metadata.json")) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def load_artifacts(csv_path=DATA_FILE, directory=ARTIFACT_DIR, retrain=False):
+    """
+    Return the saved artifacts if they were built from this dataset with this
+    model version and scikit-learn version; otherwise train and save new ones.
+    """
+    data_hash = file_hash(csv_path)
+    metadata = read_metadata(directory)
+    up_to_date = (metadata is not None
+                  and metadata.get('model_version') == MODEL_VERSION
+                  and metadata.get('data_hash') == data_hash
+                  and metadata.get('sklearn_version') == sklearn.__version__)
+
+    if up_to_date and not retrain:
+        target = _version_dir(directory)
+        try:
+            encoder = joblib.load(os.path.join(target, "encoder.joblib"))
+            return {
+                'model': joblib.load(os.path.join(target, "model.joblib")),
+                'scaler': joblib.load(os.path.join(target, "scaler.joblib")),
+                'encoder': encoder,
+                'location_codes': location_codes(encoder),
+                'price_threshold': metadata['price_threshold'],
+            }
+        except (OSError, EOFError, KeyError, ValueError) as e:
+            print(f"Saved artifacts could not be loaded, retraining: {e}", file=sys.stderr)
+
+    artifacts = train_artifacts(csv_path)
+    save_artifacts(artifacts, data_hash, directory)
+    return artifacts
+
+
+def encode_features(artifacts, listings):
+    """
+    Turn a DataFrame of listings into the scaled feature matrix in one
+    vectorized pass: locations go through the lookup table and the scaler's
+    mean and scale are applied to the whole array at once.
+    """
+    missing = set(FEATURE_COLUMNS) - set(listings.columns)
+    if missing:
+        raise ValueError(f"Listings are missing column(s): {', '.join(sorted(missing))}")
+
+    locations = listings['Location'].astype(str)
+    codes = locations.map(artifacts['location_codes'])
+    if codes.isna().any():
+        unknown = sorted(set(locations[codes.isna()]))
+        raise ValueError(f"Unknown location(s): {', '.join(unknown)}. "
+                         f"Known locations: {', '.join(artifacts['location_codes'])}")
+
+    try:
+        features = np.column_stack([
+            listings['Area'].to_numpy(dtype=float),
+            listings['Bedrooms'].to_numpy(dtype=float),
+            listings['Bathrooms'].to_numpy(dtype=float),
+            codes.to_numpy(dtype=float),
+        ])
+    except (TypeError, ValueError):
+        raise ValueError("Area, Bedrooms and Bathrooms must be numbers")
+    # A null or empty cell becomes NaN, which the forest would still price
+    blank = np.isnan(features[:, :3])
+    if blank.any():
+        for column, rows in zip(FEATURE_COLUMNS, blank.T):
+            if rows.any():
+                positions = ', '.join(str(i + 1) for i in np.flatnonzero(rows))
+                raise ValueError(f"{column} is missing in listing(s) {positions}")
+
+    scaler = artifacts['scaler']
+    return (features - scaler.mean_) / scaler.scale_
+
+
+def predict_prices(artifacts, listings, n_jobs=None):
+    """
+    Predict prices for a DataFrame of listings with Area, Bedrooms, Bathrooms
+    and Location columns. Returns a NumPy array of prices in ten lakhs.
+    Batches of at least PARALLEL_MIN_BATCH listings evaluate the trees on
+    n_jobs threads (-1 uses every core).
+    """
+    features = encode_features(artifacts, listings)
+    model = artifacts['model']
+    if n_jobs is not None and len(features) >= PARALLEL_MIN_BATCH:
+        # Shallow copy shares the fitted trees, so concurrent callers never
+        # change n_jobs on the shared model
+        model = copy.copy(model)
+        model.n_jobs = n_jobs
+    return model.predict(features)
+
+
+def predict_csv(artifacts, input_path, output_path=None, n_jobs=None):
+    """Score a CSV of listings; the result gets an extra Predicted_Price column"""
+    listings = pd.read_csv(input_path)
+    listings['Predicted_Price'] = predict_prices(artifacts, listings, n_jobs)
+    if output_path:
+        listings.to_csv(output_path, index=False)
+    return listings
+
+
+def benchmark(artifacts, batch_sizes=(1, 100, 1000, 10000), repeats=20, seed=42, n_jobs=None):
+    """
+    Time predict_prices for single listings and for bulk batches.
+    Returns rows of (batch size, median ms per call, microseconds per listing).
+    """
+    rng = np.random.default_rng(seed)
+    locations = artifacts['encoder'].classes_
+    results = []
+    for size in batch_sizes:
+        listings = pd.DataFrame({
+            'Area': rng.integers(500, 5000, size),
+            'Bedrooms': rng.integers(1, 10, size),
+            'Bathrooms': rng.integers(1, 5, size),
+            'Location': rng.choice(locations, size),
+        })
+        predict_prices(artifacts, listings, n_jobs)  # warm up
+        timings = []
+        for _ in range(repeats):
+            start = time.perf_counter()
+            predict_prices(artifacts, listings, n_jobs)
+            timings.append(time.perf_counter() - start)
+        median = float(np.median(timings))
+        results.append((size, median * 1000, median / size * 1e6))
+    return results
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Real estate price model tools")
+    parser.add_argument('--data', default=DATA_FILE, help="training dataset (CSV)")
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    subparsers.add_parser('train', help="retrain the model and save new artifacts")
+
+    predict_parser = subparsers.add_parser('predict', help="predict prices for a CSV of listings")
+    predict_parser.add_argument('input', help="CSV with Area, Bedrooms, Bathrooms and Location columns ('-' for stdin)")
+    predict_parser.add_argument('-o', '--output', help="where to write the scored CSV (default: print it)")
+    predict_parser.add_argument('--jobs', type=int, default=None,
+                                help="threads for evaluating the trees on large batches (-1 uses every core)")
+
+    bench_parser = subparsers.add_parser('benchmark', help="measure single and bulk prediction latency")
+    bench_parser.add_argument('--repeats', type=int, default=20, help="timed runs per batch size")
+    bench_parser.add_argument('--jobs', type=int, default=None,
+                              help="threads for evaluating the trees on large batches (-1 uses every core)")
+
+    args = parser.parse_args()
+
+    if args.command == 'train':
+        start = time.perf_counter()
+        load_artifacts(args.data, retrain=True)
+        print(f"Trained and saved artifacts to {_version_dir(ARTIFACT_DIR)} "
+              f"in {time.perf_counter() - start:.2f}s")
+        return
+
+    start = time.perf_counter()
+    artifacts = load_artifacts(args.data)
+    print(f"Artifacts ready in {(time.perf_counter() - start) * 1000:.1f} ms", file=sys.stderr)
+
+    if args.command == 'predict':
+        try:
+            input_path = sys.stdin if args.input == '-' else args.input
+            scored = predict_csv(artifacts, input_path, args.output, args.jobs)
+        except (OSError, ValueError) as e:
+            sys.exit(f"Error: {e}")
+        if args.output:
+            print(f"Wrote {len(scored)} predictions to {args.output}", file=sys.stderr)
+        else:
+            print(scored.to_csv(index=False), end='')
+    elif args.command == 'benchmark':
+        print(f"{'batch':>8}{'ms/call':>12}{'us/listing':>14}")
+        for size, ms_per_call, us_per_listing in benchmark(artifacts, repeats=args.repeats, n_jobs=args.jobs):
+            print(f"{size:>8}{ms_per_call:>12.3f}{us_per_listing:>14.2f}")
+
+
+if __name__ == "__main__":
+    main()
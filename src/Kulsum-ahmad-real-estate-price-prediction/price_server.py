@@ -0,0 +1,131 @@
+"""
+Small local HTTP server for batch price estimation.
+
+POST /predict with either
+    - JSON: {"listings": [{"Area": 1200, "Bedrooms": 3, "Bathrooms": 2, "Location": "Pune"}, ...]}
+      (a bare list of listings works too); the reply is {"predictions": [...]}
+    - CSV (Content-Type: text/csv) with Area, Bedrooms, Bathrooms and Location
+      columns; the reply is the same CSV with a Predicted_Price column
+GET /health returns the model version and the known locations.
+
+Example:
+    python price_server.py --port 8000 --jobs -1
+    curl -X POST --data-binary @listings.csv -H "Content-Type: text/csv" http://127.0.0.1:8000/predict
+"""
+import io
+import sys
+import json
+import argparse
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pandas as pd
+
+from price_model import MODEL_VERSION, load_artifacts, predict_prices
+
+# Requests larger than this are refused
+MAX_BODY_BYTES = 64 * 1024 * 1024
+
+
+class PredictionHandler(BaseHTTPRequestHandler):
+    # Set by serve() before the server starts
+    artifacts = None
+    n_jobs = None
+
+    def _send(self, status, body, content_type="application/json"):
+        data = body.encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def _send_json(self, status, payload):
+        self._send(status, json.dumps(payload))
+
+    def do_GET(self):
+        if self.path != "/health":
+            self._send_json(404, {"error": "not found"})
+            return
+        self._send_json(200, {
+            "status": "ok",
+            "model_version": MODEL_VERSION,
+            "locations": list(self.artifacts['location_codes']),
+        })
+
+    def do_POST(self):
+        # Whatever goes wrong, the client still gets a reply
+        try:
+            self._predict()
+        except Exception as e:
+            self.log_error("prediction failed: %r", e)
+            self._send_json(500, {"error": "internal server error"})
+
+    def _predict(self):
+        if self.path != "/predict":
+            self._send_json(404, {"error": "not found"})
+            return
+
+        length_header = self.headers.get("Content-Length")
+        if length_header is None:
+            self._send_json(411, {"error": "Content-Length header is required"})
+            return
+        # Only plain ASCII digits: no sign, so no negative length to pass to read()
+        length_header = length_header.strip()
+        if not (length_header.isascii() and length_header.isdigit()):
+            self._send_json(400, {"error": f"invalid Content-Length: {length_header!r}"})
+            return
+        length = int(length_header)
+        if length > MAX_BODY_BYTES:
+            self._send_json(413, {"error": f"request body is larger than {MAX_BODY_BYTES} bytes"})
+            return
+        body = self.rfile.read(length)
+        is_csv = self.headers.get("Content-Type", "").startswith("text/csv")
+
+        try:
+            if is_csv:
+                listings = pd.read_csv(io.BytesIO(body))
+            else:
+                payload = json.loads(body or b"null")
+                records = payload.get("listings") if isinstance(payload, dict) else payload
+                if not isinstance(records, list):
+                    raise ValueError('expected {"listings": [...]} or a list of listings')
+                if not all(isinstance(record, dict) for record in records):
+                    raise ValueError("every listing must be a JSON object")
+                listings = pd.DataFrame.from_records(records)
+            predictions = predict_prices(self.artifacts, listings, self.n_jobs)
+        except (ValueError, KeyError, pd.errors.ParserError) as e:
+            self._send_json(400, {"error": str(e)})
+            return
+
+        if is_csv:
+            listings['Predicted_Price'] = predictions
+            self._send(200, listings.to_csv(index=False), "text/csv")
+        else:
+            self._send_json(200, {"predictions": predictions.tolist()})
+
+
+def serve(host="127.0.0.1", port=8000, n_jobs=None):
+    PredictionHandler.artifacts = load_artifacts()
+    PredictionHandler.n_jobs = n_jobs
+    server = ThreadingHTTPServer((host, port), PredictionHandler)
+    print(f"Serving price predictions on http://{host}:{port}/predict", file=sys.stderr)
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Batch price estimation server")
+    parser.add_argument('--host', default="127.0.0.1", help="address to listen on")
+    parser.add_argument('--port', type=int, default=8000, help="port to listen on")
+    parser.add_argument('--jobs', type=int, default=None,
+                        help="threads for evaluating the trees on large batches (-1 uses every core)")
+    args = parser.parse_args()
+    serve(args.host, args.port, args.jobs)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,69 +1,34 @@
 import streamlit as st
 import pandas as pd
-from sklearn.model_selection import train_test_split
-from sklearn.ensemble import RandomForestRegressor
-from sklearn.preprocessing import LabelEncoder, StandardScaler
+from price_model import load_artifacts, load_filtered_data, predict_prices
 
 
-# Load and preprocess data
-@st.cache_data
-def load_and_preprocess_data():
+# Load the saved model, scaler and encoder (they are only retrained when the dataset changes)
+@st.cache_resource
+def get_artifacts():
     try:
-        # Load your dataset
-        data = pd.read_csv("real_estate_india.csv")  
-        
-        # Check if necessary columns exist
-        required_columns = {"Area", "Bedrooms", "Bathrooms", "Location", "Price"}
-        if not required_columns.issubset(data.columns):
-            st.error("Dataset is missing one or more required columns: 'Area', 'Bedrooms', 'Bathrooms', 'Location', 'Price'")
-            return None, None, None, None, None, None, None
-        
-        # Here we assume all prices in the dataset are in ten lakhs
-        # Filter out outliers using the 99th quantile
-        price_threshold = data['Price'].quantile(0.99)
-        data = data[data['Price'] <= price_threshold]
-        
-        # Encode the 'Location' column
-        le = LabelEncoder()
-        data['Location'] = le.fit_transform(data['Location'])
-        
-        # Separate features and target
-        X = data[['Area', 'Bedrooms', 'Bathrooms', 'Location']]
-        y = data['Price']
-        
-        # Split into training and test sets
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
-        
-        # Scale features
-        scaler = StandardScaler()
-        X_train = scaler.fit_transform(X_train)
-        X_test = scaler.transform(X_test)
-        
-        return X_train, X_test, y_train, y_test, scaler, le, price_threshold
+        return load_artifacts()
     except FileNotFoundError:
         st.error("Dataset file not found. Please check the file path.")
-        return None, None, None, None, None, None, None
-    except Exception as e:
-        st.error(f"An error occurred during data loading and preprocessing: {e}")
-        return None, None, None, None, None, None, None
-
-# Train model
-@st.cache_resource
-def train_model(X_train, y_train):
-    try:
-        model = RandomForestRegressor(n_estimators=100, random_state=42)
-        model.fit(X_train, y_train)
-        return model
+        return None
     except Exception as e:
-        st.error(f"An error occurred during model training: {e}")
+        st.error(f"An error occurred while loading the model: {e}")
         return None
 
-# Load data and train model
-X_train, X_test, y_train, y_test, scaler, le, price_threshold = load_and_preprocess_data()
-if X_train is not None and y_train is not None:
-    model = train_model(X_train, y_train)
+# Filtered dataset for display, read once instead of on every checkbox toggle
+@st.cache_data
+def get_filtered_data(price_threshold):
+    data, _ = load_filtered_data(price_threshold=price_threshold)
+    return data
+
+artifacts = get_artifacts()
+if artifacts is not None:
+    model = artifacts['model']
+    scaler = artifacts['scaler']
+    le = artifacts['encoder']
+    price_threshold = artifacts['price_threshold']
 else:
-    model = None
+    model = scaler = le = price_threshold = None
 
 # Streamlit app UI
 st.title("Real Estate Price Prediction")
@@ -81,28 +46,38 @@ if le:
         # Predefined list of locations
         Location = ['Bangalore', 'Delhi', 'Hyderabad', 'Mumbai', 'Patna', 'Pune', 'Kolkata', 'Shimla', 'Jaipur', 'Bhopal']
         Location = st.selectbox("Select Location:", Location)
-        location_encoded = le.transform([Location])[0]  # Encode the selected location
         
         # Prepare input data for prediction
-        input_data = scaler.transform([[Area, Bedrooms, Bathrooms, location_encoded]])
+        input_data = pd.DataFrame([{'Area': Area, 'Bedrooms': Bedrooms, 'Bathrooms': Bathrooms, 'Location': Location}])
 
         
 
         # Predict button
         if st.button("Predict Price"):
-            predicted_Price = model.predict(input_data)[0]  # Prediction in ten lakhs
+            try:
+                predicted_Price = predict_prices(artifacts, input_data)[0]  # Prediction in ten lakhs
+            except ValueError as e:
+                st.error(str(e))
+            else:
+                price_in_crores = predicted_Price / 10_000_000
+                price_in_ten_lakhs = predicted_Price
 
-            price_in_crores = predicted_Price / 10_000_000
-            price_in_ten_lakhs = predicted_Price
+                
+                # Display price in ten lakhs or crores based on the amount
+                
+                st.success(f"Estimated Price: ₹{price_in_ten_lakhs:.2f} Lakhs (₹{price_in_crores:.2f}Crores)")
 
-            
-            # Display price in ten lakhs or crores based on the amount
-            
-            st.success(f"Estimated Price: ₹{price_in_ten_lakhs:.2f} Lakhs (₹{price_in_crores:.2f}Crores)")
+        # Batch prediction for a CSV of listings
+        uploaded = st.file_uploader("Predict prices for a CSV of listings (Area, Bedrooms, Bathrooms, Location)", type="csv")
+        if uploaded is not None:
+            try:
+                listings = pd.read_csv(uploaded)
+                listings['Predicted_Price'] = predict_prices(artifacts, listings, n_jobs=-1)
+                st.write(listings)
+                st.download_button("Download predictions", listings.to_csv(index=False), "predictions.csv", "text/csv")
+            except ValueError as e:
+                st.error(str(e))
 
     # Optional: Display raw dataset with quantile filtering
-if st.checkbox("Show Filtered Dataset"):
-        data = pd.read_csv("real_estate_india.csv")  # Update with the path to your dataset
-        # Apply quantile filtering again for display
-        data = data[data['Price'] <= price_threshold]
-        st.write(data)
\ No newline at end of file
+if price_threshold is not None and st.checkbox("Show Filtered Dataset"):
+        st.write(get_filtered_data(price_threshold))
\ No newline at end of file
@@ -1,15 +1,74 @@
 
 import os
+import sys
+import time
+import errno
 import shutil
 import logging
+import argparse
+import codecs
+import configparser
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 
 # Configure logging
 logging.basicConfig(level=logging.INFO, format='%(asctime)s - %(levelname)s - %(message)s')
 
-def organize_files(source_dir, destination_dir):
+# Files moved per task handed to the thread pool
+BATCH_SIZE = 256
+# Seconds between two progress messages
+PROGRESS_INTERVAL = 1.0
+
+# Define file categories and their corresponding extensions
+DEFAULT_CATEGORIES = {
+    'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'],
+    'Documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.ppt', '.pptx', '.xls', '.xlsx'],
+    'Videos': ['.mp4', '.mov', '.avi', '.mkv', '.flv', '.wmv'],
+    'Audio': ['.mp3', '.wav', '.aac', '.flac', '.ogg'],
+    'Archives': ['.zip', '.rar', '.7z', '.tar', '.gz'],
+    'Code': ['.py', '.js', '.html', '.css', '.java', '.c', '.cpp', '.php', '.go', '.rb'],
+    'Executables': ['.exe', '.dmg', '.app', '.deb', '.rpm'],
+    'Others': [] # Files that don't match any specific category
+}
+
+# User-editable categories; DEFAULT_CATEGORIES is used when the file is missing
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'categories.ini')
+
+# File types recognized by their first bytes: (category, ((offset, signature), ...))
+MAGIC_NUMBERS = [
+    ('Images', ((0, b'\x89PNG\r\n\x1a\n'),)),
+    ('Images', ((0, b'\xff\xd8\xff'),)),
+    ('Images', ((0, b'GIF87a'),)),
+    ('Images', ((0, b'GIF89a'),)),
+    ('Images', ((0, b'RIFF'), (8, b'WEBP'))),
+    ('Documents', ((0, b'%PDF-'),)),
+    ('Archives', ((0, b'PK\x03\x04'),)),
+    ('Archives', ((0, b'Rar!\x1a\x07'),)),
+    ('Archives', ((0, b'7z\xbc\xaf\x27\x1c'),)),
+    ('Archives', ((0, b'\x1f\x8b'),)),
+    ('Archives', ((257, b'ustar'),)),
+    ('Audio', ((0, b'ID3'),)),
+    ('Audio', ((0, b'fLaC'),)),
+    ('Audio', ((0, b'OggS'),)),
+    ('Audio', ((0, b'RIFF'), (8, b'WAVE'))),
+    ('Audio', ((4, b'ftypM4A'),)),
+    ('Videos', ((4, b'ftyp'),)),
+    ('Videos', ((0, b'RIFF'), (8, b'AVI '))),
+    ('Videos', ((0, b'\x1a\x45\xdf\xa3'),)),
+    ('Videos', ((0, b'FLV\x01'),)),
+    ('Executables', ((0, b'\x7fELF'),)),
+    ('Executables', ((0, b'MZ'),)),
+    ('Executables', ((0, b'\xcf\xfa\xed\xfe'),)),
+]
+# Bytes read from a file to sniff its type
+SNIFF_SIZE = max(offset + len(signature) for _, parts in MAGIC_NUMBERS for offset, signature in parts)
+
+def organize_files(source_dir, destination_dir, recursive=True, workers=None, rules_file=RULES_FILE, sniff=False):
     """
-    Organizes files from a source directory into category-based subdirectories
-    within a destination directory.
+    Organizes files from a source directory (and, with recursive=True, all of
+    its subdirectories) into category-based subdirectories within a destination
+    directory. Files are moved by a pool of threads.
+    The categories are read from rules_file. With sniff=True, files with an
+    unknown or no extension are recognized by their first bytes.
     """
     if not os.path.exists(source_dir):
         logging.error(f"Source directory not found: {source_dir}")
@@ -19,17 +78,8 @@ def organize_files(source_dir, destination_dir):
         os.makedirs(destination_dir)
         logging.info(f"Created destination directory: {destination_dir}")
 
-    # Define file categories and their corresponding extensions
-    categories = {
-        'Images': ['.jpg', '.jpeg', '.png', '.gif', '.bmp', '.tiff', '.webp'],
-        'Documents': ['.pdf', '.doc', '.docx', '.txt', '.rtf', '.odt', '.ppt', '.pptx', '.xls', '.xlsx'],
-        'Videos': ['.mp4', '.mov', '.avi', '.mkv', '.flv', '.wmv'],
-        'Audio': ['.mp3', '.wav', '.aac', '.flac', '.ogg'],
-        'Archives': ['.zip', '.rar', '.7z', '.tar', '.gz'],
-        'Code': ['.py', '.js', '.html', '.css', '.java', '.c', '.cpp', '.php', '.go', '.rb'],
-        'Executables': ['.exe', '.dmg', '.app', '.deb', '.rpm'],
-        'Others': [] # Files that don't match any specific category
-    }
+    categories = load_rules(rules_file)
+    extension_index = build_extension_index(categories)
 
     # Create category subdirectories if they don't exist
     for category_name in categories.keys():
@@ -38,41 +88,237 @@ def organize_files(source_dir, destination_dir):
             os.makedirs(category_path)
             logging.info(f"Created category directory: {category_path}")
 
-    # Iterate through files in the source directory
-    for filename in os.listdir(source_dir):
-        source_path = os.path.join(source_dir, filename)
-
-        # Skip directories
-        if os.path.isdir(source_path):
-            continue
-
-        file_extension = os.path.splitext(filename)[1].lower()
-        moved = False
-
-        for category, extensions in categories.items():
-            if file_extension in extensions:
-                destination_path = os.path.join(destination_dir, category, filename)
-                try:
-                    shutil.move(source_path, destination_path)
-                    logging.info(f"Moved '{filename}' to '{category}'")
-                    moved = True
-                except Exception as e:
-                    logging.error(f"Error moving '{filename}': {e}")
-                break
-        
-        if not moved:
-            # Move to 'Others' category if no specific category is found
-            destination_path = os.path.join(destination_dir, 'Others', filename)
+    # Never descend into the destination or its category directories when they are inside the source directory
+    skip = {os.path.abspath(destination_dir)}
+    skip.update(os.path.abspath(os.path.join(destination_dir, category_name)) for category_name in categories)
+    targets = TargetNames()
+    progress = Progress()
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        batch = []
+
+        # Iterate through files in the source directory
+        for entry in scan_files(source_dir, recursive, skip):
+            # One dict lookup instead of a scan of every category's extensions
+            category = extension_index.get(file_extension(entry.name))
+            if category is None and sniff:
+                category = sniff_category(entry.path)
+                if category not in categories:
+                    category = None
+            if category is None:
+                category = 'Others'  # Files that don't match any specific category
+
+            batch.append((entry.path, targets.claim(os.path.join(destination_dir, category), entry.name), category))
+            progress.scanned += 1
+            if len(batch) == BATCH_SIZE:
+                pending.add(pool.submit(move_batch, batch))
+                batch = []
+                # Keep scanning ahead of the moves, but not by more than a few batches
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    report_moves(done, progress)
+
+        if batch:
+            pending.add(pool.submit(move_batch, batch))
+        if pending:
+            report_moves(wait(pending).done, progress)
+
+    progress.finish()
+    logging.info("File organization complete.")
+
+def load_rules(path=RULES_FILE):
+    """
+    Categories from a rules file such as categories.ini:
+
+        [categories]
+        Images = .jpg .jpeg .png
+
+    Returns DEFAULT_CATEGORIES if the file does not exist or has no [categories] section.
+    """
+    if not os.path.exists(path):
+        return DEFAULT_CATEGORIES
+    parser = configparser.ConfigParser()
+    parser.optionxform = str  # Keep the case of the category names
+    parser.read(path, encoding='utf-8')
+    if not parser.has_section('categories'):
+        logging.error(f"No [categories] section in {path}, using the default categories")
+        return DEFAULT_CATEGORIES
+    rules = {
+        category: [extension if extension.startswith('.') else '.' + extension
+                   for extension in extensions.lower().replace(',', ' ').split()]
+        for category, extensions in parser['categories'].items()
+    }
+    rules.setdefault('Others', [])
+    return rules
+
+def build_extension_index(categories):
+    """extension -> category; an extension listed twice goes to its first category, as before"""
+    index = {}
+    for category, extensions in categories.items():
+        for extension in extensions:
+            index.setdefault(extension, category)
+    return index
+
+def file_extension(filename):
+    """Lowercase extension, like os.path.splitext(filename)[1].lower() but faster for ordinary names"""
+    dot = filename.rfind('.')
+    if dot > 0 and filename[0] != '.':
+        return filename[dot:].lower()
+    # No extension, or a name like '.bashrc'
+    return os.path.splitext(filename)[1].lower()
+
+def sniff_category(path):
+    """Category from the first bytes of a file (None if not recognized); reads at most SNIFF_SIZE bytes"""
+    try:
+        with open(path, 'rb') as f:
+            head = f.read(SNIFF_SIZE)
+    except OSError:
+        return None
+
+    for category, parts in MAGIC_NUMBERS:
+        if all(head[offset:offset + len(signature)] == signature for offset, signature in parts):
+            return category
+
+    # Text without a known extension (README, LICENSE, ...). The incremental
+    # decoder accepts a character cut off at the end of the bytes read.
+    if head and b'\0' not in head:
+        try:
+            codecs.getincrementaldecoder('utf-8')().decode(head)
+            return 'Documents'
+        except UnicodeDecodeError:
+            pass
+    return None
+
+def scan_files(directory, recursive=True, skip=()):
+    """
+    Yields a DirEntry for every file in the directory (and its subdirectories).
+    DirEntry keeps the file type from the directory listing, so there is no
+    extra stat call per file as with os.path.isdir().
+    """
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and os.path.abspath(entry.path) not in skip:
+                            pending.append(entry.path)
+                    # Skip links to directories, like directories
+                    elif not (entry.is_symlink() and entry.is_dir()):
+                        yield entry
+        except OSError as e:
+            logging.error(f"Cannot read '{current}': {e}")
+
+class TargetNames:
+    """
+    Picks a free name in the category directory for every file, so files with
+    the same name from different subdirectories are not overwritten: the second
+    'photo.jpg' is moved as 'photo (1).jpg'.
+    """
+
+    def __init__(self):
+        self.taken = {}
+        # Next number to try for a name, so many files with the same name stay cheap
+        self.numbers = {}
+
+    @staticmethod
+    def _key(name):
+        # Windows and macOS file systems ignore case
+        return name.lower() if sys.platform in ('win32', 'darwin') else name
+
+    def claim(self, folder, filename):
+        taken = self.taken.get(folder)
+        if taken is None:
+            with os.scandir(folder) as entries:
+                taken = self.taken[folder] = {self._key(entry.name) for entry in entries}
+
+        name = filename
+        if self._key(name) in taken:
+            stem, extension = os.path.splitext(filename)
+            counter = (folder, self._key(filename))
+            number = self.numbers.get(counter, 1)
+            name = f"{stem} ({number}){extension}"
+            while self._key(name) in taken:
+                number += 1
+                name = f"{stem} ({number}){extension}"
+            self.numbers[counter] = number + 1
+        taken.add(self._key(name))
+        return os.path.join(folder, name)
+
+def move_batch(moves):
+    """Runs in a worker thread: moves the files, returns (source, target, category, error) for each"""
+    results = []
+    for source_path, destination_path, category in moves:
+        try:
             try:
+                # A rename is a single metadata operation when both paths are on the same file system
+                os.rename(source_path, destination_path)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
                 shutil.move(source_path, destination_path)
-                logging.info(f"Moved '{filename}' to 'Others'")
-            except Exception as e:
-                logging.error(f"Error moving '{filename}': {e}")
+            results.append((source_path, destination_path, category, None))
+        except Exception as e:
+            results.append((source_path, destination_path, category, e))
+    return results
 
-    logging.info("File organization complete.")
+def report_moves(futures, progress):
+    for future in futures:
+        for source_path, destination_path, category, error in future.result():
+            if error is None:
+                # One line per file would flood the console for large trees; shown with --verbose
+                logging.debug(f"Moved '{source_path}' to '{category}'")
+                progress.moved += 1
+            else:
+                logging.error(f"Error moving '{source_path}': {error}")
+                progress.failed += 1
+    progress.update()
+
+class Progress:
+    """Logs the number of moved files and the throughput at most once per PROGRESS_INTERVAL"""
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.scanned = self.moved = self.failed = 0
+
+    def message(self):
+        elapsed = time.perf_counter() - self.start
+        rate = self.moved / elapsed if elapsed else 0
+        return f"Scanned {self.scanned} files, moved {self.moved}, failed {self.failed} ({rate:.0f} files/s, {elapsed:.1f}s)"
+
+    def update(self):
+        now = time.perf_counter()
+        if now - self.last >= PROGRESS_INTERVAL:
+            self.last = now
+            logging.info(self.message())
+
+    def finish(self):
+        logging.info(self.message())
 
 if __name__ == "__main__":
-    # Example usage (replace with actual paths or command-line arguments)
+    parser = argparse.ArgumentParser(description="Organize files into category directories")
+    parser.add_argument('source', nargs='?', help="directory to organize (without it, a demonstration is run)")
+    parser.add_argument('destination', nargs='?', help="directory for the category directories (default: the source)")
+    parser.add_argument('--top-level', action='store_true', help="leave the files in subdirectories alone")
+    parser.add_argument('--workers', type=int, help="threads moving files (default: CPUs + 4, at most 32)")
+    parser.add_argument('--rules', default=RULES_FILE, help="categories and extensions (default: categories.ini next to this script)")
+    parser.add_argument('--sniff', action='store_true', help="recognize files with an unknown extension by their first bytes")
+    parser.add_argument('-v', '--verbose', action='store_true', help="log every moved file")
+    args = parser.parse_args()
+
+    if args.verbose:
+        logging.getLogger().setLevel(logging.DEBUG)
+
+    if args.source:
+        organize_files(args.source, args.destination or args.source,
+                       recursive=not args.top_level, workers=args.workers,
+                       rules_file=args.rules, sniff=args.sniff)
+        sys.exit()
+
+    # Example usage
     # For demonstration, let's create some dummy files and directories
     
     # Create a dummy source directory
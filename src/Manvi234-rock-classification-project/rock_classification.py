@@ -7,12 +7,21 @@ a series of questions in the terminal.
 """
 
 # --- 1. Imports ---
+import os
+import time
+import hashlib
+import inspect
 import pandas as pd
 import numpy as np
 import matplotlib.pyplot as plt
 import warnings
 from pathlib import Path
-from sklearn.model_selection import GridSearchCV
+from concurrent.futures import ProcessPoolExecutor
+from joblib import Memory
+from scipy.stats import loguniform, randint
+from sklearn.base import clone
+from sklearn.experimental import enable_halving_search_cv  # noqa: F401 (enables HalvingRandomSearchCV)
+from sklearn.model_selection import GridSearchCV, HalvingRandomSearchCV, ParameterSampler, StratifiedKFold
 from sklearn.preprocessing import PowerTransformer
 from sklearn.linear_model import LogisticRegression
 from sklearn.svm import SVC
@@ -21,8 +30,39 @@ from sklearn.metrics import accuracy_score, f1_score
 
 warnings.filterwarnings('ignore')
 
+FEATURES = [f"feature_{i}" for i in range(1, 12)]
+
+# The parsed and transformed feature matrix is cached here, keyed by a hash of the source files
+CACHE_DIR = Path(__file__).resolve().parent / '.feature_cache'
+# Bump this when loading or preprocessing changes so old cache files are not reused
+CACHE_VERSION = 1
+
+# Hyperparameter search results, keyed by model, search space, strategy and training data
+TUNING_CACHE_DIR = Path(__file__).resolve().parent / '.tuning_cache'
+memory = Memory(TUNING_CACHE_DIR, verbose=0)
+
+TUNING_STRATEGIES = {
+    'grid': 'Exhaustive grid search (GridSearchCV)',
+    'halving': 'Successive halving random search (much faster)',
+}
+
+# Random search spaces for the 'halving' strategy. ('log', low, high) is a
+# log-uniform float and ('int', low, high) an integer in [low, high);
+# lists are sampled uniformly.
+SEARCH_SPACES = {
+    'lr': {'C': ('log', 1e-3, 1e2), 'max_iter': [200]},
+    'svm': {'C': ('log', 1e-1, 1e2), 'kernel': ['poly', 'rbf'], 'gamma': ['scale', 'auto']},
+    'rf': {'max_depth': [10, 20, 30, None], 'min_samples_leaf': ('int', 1, 5),
+           'max_features': ['sqrt', 'log2', None]},
+    'adaboost': {'learning_rate': ('log', 0.1, 1.0), 'estimator__max_depth': [10, 20, 30],
+                 'estimator__max_features': ['sqrt', 'log2', None]},
+}
+HALVING_CANDIDATES = 24  # parameter sets sampled per halving search
+FOREST_MIN_TREES = 25    # trees per forest in the first warm-start round
+FOREST_MAX_TREES = 200   # trees per forest in the last warm-start round
+
 # --- 2. Core Logic Functions (Data loading, preprocessing, evaluation) ---
-# These functions contain the core analysis pipeline and are unchanged.
+# These functions contain the core analysis pipeline.
 
 def load_and_combine_data(label_path, feature_path):
     """Loads and combines rock data."""
@@ -32,7 +72,7 @@ def load_and_combine_data(label_path, feature_path):
         return None
     df_labels = pd.read_excel(label_path, names=['label'], usecols=[1], nrows=480, header=None)
     df_features = pd.read_csv(
-        feature_path, delim_whitespace=True, header=None,
+        feature_path, sep=r'\s+', header=None,
         usecols=[2] + list(range(3, 14)), nrows=480
     )
     df_features.columns = ["token_number"] + [f"feature_{i}" for i in range(1, 12)]
@@ -40,16 +80,67 @@ def load_and_combine_data(label_path, feature_path):
     print("✅ Data loaded successfully.")
     return combined_df
 
-def preprocess_and_split(df):
-    """Applies transformation and splits data."""
-    print("\nStep 2: Preprocessing and splitting data...")
-    features = [f"feature_{i}" for i in range(1, 12)]
-    X = df[features]
+def transform_features(df):
+    """Applies the Yeo-Johnson power transformation to the features."""
+    X = df[FEATURES]
     pt = PowerTransformer(method='yeo-johnson')
     X_transformed = pt.fit_transform(X)
-    X_transformed_df = pd.DataFrame(X_transformed, columns=features)
-    transformed_df = pd.concat([df[['label', 'token_number']], X_transformed_df], axis=1)
-    
+    X_transformed_df = pd.DataFrame(X_transformed, columns=FEATURES)
+    return pd.concat([df[['label', 'token_number']], X_transformed_df], axis=1)
+
+def file_hash(*paths):
+    """SHA-256 over the contents of the given files and the cache version."""
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for path in paths:
+        with open(path, 'rb') as f:
+            for chunk in iter(lambda: f.read(1 << 20), b''):
+                digest.update(chunk)
+    return digest.hexdigest()
+
+def load_transformed_data(label_path, feature_path):
+    """
+    Returns the transformed feature matrix, read from a .npz cache file when the
+    label and feature files are unchanged. Otherwise the Excel and text files are
+    parsed, transformed and the result is cached for the next run.
+    """
+    if not Path(label_path).exists() or not Path(feature_path).exists():
+        print(f"Error: One or more data files not found. Please check paths.")
+        return None
+
+    cache_file = CACHE_DIR / f"features_{file_hash(label_path, feature_path)[:16]}.npz"
+    if cache_file.exists():
+        try:
+            with np.load(cache_file) as cached:
+                transformed_df = pd.DataFrame(cached['features'], columns=FEATURES)
+                transformed_df.insert(0, 'label', cached['label'])
+                transformed_df.insert(1, 'token_number', cached['token_number'])
+            print("\nStep 1: Loading cached feature matrix...")
+            print("✅ Data loaded successfully (unchanged source files).")
+            return transformed_df
+        except (OSError, KeyError, ValueError) as e:
+            print(f"Warning: Ignoring unreadable cache file '{cache_file}': {e}")
+
+    df = load_and_combine_data(label_path, feature_path)
+    if df is None:
+        return None
+    transformed_df = transform_features(df)
+
+    try:
+        CACHE_DIR.mkdir(exist_ok=True)
+        for old_file in CACHE_DIR.glob("features_*.npz"):
+            old_file.unlink()
+        np.savez(cache_file,
+                 label=transformed_df['label'].to_numpy(),
+                 token_number=transformed_df['token_number'].to_numpy(),
+                 features=transformed_df[FEATURES].to_numpy())
+    except OSError as e:
+        print(f"Warning: Could not write feature cache: {e}")
+    return transformed_df
+
+def split_data(transformed_df):
+    """Splits the transformed data into train, validation and test sets by token number."""
+    print("\nStep 2: Splitting data...")
+    features = FEATURES
     train_df = transformed_df[transformed_df['token_number'].between(1, 10)]
     val_df = transformed_df[transformed_df['token_number'].between(11, 13)]
     test_df = transformed_df[transformed_df['token_number'].between(14, 16)]
@@ -112,6 +203,146 @@ def analyze_human_vs_model(best_model, full_feature_df, human_trial_path, save_p
         print("Displaying plot...")
         plt.show()
 
+def build_estimator(model_name):
+    """Returns the estimator and its hyperparameter grid for a model option."""
+    if model_name == 'lr':
+        estimator = LogisticRegression(solver='lbfgs', random_state=42)  # multinomial for multi-class data
+        params = {'C': [0.01, 0.1, 1], 'max_iter': [200]}
+    elif model_name == 'svm':
+        estimator = SVC(probability=True, random_state=42)
+        params = {'C': [1, 10], 'kernel': ['poly', 'rbf']}
+    elif model_name == 'rf':
+        estimator = RandomForestClassifier(random_state=42)
+        params = {'n_estimators': [50, 100], 'max_depth': [20, 30]}
+    elif model_name == 'adaboost':
+        # AdaBoost uses a base model. We'll use a default RF.
+        base_rf = RandomForestClassifier(n_estimators=100, max_depth=20, random_state=42)
+        estimator = AdaBoostClassifier(estimator=base_rf, n_estimators=50, random_state=42)
+        params = {} # No separate tuning for AdaBoost in this setup
+    else:
+        raise ValueError(f"Unknown model: {model_name}")
+    return estimator, params
+
+def to_distributions(space):
+    """Turns a SEARCH_SPACES entry into scipy distributions for random sampling."""
+    distributions = {}
+    for name, value in space.items():
+        if isinstance(value, tuple) and value[0] == 'log':
+            distributions[name] = loguniform(value[1], value[2])
+        elif isinstance(value, tuple) and value[0] == 'int':
+            distributions[name] = randint(value[1], value[2])
+        else:
+            distributions[name] = value
+    return distributions
+
+def warm_start_forest_search(estimator, space, X_train, y_train, random_state=42):
+    """
+    Successive halving for random forests. Every round the surviving parameter
+    sets get three times more trees and only the best third is kept. The forests
+    use warm_start, so each round only grows the new trees instead of refitting.
+    Returns (best parameters, best mean CV accuracy).
+    """
+    X = np.asarray(X_train)
+    y = np.asarray(y_train)
+    folds = list(StratifiedKFold(n_splits=3).split(X, y))
+    candidates = list(ParameterSampler(to_distributions(space), HALVING_CANDIDATES, random_state=random_state))
+    forests = {i: [clone(estimator).set_params(**params, warm_start=True) for _ in folds]
+               for i, params in enumerate(candidates)}
+
+    n_trees = FOREST_MIN_TREES
+    while True:
+        scores = {}
+        for i, fold_forests in forests.items():
+            fold_scores = []
+            for forest, (train_idx, val_idx) in zip(fold_forests, folds):
+                forest.set_params(n_estimators=n_trees)
+                forest.fit(X[train_idx], y[train_idx])
+                fold_scores.append(forest.score(X[val_idx], y[val_idx]))
+            scores[i] = np.mean(fold_scores)
+        if n_trees >= FOREST_MAX_TREES:
+            break
+        # Stop early on the weaker two thirds
+        survivors = sorted(scores, key=scores.get, reverse=True)[:max(1, len(scores) // 3)]
+        forests = {i: forests[i] for i in survivors}
+        n_trees = min(n_trees * 3, FOREST_MAX_TREES)
+
+    best = max(scores, key=scores.get)
+    return {**candidates[best], 'n_estimators': n_trees}, float(scores[best])
+
+def search_code_hash():
+    """
+    SHA-256 over what search_best_params() depends on besides its own code:
+    the cache version, the search helpers and the search settings.
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for func in (warm_start_forest_search, to_distributions):
+        digest.update(inspect.getsource(func).encode())
+    digest.update(repr((SEARCH_SPACES, HALVING_CANDIDATES, FOREST_MIN_TREES, FOREST_MAX_TREES)).encode())
+    return digest.hexdigest()
+
+@memory.cache(ignore=['n_jobs'])
+def search_best_params(estimator, params, strategy, X_train, y_train, code_key, n_jobs=-1):
+    """
+    Runs one hyperparameter search and returns (best parameters, best mean CV accuracy).
+    Results are cached on disk, so repeating a search with the same estimator,
+    parameter set, strategy, data and code_key (from search_code_hash()) returns
+    immediately. n_jobs only sets how many cores the search uses and is not part
+    of the cache key.
+    """
+    # refit=False: train_model() fits the final model with the best parameters itself
+    if strategy == 'grid':
+        search = GridSearchCV(estimator, params, cv=3, scoring='accuracy', refit=False, n_jobs=n_jobs)
+    elif isinstance(estimator, RandomForestClassifier):
+        return warm_start_forest_search(estimator, params, X_train, y_train)
+    else:
+        # Candidates start on a small share of the training rows; only the
+        # best third moves on to three times more rows in the next round
+        search = HalvingRandomSearchCV(estimator, to_distributions(params), n_candidates=HALVING_CANDIDATES,
+                                       factor=3, resource='n_samples', cv=3, scoring='accuracy',
+                                       random_state=42, refit=False, n_jobs=n_jobs)
+    search.fit(X_train, y_train)
+    # Plain Python values print and pickle more cleanly than NumPy scalars
+    best_params = {name: value.item() if isinstance(value, np.generic) else value
+                   for name, value in search.best_params_.items()}
+    return best_params, float(search.best_score_)
+
+def train_model(model_name, tuning, X_train, y_train, n_jobs=-1):
+    """
+    Trains one model, tuning it first if a strategy ('grid' or 'halving') is given;
+    n_jobs is passed on to the search. Returns (fitted model, best parameters or
+    None, wall-clock seconds, whether the search result came from the cache).
+    """
+    start = time.perf_counter()
+    estimator, params = build_estimator(model_name)
+    if tuning == 'halving':
+        params = SEARCH_SPACES[model_name]
+    best_params = None
+    from_cache = False
+    if tuning and params:
+        code_key = search_code_hash()
+        from_cache = search_best_params.check_call_in_cache(estimator, params, tuning, X_train, y_train,
+                                                            code_key, n_jobs)
+        best_params, _ = search_best_params(estimator, params, tuning, X_train, y_train, code_key, n_jobs)
+        estimator.set_params(**best_params)
+    estimator.fit(X_train, y_train)
+    return estimator, best_params, time.perf_counter() - start, from_cache
+
+def train_models(model_names, tuning, X_train, y_train):
+    """
+    Trains the given models concurrently, one worker process per model. The
+    searches inside the workers run on one core each, so the workers do not
+    start a process pool apiece and oversubscribe the machine.
+    Returns a dict mapping each model name to the result of train_model().
+    """
+    if len(model_names) == 1:
+        return {model_names[0]: train_model(model_names[0], tuning, X_train, y_train)}
+
+    workers = min(len(model_names), os.cpu_count() or 1)
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        futures = {name: pool.submit(train_model, name, tuning, X_train, y_train, n_jobs=1)
+                   for name in model_names}
+        return {name: future.result() for name, future in futures.items()}
+
 # --- 3. Interactive User Prompt Functions ---
 
 def get_input_with_default(prompt, default):
@@ -153,12 +384,12 @@ def main():
     feature_file = get_input_with_default("Enter path to the feature file", 'feature_presence540.txt')
     human_file = get_input_with_default("Enter path to the human trial data file", 'trialData.csv')
     
-    # 2. Load data
-    df_combined = load_and_combine_data(label_file, feature_file)
-    if df_combined is None:
+    # 2. Load data (from the cache when the files are unchanged)
+    transformed_df = load_transformed_data(label_file, feature_file)
+    if transformed_df is None:
         return # Stop if data loading failed
         
-    X_train, y_train, X_val, y_val, X_test, y_test, full_df = preprocess_and_split(df_combined)
+    X_train, y_train, X_val, y_val, X_test, y_test, full_df = split_data(transformed_df)
     
     # 3. Get user's choice of model
     model_options = {
@@ -172,41 +403,27 @@ def main():
     
     # 4. Ask about hyperparameter tuning
     use_tuning = get_yes_no("\nEnable hyperparameter tuning? (slower, but more accurate)")
+    tuning = None
+    if use_tuning:
+        tuning = get_choice_from_user("\nWhich tuning strategy?", TUNING_STRATEGIES)
     
     # 5. Train the selected model(s)
     print("\nStep 4: Training model(s)...")
     
     models_to_run = list(model_options.keys())[:-1] if model_choice == 'all' else [model_choice]
+    if len(models_to_run) > 1:
+        print(f"Training {len(models_to_run)} models in parallel...")
+    start = time.perf_counter()
+    trained = train_models(models_to_run, tuning, X_train, y_train)
+    total_time = time.perf_counter() - start
     best_model_for_plot = None
 
     for model_name in models_to_run:
+        best_model, best_params, train_time, from_cache = trained[model_name]
         print(f"\n--- Training {model_options[model_name]} ---")
-        
-        # Define model and parameters
-        if model_name == 'lr':
-            estimator = LogisticRegression(multi_class='multinomial', solver='lbfgs', random_state=42)
-            params = {'C': [0.01, 0.1, 1], 'max_iter': [200]}
-        elif model_name == 'svm':
-            estimator = SVC(probability=True, random_state=42)
-            params = {'C': [1, 10], 'kernel': ['poly', 'rbf']}
-        elif model_name == 'rf':
-            estimator = RandomForestClassifier(random_state=42)
-            params = {'n_estimators': [50, 100], 'max_depth': [20, 30]}
-        elif model_name == 'adaboost':
-            # AdaBoost uses a base model. We'll use a default RF.
-            base_rf = RandomForestClassifier(n_estimators=100, max_depth=20, random_state=42)
-            estimator = AdaBoostClassifier(estimator=base_rf, n_estimators=50, random_state=42)
-            params = {} # No separate tuning for AdaBoost in this setup
-
-        # Perform training
-        if use_tuning and params:
-            grid_search = GridSearchCV(estimator, params, cv=3, scoring='accuracy', n_jobs=-1)
-            grid_search.fit(X_train, y_train)
-            best_model = grid_search.best_estimator_
-            print(f"Best Parameters found: {grid_search.best_params_}")
-        else:
-            estimator.fit(X_train, y_train)
-            best_model = estimator
+        if best_params is not None:
+            print(f"Best Parameters found: {best_params}" + (" (cached search result)" if from_cache else ""))
+        print(f"Training time: {train_time:.2f}s")
         
         # Evaluate and store the last trained model for the final plot
         evaluate_model(best_model, X_train, y_train, "Training Set")
@@ -214,6 +431,12 @@ def main():
         evaluate_model(best_model, X_test, y_test, "Test Set")
         best_model_for_plot = best_model
 
+    if len(models_to_run) > 1:
+        print("--- Wall-Clock Training Time ---")
+        for model_name in models_to_run:
+            print(f"{model_options[model_name]:<50} {trained[model_name][2]:>8.2f}s")
+        print(f"{'Total (parallel)':<50} {total_time:>8.2f}s")
+
     # 6. Run the final comparison
     if best_model_for_plot:
         save = get_yes_no("\nDo you want to save the final comparison plot?")
@@ -0,0 +1,164 @@
+"""
+Merge throughput benchmark.
+
+Generates a folder of invoice-like PDFs that all embed the same logo image and
+font, then merges them with the original approach (every page added to one
+PdfWriter, written at the end) and with StreamingPdfMerger. Each run happens in
+a fresh process so its peak memory (RSS) can be compared.
+
+Usage:
+    python benchmark.py --docs 1000 --pages 3
+"""
+
+import argparse
+import multiprocessing
+import os
+import random
+import shutil
+import sys
+import time
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PyPDF2 import PdfReader, PdfWriter
+from PyPDF2.generic import (
+    DecodedStreamObject,
+    DictionaryObject,
+    EncodedStreamObject,
+    NameObject,
+    NumberObject,
+)
+
+from pdf_merge import StreamingPdfMerger, iter_pdf_paths
+
+LOGO_SIZE = 400
+
+
+def generate_corpus(folder, docs, pages):
+    folder.mkdir(parents=True, exist_ok=True)
+    # Noise does not compress, so every file carries a ~160 KB copy of the logo
+    rng = random.Random(0)
+    logo_data = zlib.compress(bytes(rng.getrandbits(8) for _ in range(LOGO_SIZE * LOGO_SIZE)))
+
+    for doc in range(docs):
+        writer = PdfWriter()
+        logo = EncodedStreamObject()
+        logo._data = logo_data
+        logo.update({
+            NameObject("/Type"): NameObject("/XObject"),
+            NameObject("/Subtype"): NameObject("/Image"),
+            NameObject("/Width"): NumberObject(LOGO_SIZE),
+            NameObject("/Height"): NumberObject(LOGO_SIZE),
+            NameObject("/ColorSpace"): NameObject("/DeviceGray"),
+            NameObject("/BitsPerComponent"): NumberObject(8),
+            NameObject("/Filter"): NameObject("/FlateDecode"),
+        })
+        font = DictionaryObject({
+            NameObject("/Type"): NameObject("/Font"),
+            NameObject("/Subtype"): NameObject("/Type1"),
+            NameObject("/BaseFont"): NameObject("/Helvetica"),
+        })
+        logo_ref = writer._add_object(logo)
+        font_ref = writer._add_object(font)
+
+        for number in range(pages):
+            writer.add_blank_page(612, 792)
+            # add_blank_page returns the page before it was copied into the writer
+            page = writer.pages[-1]
+            content = DecodedStreamObject()
+            content.set_data(
+                b"q 100 0 0 100 50 650 cm /Logo Do Q "
+                b"BT /F1 24 Tf 72 500 Td (Invoice %d, page %d) Tj ET" % (doc + 1, number + 1)
+            )
+            page[NameObject("/Contents")] = writer._add_object(content)
+            page[NameObject("/Resources")] = DictionaryObject({
+                NameObject("/Font"): DictionaryObject({NameObject("/F1"): font_ref}),
+                NameObject("/XObject"): DictionaryObject({NameObject("/Logo"): logo_ref}),
+            })
+
+        with open(folder / f"invoice_{doc + 1:05d}.pdf", "wb") as f:
+            writer.write(f)
+
+
+def peak_rss_mb():
+    # VmHWM belongs to this process only; ru_maxrss would also include the
+    # memory of the parent at the time this worker was started
+    try:
+        with open("/proc/self/status") as status:
+            for line in status:
+                if line.startswith("VmHWM:"):
+                    return int(line.split()[1]) / 1024
+    except OSError:
+        pass
+    try:
+        import resource
+    except ImportError:   # Windows
+        return float("nan")
+    # ru_maxrss is in kilobytes on Linux and in bytes on macOS
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / 1024 / 1024 if sys.platform == "darwin" else peak / 1024
+
+
+def merge_classic(paths, output):
+    # The original main.py: every reader stays open and every page is kept until the end
+    readers = [PdfReader(str(path), strict=False) for path in paths]
+    writer = PdfWriter()
+    for reader in readers:
+        for page in reader.pages:
+            writer.add_page(page)
+    with open(output, "wb") as f:
+        writer.write(f)
+
+
+def merge_streaming(paths, output):
+    with StreamingPdfMerger(output) as merger:
+        for path in paths:
+            merger.append(path)
+
+
+def run(mode, folder, output):
+    """Runs in a fresh process; returns (seconds, peak RSS in MB)"""
+    paths = list(iter_pdf_paths([folder]))
+    start = time.perf_counter()
+    {"classic": merge_classic, "streaming": merge_streaming}[mode](paths, output)
+    return time.perf_counter() - start, peak_rss_mb()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark classic and streaming PDF merging")
+    parser.add_argument("--docs", type=int, default=500, help="number of generated PDFs")
+    parser.add_argument("--pages", type=int, default=3, help="pages per generated PDF")
+    parser.add_argument("--workdir", default="benchmark_data", help="folder for the generated files")
+    parser.add_argument("--modes", nargs="+", default=["classic", "streaming"], choices=["classic", "streaming"])
+    parser.add_argument("--keep", action="store_true", help="keep the generated files")
+    args = parser.parse_args()
+
+    workdir = Path(args.workdir)
+    inputs = workdir / "inputs"
+    if len(list(iter_pdf_paths([inputs])) if inputs.is_dir() else []) != args.docs:
+        shutil.rmtree(inputs, ignore_errors=True)
+        print(f"Generating {args.docs} PDFs with {args.pages} page(s) each...")
+        generate_corpus(inputs, args.docs, args.pages)
+
+    input_mb = sum(path.stat().st_size for path in iter_pdf_paths([inputs])) / 1e6
+    pages = args.docs * args.pages
+    print(f"Input: {args.docs} files, {pages} pages, {input_mb:.1f} MB\n")
+    print(f"{'mode':<11}{'seconds':>9}{'pages/s':>10}{'MB/s':>8}{'peak RSS MB':>13}{'output MB':>11}")
+
+    context = multiprocessing.get_context("spawn")
+    for mode in args.modes:
+        output = workdir / f"merged_{mode}.pdf"
+        with ProcessPoolExecutor(max_workers=1, mp_context=context) as pool:
+            seconds, rss = pool.submit(run, mode, inputs, output).result()
+        merged_pages = len(PdfReader(str(output)).pages)
+        assert merged_pages == pages, f"{mode} merged {merged_pages} of {pages} pages"
+        output_mb = os.path.getsize(output) / 1e6
+        print(f"{mode:<11}{seconds:>9.2f}{pages / seconds:>10.0f}{input_mb / seconds:>8.1f}{rss:>13.0f}{output_mb:>11.1f}")
+
+    if not args.keep:
+        shutil.rmtree(workdir)
+
+
+if __name__ == "__main__":
+    main()
@@ -1,49 +1,285 @@
-﻿from PyPDF2 import PdfReader, PdfWriter
+﻿import os
+import sys
+import time
+import argparse
 from pathlib import Path
 from rich.console import Console
 from rich.markdown import Markdown
 
+from pdf_merge import StreamingPdfMerger, iter_pdf_paths
+import pdf_ops
+
 console = Console()
 
-console.print("=== PDF MERGE TOOL ===", style="bold cyan")
-
-# Ask user for PDF files input
-file_input = console.input("Enter PDF paths separated by commas:")
-file_list = [f.strip() for f in file_input.split(',')]
-
-valid_pdfs = []
-
-for file in file_list:
-    path = Path(file)
-    if not path.is_file():
-        console.print(f"❌ Skipping: {file} (File does not exist)", style="bold red")
-        continue
-    if path.suffix.lower() != ".pdf":
-        console.print(f"⚠ Skipping: {file} (Not a PDF)", style="yellow")
-        continue
-    try:
-        reader = PdfReader(str(path), strict=False)
-        valid_pdfs.append((path, reader))
-        console.print(f"✅ Loaded: {file} ({len(reader.pages)} page(s))", style="green")
-    except Exception as e:
-        console.print(f"❌ Failed to load {file}: {e}", style="bold red")
-
-if not valid_pdfs:
-    console.print("❌ No valid PDFs to merge. Exiting.", style="bold red")
+
+def read_list(list_file):
+    # One path per line; "-" reads the list from stdin
+    lines = sys.stdin if list_file == "-" else open(list_file, encoding="utf-8")
+    with lines:
+        for line in lines:
+            if line.strip():
+                yield line.strip()
+
+
+def collect_inputs(sources, exclude=None):
+    """Yield the existing PDF files of the given files and folders, reporting the rest"""
+    for path in iter_pdf_paths(sources, exclude):
+        file = str(path)
+        if not path.is_file():
+            console.print(f"❌ Skipping: {file} (File does not exist)", style="bold red")
+            continue
+        if path.suffix.lower() != ".pdf":
+            console.print(f"⚠ Skipping: {file} (Not a PDF)", style="yellow")
+            continue
+        yield path
+
+
+def merge(sources, output_file, dedup=True, quiet=False):
+    """Merge the PDFs page by page into output_file; returns (documents, pages) merged"""
+    # The output is opened (and emptied) first, so it must not be one of the inputs
+    output = Path(output_file).resolve()
+    if any(Path(source).resolve() == output for source in sources if not Path(source).is_dir()):
+        console.print(f"❌ The output file {output_file} is also an input", style="bold red")
+        return 0, 0
+
+    start = time.perf_counter()
+    with StreamingPdfMerger(output_file, dedup=dedup) as merger:
+        # A folder may contain the output itself, e.g. from an earlier run
+        for path in collect_inputs(sources, exclude=output_file):
+            file = str(path)
+            try:
+                pages = merger.append(path)
+                if not quiet:
+                    console.print(f"✅ Loaded: {file} ({pages} page(s))", style="green")
+            except Exception as e:
+                console.print(f"❌ Failed to load {file}: {e}", style="bold red")
+
+    if merger.documents == 0:
+        Path(output_file).unlink(missing_ok=True)
+        return 0, 0
+
+    elapsed = time.perf_counter() - start
+    console.print(f"\n📄 Total pages merged: {merger.pages} from {merger.documents} file(s)", style="cyan")
+    if merger.objects_deduplicated:
+        console.print(f"♻ Shared resources written once: {merger.objects_deduplicated} duplicate object(s), "
+                      f"{merger.bytes_deduplicated / 1e6:.1f} MB saved", style="cyan")
+    console.print(f"⏱ {elapsed:.2f}s, {merger.pages / elapsed:.0f} pages/s", style="cyan")
+    console.print(f"✅ Saved output as: {output_file}", style="bold green")
+    return merger.documents, merger.pages
+
+
+def report(job, error, message, quiet):
+    # One line per finished job; failures are always shown
+    if error:
+        console.print(f"❌ Failed: {job[0]}: {error}", style="bold red")
+        return False
+    if not quiet:
+        console.print(f"✅ {message}", style="green")
+    return True
+
+
+def refuse_overwrite(files):
+    console.print("❌ The output would overwrite input file(s): " + ", ".join(str(file) for file in files)
+                  + "\nChoose another output (-o).", style="bold red")
     exit(1)
 
-# Merge PDFs
-writer = PdfWriter()
-total_pages = 0
-for path, reader in valid_pdfs:
-    for page in reader.pages:
-        writer.add_page(page)
-    total_pages += len(reader.pages)
-
-output_file = "merged_output.pdf"
-with open(output_file, 'wb') as f:
-    writer.write(f)
-
-console.print(f"\n📄 Total pages merged: {total_pages}", style="cyan")
-console.print(f"✅ Saved output as: {output_file}", style="bold green")
-console.print("Developed by @Vinit3116 👨‍💻", style="bold magenta")
\ No newline at end of file
+
+def split(paths, output_dir, every=1, workers=None, quiet=False):
+    workers = workers or os.cpu_count() or 1
+    stems = pdf_ops.output_stems(paths)
+    # Chunks must start on a part boundary
+    chunk_pages = max(every, pdf_ops.CHUNK_PAGES // every * every)
+    jobs = [(path, start, end, every, output_dir, stems[path])
+            for path, start, end in pdf_ops.page_chunks(paths, workers, chunk_pages)]
+    files = 0
+    for job, outputs, error in pdf_ops.run_jobs(pdf_ops.split_job, jobs, workers):
+        if report(job, error, f"{job[0]}: {len(outputs or [])} file(s)", quiet):
+            files += len(outputs)
+    return f"{files} file(s) written to {output_dir}"
+
+
+def extract(paths, page_ranges, output, workers=None, quiet=False):
+    ranges = pdf_ops.parse_page_ranges(page_ranges)
+    if len(paths) == 1 and output.lower().endswith(".pdf"):
+        targets = [output]
+    else:
+        Path(output).mkdir(parents=True, exist_ok=True)
+        stems = pdf_ops.output_stems(paths)
+        targets = [str(Path(output) / f"{stems[path]}_pages.pdf") for path in paths]
+    jobs = [(path, ranges, target) for path, target in zip(paths, targets)]
+    # Taking pages out of a file must never replace a file, not even the input itself
+    inputs = {path.resolve() for path in paths}
+    overwritten = [target for target in targets if Path(target).resolve() in inputs]
+    if overwritten:
+        refuse_overwrite(overwritten)
+    pages = 0
+    for job, count, error in pdf_ops.run_jobs(pdf_ops.extract_job, jobs, workers):
+        if report(job, error, f"{job[0]}: {count} page(s) -> {job[2]}", quiet):
+            pages += count
+    return f"{pages} page(s) extracted"
+
+
+def extract_text(paths, output_dir, workers=None, quiet=False):
+    workers = workers or os.cpu_count() or 1
+    stems = pdf_ops.output_stems(paths)
+    jobs = pdf_ops.page_chunks(paths, workers)
+    documents = 0
+    current, parts, failed = None, [], False
+
+    def flush():
+        if current is not None and not failed:
+            target = Path(output_dir) / f"{stems[current]}.txt"
+            target.write_text("\f".join(parts), encoding="utf-8")
+            if not quiet:
+                console.print(f"✅ {current} -> {target}", style="green")
+
+    # Jobs come back in order, so the chunks of a document arrive one after another
+    for job, text, error in pdf_ops.run_jobs(pdf_ops.text_job, jobs, workers):
+        if job[0] != current:
+            flush()
+            documents += current is not None and not failed
+            current, parts, failed = job[0], [], False
+        if error:
+            failed = True
+            report(job, error, "", quiet)
+        else:
+            parts.append(text)
+    flush()
+    documents += current is not None and not failed
+    return f"Text of {documents} document(s) written to {output_dir}"
+
+
+def compress(paths, output_dir, workers=None, quiet=False):
+    stems = pdf_ops.output_stems(paths)
+    jobs = [(path, str(Path(output_dir) / f"{stems[path]}.pdf")) for path in paths]
+    # Compressing a file in place is fine, replacing another input is not
+    overwritten = pdf_ops.target_conflicts(jobs)
+    if overwritten:
+        refuse_overwrite(target for _, target in overwritten)
+    before = after = unchanged = 0
+    for job, result, error in pdf_ops.run_jobs(pdf_ops.compress_job, jobs, workers):
+        if error:
+            report(job, error, "", quiet)
+            continue
+        size_before, size_after, rewritten = result
+        if rewritten:
+            report(job, None, f"{job[0]}: {size_before / 1e3:.0f} KB -> {size_after / 1e3:.0f} KB", quiet)
+        else:
+            report(job, None, f"{job[0]}: already compact, kept as it was", quiet)
+            unchanged += 1
+        before += size_before
+        after += size_after
+    saved = (1 - after / before) * 100 if before else 0
+    summary = f"{before / 1e6:.1f} MB -> {after / 1e6:.1f} MB ({saved:.0f}% saved) in {output_dir}"
+    if unchanged:
+        summary += f", {unchanged} file(s) could not be made smaller and were kept as they were"
+    return summary
+
+
+def run_batch(args):
+    paths = list(collect_inputs(args.sources))
+    if not paths:
+        console.print("❌ No valid PDFs to process. Exiting.", style="bold red")
+        exit(1)
+
+    if args.command == "extract":
+        try:
+            pdf_ops.parse_page_ranges(args.pages)
+        except ValueError as e:
+            console.print(f"❌ {e}", style="bold red")
+            exit(1)
+
+    if args.command == "split":
+        if args.every < 1:
+            console.print(f"❌ invalid number of pages per file: {args.every}", style="bold red")
+            exit(1)
+        conflicts = pdf_ops.split_conflicts(paths, pdf_ops.output_stems(paths), args.output)
+        if conflicts:
+            refuse_overwrite(conflicts)
+
+    start = time.perf_counter()
+    if args.command == "split":
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+        summary = split(paths, args.output, args.every, args.workers, args.quiet)
+    elif args.command == "extract":
+        summary = extract(paths, args.pages, args.output, args.workers, args.quiet)
+    elif args.command == "text":
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+        summary = extract_text(paths, args.output, args.workers, args.quiet)
+    else:
+        Path(args.output).mkdir(parents=True, exist_ok=True)
+        summary = compress(paths, args.output, args.workers, args.quiet)
+    elapsed = time.perf_counter() - start
+
+    console.print(f"\n📄 {summary}", style="cyan")
+    console.print(f"⏱ {len(paths)} document(s) in {elapsed:.2f}s, {len(paths) / elapsed:.1f} documents/s", style="cyan")
+
+
+def interactive():
+    console.print("=== PDF MERGE TOOL ===", style="bold cyan")
+
+    # Ask user for PDF files input
+    file_input = console.input("Enter PDF paths separated by commas:")
+    file_list = [f.strip() for f in file_input.split(',') if f.strip()]
+
+    documents, _ = merge(file_list, "merged_output.pdf")
+    if documents == 0:
+        console.print("❌ No valid PDFs to merge. Exiting.", style="bold red")
+        exit(1)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="PDF toolkit. Run without arguments for the interactive merge tool.")
+    commands = parser.add_subparsers(dest="command")
+
+    # Inputs are given the same way for every command
+    inputs = argparse.ArgumentParser(add_help=False)
+    inputs.add_argument("inputs", nargs="*", help="PDF files or folders of PDFs")
+    inputs.add_argument("-l", "--list", help="file with one PDF path per line ('-' for stdin)")
+    inputs.add_argument("-q", "--quiet", action="store_true", help="only print failures and the summary")
+
+    batch = argparse.ArgumentParser(add_help=False, parents=[inputs])
+    batch.add_argument("-w", "--workers", type=int, help="worker processes (default: one per CPU core)")
+
+    merge_parser = commands.add_parser("merge", parents=[inputs], help="merge PDFs into one file")
+    merge_parser.add_argument("-o", "--output", default="merged_output.pdf", help="output file")
+    merge_parser.add_argument("--no-dedup", action="store_true", help="do not deduplicate shared fonts and images")
+
+    split_parser = commands.add_parser("split", parents=[batch], help="split PDFs into files of N pages")
+    split_parser.add_argument("-o", "--output", default="split", help="output folder")
+    split_parser.add_argument("-n", "--every", type=int, default=1, help="pages per output file")
+
+    extract_parser = commands.add_parser("extract", parents=[batch], help="copy selected pages into new PDFs")
+    extract_parser.add_argument("-p", "--pages", required=True, help="1-based pages, e.g. 1-3,7,10-")
+    extract_parser.add_argument("-o", "--output", default="extracted",
+                                help="output folder, or a .pdf file when there is one input")
+
+    text_parser = commands.add_parser("text", parents=[batch], help="extract the text of PDFs into .txt files")
+    text_parser.add_argument("-o", "--output", default="text", help="output folder")
+
+    compress_parser = commands.add_parser("compress", parents=[batch], help="recompress the streams of PDFs")
+    compress_parser.add_argument("-o", "--output", default="compressed", help="output folder")
+
+    if len(sys.argv) == 1:
+        interactive()
+    else:
+        args = parser.parse_args()
+        if args.command is None:
+            parser.print_help()
+            return
+        args.sources = list(args.inputs)
+        if args.list:
+            args.sources.extend(read_list(args.list))
+        if args.command == "merge":
+            documents, _ = merge(args.sources, args.output, dedup=not args.no_dedup, quiet=args.quiet)
+            if documents == 0:
+                console.print("❌ No valid PDFs to merge. Exiting.", style="bold red")
+                exit(1)
+        else:
+            run_batch(args)
+
+    console.print("Developed by @Vinit3116 👨‍💻", style="bold magenta")
+
+
+if __name__ == "__main__":
+    main()
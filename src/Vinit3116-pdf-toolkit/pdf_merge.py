@@ -0,0 +1,279 @@
+"""
+Streaming PDF merge engine.
+
+PdfWriter keeps every page of every input in memory until write() is called.
+StreamingPdfMerger instead writes each object to the output file as soon as it
+has been copied, and drops the reader of an input once its pages are done. What
+stays in memory is one file offset per output object and one digest per shared
+resource, so thousands of inputs or multi-GB totals can be merged with bounded
+memory.
+
+Fonts, images and other shared resources are deduplicated across inputs: an
+object is only written once if another input contains exactly the same bytes
+(after its references have been renumbered).
+"""
+
+import hashlib
+import io
+import zlib
+from array import array
+from pathlib import Path
+
+from PyPDF2 import PdfReader
+from PyPDF2.generic import (
+    ArrayObject,
+    DictionaryObject,
+    EncodedStreamObject,
+    IndirectObject,
+    NameObject,
+    NullObject,
+    StreamObject,
+)
+
+# Dictionaries of these types are shared between pages and worth deduplicating
+# (streams such as font files and images are always deduplicated)
+DEDUP_TYPES = {"/Font", "/FontDescriptor", "/Encoding", "/ExtGState", "/Pattern", "/Shading", "/XObject"}
+
+PAGES_ROOT = 1
+CATALOG = 2
+
+# Marks a page that is not part of the output; references to it become null
+SKIPPED_PAGE = 0
+
+# Bytes added to a stream dictionary that did not have a filter yet
+FILTER_ENTRY_SIZE = len(b"/Filter /FlateDecode ")
+
+
+def iter_pdf_paths(sources, exclude=None):
+    """
+    Yield the PDF files of the given files and folders, folders in sorted order.
+    A file in a folder that is the same file as `exclude` (the output) is left out.
+    """
+    exclude = Path(exclude).resolve() if exclude is not None else None
+    for source in sources:
+        path = Path(source)
+        if path.is_dir():
+            yield from sorted(
+                p for p in path.iterdir()
+                if p.suffix.lower() == ".pdf" and p.is_file()
+                and not (exclude is not None and p.name == exclude.name and p.resolve() == exclude)
+            )
+        else:
+            yield path
+
+
+def _recompress(stream):
+    """The stream's data compressed with Flate at the highest level, or None if that is not smaller"""
+    filters = stream.get("/Filter")
+    data = stream._data
+    overhead = 0
+    if filters is None:
+        raw = data
+        overhead = FILTER_ENTRY_SIZE
+    elif filters == "/FlateDecode" and "/DecodeParms" not in stream:
+        try:
+            raw = zlib.decompress(data)
+        except zlib.error:
+            return None
+    else:
+        # Images in JPEG and other formats are left as they are
+        return None
+    compressed = zlib.compress(raw, 9)
+    if len(compressed) + overhead >= len(data):
+        return None
+    return compressed
+
+
+def _serialize(obj):
+    buffer = io.BytesIO()
+    obj.write_to_stream(buffer, None)
+    return buffer.getvalue()
+
+
+class StreamingPdfMerger:
+    """
+    Usage:
+        with StreamingPdfMerger("merged.pdf") as merger:
+            for path in paths:
+                merger.append(path)
+    """
+
+    def __init__(self, output, dedup=True, recompress=False, buffer_size=1 << 20):
+        self.file = open(output, "wb", buffering=buffer_size)
+        self.dedup = dedup
+        self.recompress = recompress
+        self.position = 0
+        # offsets[n] is the file offset of object n (0 = never written)
+        self.offsets = array("q", [0, 0, 0])
+        self.kids = array("q")
+        self.digests = {}
+
+        # Statistics
+        self.documents = 0
+        self.objects_written = 0
+        self.objects_deduplicated = 0
+        self.bytes_deduplicated = 0
+
+        self._write(b"%PDF-1.7\n%\xe2\xe3\xcf\xd3\n")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, traceback):
+        if exc_type is None:
+            self.close()
+        else:
+            self.file.close()
+
+    @property
+    def pages(self):
+        return len(self.kids)
+
+    def _write(self, data):
+        self.file.write(data)
+        self.position += len(data)
+
+    def _allocate(self):
+        self.offsets.append(0)
+        return len(self.offsets) - 1
+
+    def _write_object(self, number, data):
+        self.offsets[number] = self.position
+        self._write(b"%d 0 obj\n" % number + data + b"\nendobj\n")
+        self.objects_written += 1
+
+    def append(self, path, pages=None):
+        """
+        Append the pages of one PDF (all of them, or the 0-based page numbers
+        in `pages`); returns the number of pages added. Raises on unreadable files.
+        """
+        with open(path, "rb") as stream:
+            return self.append_reader(PdfReader(stream, strict=False), pages)
+
+    def append_reader(self, reader, pages=None):
+        """Like append(), for a PdfReader that is already open (to take several page ranges from one file)"""
+        if reader.is_encrypted and not reader.decrypt(""):
+            raise ValueError("encrypted")
+
+        # Every page gets its number up front, so links and annotations
+        # pointing to a later page do not copy it as an ordinary object.
+        # Pages that are left out are never copied through a reference either.
+        self._memo = {}
+        self._reserved = {}
+        all_pages = reader.pages
+        selected = range(len(all_pages)) if pages is None else pages
+        for page in all_pages:
+            reference = page.indirect_reference
+            if reference is not None:
+                self._memo[(reference.idnum, reference.generation)] = SKIPPED_PAGE
+        pages = [all_pages[index] for index in selected]
+        numbers = []
+        for page in pages:
+            number = self._allocate()
+            reference = page.indirect_reference
+            if reference is not None:
+                self._memo[(reference.idnum, reference.generation)] = number
+            numbers.append(number)
+
+        first_kid = len(self.kids)
+        try:
+            for page, number in zip(pages, numbers):
+                self._copy_page(page, number)
+                self.kids.append(number)
+                # Everything this page needed has been written; only the
+                # renumbering (self._memo) has to be remembered
+                reader.resolved_objects.clear()
+        except Exception:
+            # Keep the output consistent: none of this document's pages are listed
+            del self.kids[first_kid:]
+            raise
+        finally:
+            self._memo = self._reserved = None
+
+        self.documents += 1
+        return len(numbers)
+
+    def _copy_page(self, page, number):
+        copied = DictionaryObject()
+        for key, value in page.items():
+            if key != "/Parent":
+                copied[NameObject(key)] = self._copy(value)
+        copied[NameObject("/Parent")] = IndirectObject(PAGES_ROOT, 0, None)
+        self._write_object(number, _serialize(copied))
+
+    def _copy(self, obj):
+        """Copy of a direct object with every reference renumbered for the output"""
+        if isinstance(obj, IndirectObject):
+            number = self._copy_reference(obj)
+            return NullObject() if number == SKIPPED_PAGE else IndirectObject(number, 0, None)
+        if isinstance(obj, StreamObject):
+            compressed = _recompress(obj) if self.recompress else None
+            copied = obj.__class__() if compressed is None else EncodedStreamObject()
+            copied._data = obj._data if compressed is None else compressed
+            for key, value in obj.items():
+                copied[NameObject(key)] = self._copy(value)
+            if compressed is not None:
+                copied[NameObject("/Filter")] = NameObject("/FlateDecode")
+            return copied
+        if isinstance(obj, DictionaryObject):
+            copied = DictionaryObject()
+            for key, value in obj.items():
+                copied[NameObject(key)] = self._copy(value)
+            return copied
+        if isinstance(obj, ArrayObject):
+            return ArrayObject(self._copy(value) for value in obj)
+        return obj
+
+    def _copy_reference(self, reference):
+        key = (reference.idnum, reference.generation)
+        if key in self._memo:
+            number = self._memo[key]
+            if number is None:
+                # A cycle back to an object that is still being copied
+                number = self._reserved.get(key) or self._reserved.setdefault(key, self._allocate())
+            return number
+
+        self._memo[key] = None
+        obj = reference.get_object()
+        copied = self._copy(obj)
+        data = _serialize(copied)
+
+        number = self._reserved.pop(key, None)
+        digest = None
+        if number is None and self.dedup and self._is_shared_resource(obj):
+            digest = hashlib.sha1(data).digest()
+            existing = self.digests.get(digest)
+            if existing is not None:
+                self._memo[key] = existing
+                self.objects_deduplicated += 1
+                self.bytes_deduplicated += len(data)
+                return existing
+        if number is None:
+            number = self._allocate()
+        if digest is not None:
+            self.digests[digest] = number
+        self._write_object(number, data)
+        self._memo[key] = number
+        return number
+
+    @staticmethod
+    def _is_shared_resource(obj):
+        if isinstance(obj, StreamObject):
+            return True
+        return isinstance(obj, DictionaryObject) and obj.get("/Type") in DEDUP_TYPES
+
+    def close(self):
+        if self.file.closed:
+            return
+        kids = b" ".join(b"%d 0 R" % number for number in self.kids)
+        self._write_object(PAGES_ROOT, b"<< /Type /Pages /Count %d /Kids [ %s ] >>" % (len(self.kids), kids))
+        self._write_object(CATALOG, b"<< /Type /Catalog /Pages %d 0 R >>" % PAGES_ROOT)
+
+        xref_position = self.position
+        self._write(b"xref\n0 %d\n0000000000 65535 f \n" % len(self.offsets))
+        # Numbers reserved for pages of a document that failed part-way are left free
+        for offset in self.offsets[1:]:
+            self._write(b"%010d 00000 n \n" % offset if offset else b"0000000000 65535 f \n")
+        self._write(b"trailer\n<< /Size %d /Root %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                    % (len(self.offsets), CATALOG, xref_position))
+        self.file.close()
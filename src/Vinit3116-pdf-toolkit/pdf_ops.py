@@ -0,0 +1,221 @@
+"""
+Split, page extraction, text extraction and compression for many PDFs at once.
+
+Every operation is cut into jobs that are spread over a process pool: one job
+per document, or per range of pages when there are only a few large documents,
+so a folder of thousands of invoices keeps all cores busy. The page copying is
+done by StreamingPdfMerger, so no job holds more than its own pages in memory.
+"""
+
+import os
+import re
+import shutil
+from contextlib import contextmanager
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+from PyPDF2 import PdfReader
+
+from pdf_merge import StreamingPdfMerger
+
+# Documents with more pages than this are split into several jobs when there
+# are fewer documents than workers
+CHUNK_PAGES = 50
+
+
+def parse_page_ranges(text):
+    """
+    0-based page numbers for a 1-based range list such as "1-3,7,10-".
+    An open range ("10-") is returned as (9, None) and resolved per document.
+    """
+    ranges = []
+    for part in text.split(","):
+        part = part.strip()
+        if not part:
+            continue
+        first, dash, last = part.partition("-")
+        start = int(first) - 1 if first else 0
+        end = (int(last) if last else None) if dash else start + 1
+        if start < 0 or (end is not None and end <= start):
+            raise ValueError(f"invalid page range: {part}")
+        ranges.append((start, end))
+    if not ranges:
+        raise ValueError("no pages given")
+    return ranges
+
+
+def select_pages(ranges, page_count):
+    pages = []
+    for start, end in ranges:
+        pages.extend(range(start, min(page_count, page_count if end is None else end)))
+    return pages
+
+
+def page_count(path):
+    with open(path, "rb") as stream:
+        return len(PdfReader(stream, strict=False).pages)
+
+
+def output_stems(paths):
+    """
+    A file name stem for the outputs of every input. Inputs with the same name
+    from different folders get a number (report, report_2, ...), so their
+    outputs do not overwrite each other.
+    """
+    stems = {}
+    used = set()
+    for path in paths:
+        stem = Path(path).stem
+        candidate, number = stem, 1
+        # Windows and macOS file names ignore case
+        while candidate.lower() in used:
+            number += 1
+            candidate = f"{stem}_{number}"
+        used.add(candidate.lower())
+        stems[path] = candidate
+    return stems
+
+
+def target_conflicts(pairs):
+    """
+    The (input, output) pairs whose output is another input file. An output
+    that is its own input is fine: it is only replaced once it is complete.
+    """
+    inputs = {Path(path).resolve() for path, _ in pairs}
+    conflicts = []
+    for path, target in pairs:
+        resolved = Path(target).resolve()
+        if resolved in inputs and resolved != Path(path).resolve():
+            conflicts.append((path, target))
+    return conflicts
+
+
+def split_conflicts(paths, stems, output_dir):
+    """Inputs that splitting the other inputs into output_dir would overwrite"""
+    output_dir = Path(output_dir).resolve()
+    prefixes = {stem.lower() for stem in stems.values()}
+    part = re.compile(r"(.+)_pages?_\d{4}(-\d{4})?\.pdf", re.IGNORECASE)
+    conflicts = []
+    for path in paths:
+        match = part.fullmatch(Path(path).name)
+        if match and match.group(1).lower() in prefixes and Path(path).resolve().parent == output_dir:
+            conflicts.append(path)
+    return conflicts
+
+
+@contextmanager
+def replace_output(output):
+    """
+    Yield a temporary path next to `output` to write to, and move it over
+    `output` only once it is complete. An input that is also the output is
+    therefore read in full before it is replaced, and a failed job leaves no
+    half-written file behind.
+    """
+    output = Path(output)
+    temporary = output.with_name(f".{output.name}.{os.getpid()}.tmp")
+    try:
+        yield temporary
+        os.replace(temporary, output)
+    finally:
+        temporary.unlink(missing_ok=True)
+
+
+def page_chunks(paths, workers, chunk_pages=CHUNK_PAGES):
+    """
+    (path, start, end) jobs: whole documents (end=None) when there are enough
+    of them to keep every worker busy, otherwise ranges of chunk_pages pages.
+    """
+    if len(paths) >= workers:
+        return [(path, 0, None) for path in paths]
+    jobs = []
+    for path in paths:
+        try:
+            count = page_count(path)
+        except Exception:
+            # Let the worker report the error
+            jobs.append((path, 0, None))
+            continue
+        jobs.extend((path, start, min(start + chunk_pages, count)) for start in range(0, count, chunk_pages))
+    return jobs
+
+
+def split_job(path, start, end, every, output_dir, stem):
+    """Write pages start..end of a document as files of `every` pages named after `stem`; returns the files written"""
+    outputs = []
+    with open(path, "rb") as stream:
+        # One reader for all parts, so the file is parsed only once per job
+        reader = PdfReader(stream, strict=False)
+        end = len(reader.pages) if end is None else min(end, len(reader.pages))
+        for first in range(start, end, every):
+            last = min(first + every, end)
+            if every == 1:
+                name = f"{stem}_page_{first + 1:04d}.pdf"
+            else:
+                name = f"{stem}_pages_{first + 1:04d}-{last:04d}.pdf"
+            output = Path(output_dir) / name
+            with replace_output(output) as temporary, StreamingPdfMerger(temporary) as merger:
+                merger.append_reader(reader, range(first, last))
+            outputs.append(str(output))
+    return outputs
+
+
+def extract_job(path, ranges, output):
+    """Copy the pages in `ranges` of a document into `output`; returns the page count"""
+    with open(path, "rb") as stream:
+        reader = PdfReader(stream, strict=False)
+        pages = select_pages(ranges, len(reader.pages))
+        if not pages:
+            raise ValueError("none of the requested pages exist")
+        with replace_output(output) as temporary, StreamingPdfMerger(temporary) as merger:
+            return merger.append_reader(reader, pages)
+
+
+def text_job(path, start, end):
+    """Text of pages start..end, pages separated by form feeds"""
+    with open(path, "rb") as stream:
+        reader = PdfReader(stream, strict=False)
+        pages = reader.pages
+        end = len(pages) if end is None else min(end, len(pages))
+        return "\f".join(pages[number].extract_text() for number in range(start, end))
+
+
+def compress_job(path, output):
+    """
+    Rewrite a document with every stream Flate-compressed at the highest level.
+    If that is not smaller, the original is kept (or copied to `output`).
+    Returns (size before, size after, whether the rewrite was kept).
+    """
+    before = os.path.getsize(path)
+    with replace_output(output) as temporary:
+        with StreamingPdfMerger(temporary, recompress=True) as merger:
+            merger.append(path)
+        after = os.path.getsize(temporary)
+        if after >= before:
+            shutil.copyfile(path, temporary)
+    return before, min(before, after), after < before
+
+
+def _run(args):
+    # Runs in a worker process: returns (result, None) or (None, error message)
+    function, job = args
+    try:
+        return function(*job), None
+    except Exception as e:
+        return None, str(e) or e.__class__.__name__
+
+
+def run_jobs(function, jobs, workers=None):
+    """
+    Yield (job, result, error) for every job in order, running them in a
+    process pool. Small jobs are handed to the workers in chunks.
+    """
+    workers = workers or os.cpu_count() or 1
+    if workers == 1 or len(jobs) == 1:
+        # Not worth starting processes for
+        for job in jobs:
+            yield (job, *_run((function, job)))
+        return
+    chunksize = max(1, min(64, len(jobs) // (4 * workers)))
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        for job, (result, error) in zip(jobs, pool.map(_run, ((function, job) for job in jobs), chunksize=chunksize)):
+            yield job, result, error
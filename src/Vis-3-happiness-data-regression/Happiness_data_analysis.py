@@ -3,6 +3,11 @@
 # Note: This script contains all the original analysis, code, and descriptive text
 # from the .ipynb file, presented through an interactive command-line menu.
 
+import os
+import json
+import hashlib
+import inspect
+import argparse
 import warnings
 import pandas as pd
 import numpy as np
@@ -10,18 +15,44 @@ import matplotlib.pyplot as plt
 import seaborn as sns
 
 # SciKit-learn imports
-from sklearn.model_selection import train_test_split, KFold, cross_val_score, cross_validate, learning_curve
+from sklearn.model_selection import train_test_split, KFold, cross_val_score, learning_curve
 from sklearn.linear_model import LinearRegression, Ridge, Lasso, ElasticNet, SGDRegressor
 from sklearn.metrics import mean_squared_error, r2_score
 from sklearn.impute import SimpleImputer
-from sklearn.preprocessing import StandardScaler, PolynomialFeatures
+from sklearn.preprocessing import StandardScaler, PolynomialFeatures, FunctionTransformer
+from sklearn.pipeline import Pipeline
+from sklearn.base import clone
+from joblib import Memory, Parallel, delayed
 
 # Suppress warnings for clean terminal output
 warnings.filterwarnings('ignore')
 
+# --- Files and On-Disk Cache ---
+BASE_DIR = os.path.dirname(os.path.abspath(__file__))
+DATA_FILE = os.path.join(BASE_DIR, "happiness_data.csv")
+CACHE_DIR = os.path.join(BASE_DIR, ".cache")
+REPORT_DIR = os.path.join(BASE_DIR, "report")
+# Bump this when the report layout changes so every figure is redrawn
+REPORT_VERSION = 2
+
+# Fitted transformers and transformed matrices are stored here between runs
+memory = Memory(CACHE_DIR, verbose=0)
+# Bump this when the preprocessing changes in a way the cache key does not see
+# (the code of the preprocessing helpers and OUTLIER_COLUMNS are part of it already)
+CACHE_VERSION = 1
+
+# Number of worker processes for model evaluation (-1 uses every core)
+N_JOBS = -1
+
+# Columns that get a log transformation before the polynomial models
+OUTLIER_COLUMNS = ['Social support', 'Healthy life expectancy at birth',
+                   'Freedom to make life choices', 'Perceptions of corruption', 
+                   'Positive affect', 'Negative affect']
+
 # --- Global Variables for Storing Preprocessed Data ---
 # These will be populated in the main execution block
 data = None
+data_hash = None
 X = None
 y = None
 X_train = None
@@ -33,35 +64,157 @@ X_train_p = None
 X_test_p = None
 y_train_p = None
 y_test_p = None
-
-# --- Reusable Evaluation Function (from your notebook) ---
-
-def evaluate_model(model, X_train_data, y_train_data, X_test_data, y_test_data):
-    """Evaluates a model using 3-fold cross-validation and test set metrics."""
+poly_pipeline = None
+
+# --- Reusable Evaluation Functions (from your notebook) ---
+
+def _fit_and_score(model, X_fit, y_fit, X_eval, y_eval):
+    """Fits a fresh copy of the model and returns (MSE, R^2) on the evaluation data."""
+    fitted = clone(model).fit(X_fit, y_fit)
+    y_pred = fitted.predict(X_eval)
+    return mean_squared_error(y_eval, y_pred), r2_score(y_eval, y_pred)
+
+def evaluate_models(models, X_train_data, y_train_data, X_test_data, y_test_data, n_jobs=N_JOBS):
+    """
+    Evaluates several models at once with 3-fold cross-validation and test set metrics.
+    Every (model, fold) fit and every final refit runs as its own job, spread over
+    n_jobs processes. The fold splits are computed once and shared by all models.
+    Returns a dict mapping each model name to its results.
+    """
+    X_train_arr = np.asarray(X_train_data)
+    y_train_arr = np.asarray(y_train_data)
+    X_test_arr = np.asarray(X_test_data)
+    y_test_arr = np.asarray(y_test_data)
+    
     kf = KFold(n_splits=3, shuffle=True, random_state=42)
-    cv_results = cross_validate(model, X_train_data, y_train_data, cv=kf, scoring=['neg_mean_squared_error', 'r2'])
+    folds = list(kf.split(X_train_arr))
     
-    cv_mse = -cv_results['test_neg_mean_squared_error']
-    cv_rmse = np.sqrt(cv_mse)
-    cv_r2 = cv_results['test_r2']
+    jobs = []
+    for model in models.values():
+        for train_idx, val_idx in folds:
+            jobs.append(delayed(_fit_and_score)(model, X_train_arr[train_idx], y_train_arr[train_idx],
+                                                X_train_arr[val_idx], y_train_arr[val_idx]))
+        jobs.append(delayed(_fit_and_score)(model, X_train_arr, y_train_arr, X_test_arr, y_test_arr))
+    scores = Parallel(n_jobs=n_jobs)(jobs)
     
+    results = {}
+    per_model = len(folds) + 1
+    for i, name in enumerate(models):
+        model_scores = scores[i * per_model:(i + 1) * per_model]
+        cv_mse = np.array([mse for mse, _ in model_scores[:-1]])
+        cv_r2 = np.array([r2 for _, r2 in model_scores[:-1]])
+        test_mse, test_r2 = model_scores[-1]
+        results[name] = {
+            'cv_mse': cv_mse,
+            'cv_rmse': np.sqrt(cv_mse),
+            'cv_r2': cv_r2,
+            'test_mse': test_mse,
+            'test_rmse': np.sqrt(test_mse),
+            'test_r2': test_r2,
+        }
+    return results
+
+def print_evaluation(result):
+    """Prints the cross-validation and test set results of one model."""
     print("\n[Cross-Validation Results]")
-    print(f"  CV Mean Squared Error (MSE): {cv_mse}")
-    print(f"  CV Root Mean Squared Error (RMSE): {cv_rmse}")
-    print(f"  CV R^2 Scores: {cv_r2}")
-    print(f"  Average CV R^2: {np.mean(cv_r2):.4f}")
+    print(f"  CV Mean Squared Error (MSE): {result['cv_mse']}")
+    print(f"  CV Root Mean Squared Error (RMSE): {result['cv_rmse']}")
+    print(f"  CV R^2 Scores: {result['cv_r2']}")
+    print(f"  Average CV R^2: {np.mean(result['cv_r2']):.4f}")
     
-    model.fit(X_train_data, y_train_data)
-    y_pred_test = model.predict(X_test_data)
-    test_mse = mean_squared_error(y_test_data, y_pred_test)
-    test_rmse = np.sqrt(test_mse)
-    test_r2 = r2_score(y_test_data, y_pred_test)
-
     print("\n[Test Set Results]")
-    print(f"  Test Set Mean Squared Error (MSE): {test_mse:.4f}")
-    print(f"  Test Set Root Mean Squared Error (RMSE): {test_rmse:.4f}")
-    print(f"  Test Set R^2 Score: {test_r2:.4f}")
+    print(f"  Test Set Mean Squared Error (MSE): {result['test_mse']:.4f}")
+    print(f"  Test Set Root Mean Squared Error (RMSE): {result['test_rmse']:.4f}")
+    print(f"  Test Set R^2 Score: {result['test_r2']:.4f}")
+
+def print_comparison(results):
+    """Prints one table comparing every evaluated model."""
+    table = pd.DataFrame({
+        name: {
+            'Avg CV RMSE': np.mean(result['cv_rmse']),
+            'Avg CV R^2': np.mean(result['cv_r2']),
+            'Test MSE': result['test_mse'],
+            'Test RMSE': result['test_rmse'],
+            'Test R^2': result['test_r2'],
+        }
+        for name, result in results.items()
+    }).T
+    print("\n### Model Comparison ###")
+    print(table.round(4).to_string())
+
+
+# --- Plotting Functions ---
+# Each one draws a single figure and returns it, so the same code is used for
+# the interactive windows and for the headless report.
+
+def plot_boxplots(data_df):
+    numerical_cols = data_df.select_dtypes(include=['float64']).columns.tolist()
+    fig, axes = plt.subplots(nrows=len(numerical_cols), ncols=1, figsize=(10, len(numerical_cols) * 3))
+    for i, column in enumerate(numerical_cols):
+        sns.boxplot(x=data_df[column].dropna(), ax=axes[i])
+        axes[i].set_title(f'Boxplot of {column}')
+        axes[i].set_xlabel(column)
+    fig.tight_layout()
+    return fig
+
+def plot_histograms(data_df):
+    axes = data_df.hist(bins=30, figsize=(20, 15))
+    fig = axes.flat[0].figure
+    fig.tight_layout()
+    return fig
+
+def plot_correlation_heatmap(data_df):
+    correlation_matrix = data_df.select_dtypes(include=['float64']).corr(method='pearson')
+    fig = plt.figure(figsize=(12, 8))
+    sns.heatmap(correlation_matrix, annot=True, fmt=".2f", cmap='coolwarm', square=True)
+    plt.title('Pearson Correlation Coefficient Heatmap')
+    return fig
+
+def plot_scatter_pairs(data_df):
+    sns.set(style="whitegrid")
+    scatter_pairs = [
+        ('Log GDP per capita', 'Life Ladder'),
+        ('Healthy life expectancy at birth', 'Life Ladder'),
+        ('Social support', 'Life Ladder'),
+        ('Freedom to make life choices', 'Life Ladder'),
+        ('Positive affect', 'Life Ladder'),
+        ('Perceptions of corruption', 'Life Ladder'),
+        ('Negative affect', 'Life Ladder'),
+        ('Social support', 'Healthy life expectancy at birth'),
+        ('Log GDP per capita', 'Healthy life expectancy at birth'),
+    ]
+    fig = plt.figure(figsize=(15, 10))
+    for i, (x_col, y_col) in enumerate(scatter_pairs):
+        plt.subplot(3, 3, i + 1)
+        sns.scatterplot(data=data_df, x=x_col, y=y_col, alpha=0.7)
+        plt.title(f'{y_col} vs {x_col}')
+        plt.xlabel(x_col)
+        plt.ylabel(y_col)
+    fig.tight_layout()
+    return fig
+
+def plot_predictions(y_true, y_pred):
+    fig = plt.figure(figsize=(10, 6))
+    plt.scatter(y_true, y_pred, color='blue', label='Predicted vs Actual', alpha=0.6)
+    plt.plot([y_true.min(), y_true.max()], [y_true.min(), y_true.max()], color='red', linestyle='--', lw=2, label='Perfect Prediction')
+    plt.xlabel('Actual Values (Life Ladder)')
+    plt.ylabel('Predicted Values (Life Ladder)')
+    plt.title('Ridge Regression Predictions vs Actual Values')
+    plt.legend()
+    plt.grid()
+    return fig
 
+def plot_residuals(y_true, y_pred):
+    residuals = y_true - y_pred
+    fig = plt.figure(figsize=(10, 6))
+    plt.scatter(y_true, residuals, alpha=0.6)
+    plt.axhline(0, color='red', linestyle='--', label='Zero Residuals')
+    plt.xlabel('Actual Values')
+    plt.ylabel('Residuals')
+    plt.title('Residual Plot')
+    plt.legend()
+    plt.grid()
+    return fig
 
 # --- Section Functions (Mirroring your IPYNB structure) ---
 
@@ -119,23 +272,14 @@ def run_visualization():
     
     if data is None: return
 
-    numerical_cols = data.select_dtypes(include=['float64']).columns.tolist()
-    
     # Boxplots
     print("Displaying Boxplots (Close to continue)...")
-    fig, axes = plt.subplots(nrows=len(numerical_cols), ncols=1, figsize=(10, len(numerical_cols) * 3))
-    for i, column in enumerate(numerical_cols):
-        sns.boxplot(x=data[column].dropna(), ax=axes[i])
-        axes[i].set_title(f'Boxplot of {column}')
-        axes[i].set_xlabel(column)
-    plt.tight_layout()
+    plot_boxplots(data)
     plt.show()
 
     # Histograms
     print("Displaying Histograms (Close to continue)...")
-    plt.figure(figsize=(12, 8))
-    data.hist(bins=30, figsize=(20, 15))
-    plt.tight_layout()
+    plot_histograms(data)
     plt.show()
     
     # Skewness and Outlier Counts
@@ -190,33 +334,12 @@ def run_relationships():
 
     # Heatmap
     print("\nDisplaying Correlation Heatmap (Close to continue)...")
-    plt.figure(figsize=(12, 8))
-    sns.heatmap(correlation_matrix, annot=True, fmt=".2f", cmap='coolwarm', square=True)
-    plt.title('Pearson Correlation Coefficient Heatmap')
+    plot_correlation_heatmap(data)
     plt.show()
 
     # Scatter Plots
     print("\nDisplaying Key Scatter Plots (Close to continue)...")
-    sns.set(style="whitegrid")
-    scatter_pairs = [
-        ('Log GDP per capita', 'Life Ladder'),
-        ('Healthy life expectancy at birth', 'Life Ladder'),
-        ('Social support', 'Life Ladder'),
-        ('Freedom to make life choices', 'Life Ladder'),
-        ('Positive affect', 'Life Ladder'),
-        ('Perceptions of corruption', 'Life Ladder'),
-        ('Negative affect', 'Life Ladder'),
-        ('Social support', 'Healthy life expectancy at birth'),
-        ('Log GDP per capita', 'Healthy life expectancy at birth'),
-    ]
-    plt.figure(figsize=(15, 10))
-    for i, (x_col, y_col) in enumerate(scatter_pairs):
-        plt.subplot(3, 3, i + 1)
-        sns.scatterplot(data=data, x=x_col, y=y_col, alpha=0.7)
-        plt.title(f'{y_col} vs {x_col}')
-        plt.xlabel(x_col)
-        plt.ylabel(y_col)
-    plt.tight_layout()
+    plot_scatter_pairs(data)
     plt.show()
 
     # Inference Text
@@ -249,28 +372,33 @@ def run_modelling_linear_and_regularized():
     X_test_scaled = scaler.transform(X_test)
     
     # ----------------------------------------------------------------------
-    # Part 1: Linear Regression (SGD and Normal Equation are commented out for brevity)
+    # Part 1 & 2: Linear Regression (SGD and Normal Equation are commented out
+    # for brevity) and Regularized Models (Lasso, Ridge, ElasticNet).
+    # All models and CV folds are evaluated together in parallel.
     # ----------------------------------------------------------------------
+    models = {
+        'Linear Regression': LinearRegression(),
+        'Lasso (alpha=0.001)': Lasso(alpha=0.001, max_iter=1000),
+        'Ridge (alpha=0.9)': Ridge(alpha=0.9),
+        'ElasticNet (alpha=0.001, l1_ratio=0.5)': ElasticNet(alpha=0.001, l1_ratio=0.5),
+    }
+    results = evaluate_models(models, X_train_scaled, y_train, X_test_scaled, y_test)
+    
     print("\n### 1. Linear Regression (via Sklearn) ###")
-    linear_regression = LinearRegression()
-    evaluate_model(linear_regression, X_train_scaled, y_train, X_test_scaled, y_test)
+    print_evaluation(results['Linear Regression'])
     
-    # ----------------------------------------------------------------------
-    # Part 2: Regularized Models (Lasso, Ridge, ElasticNet)
-    # ----------------------------------------------------------------------
     print("\n### 2. Lasso, Ridge, ElasticNet (with initial parameters) ###")
 
     print("\n- Lasso Regression (alpha=0.001)")
-    lasso_regression = Lasso(alpha=0.001, max_iter=1000)
-    evaluate_model(lasso_regression, X_train_scaled, y_train, X_test_scaled, y_test)
+    print_evaluation(results['Lasso (alpha=0.001)'])
 
     print("\n- Ridge Regression (alpha=0.9)")
-    ridge_regression = Ridge(alpha=0.9)
-    evaluate_model(ridge_regression, X_train_scaled, y_train, X_test_scaled, y_test)
+    print_evaluation(results['Ridge (alpha=0.9)'])
 
     print("\n- ElasticNet Regression (alpha=0.001, l1_ratio=0.5)")
-    elastic_net_model = ElasticNet(alpha=0.001, l1_ratio=0.5)
-    evaluate_model(elastic_net_model, X_train_scaled, y_train, X_test_scaled, y_test)
+    print_evaluation(results['ElasticNet (alpha=0.001, l1_ratio=0.5)'])
+    
+    print_comparison(results)
 
     # ----------------------------------------------------------------------
     # Part 3: Hyperparameter Tuning Analysis (Results only, as per original notebook)
@@ -312,27 +440,32 @@ def run_modelling_polynomial():
     # ----------------------------------------------------------------------
     # Part 1: Evaluation on Polynomial Features
     # ----------------------------------------------------------------------
-    print("### 1. Linear and Regularized Models on Polynomial Features ###")
-    
-    print("\n- Linear Regression (on Poly Features)")
-    linear_regression_p = LinearRegression()
-    evaluate_model(linear_regression_p, X_train_p, y_train_p, X_test_p, y_test_p)
-    
     # Note: These models need to be fit/evaluated on the scaled poly features, 
     # but since the full pipeline is complex, we use the pre-generated X_train_p 
     # and X_test_p (which are already poly and scaled) for simplicity.
+    models = {
+        'Linear Regression': LinearRegression(),
+        'Lasso (alpha=0.001)': Lasso(alpha=0.001),
+        'Ridge (alpha=0.9)': Ridge(alpha=0.9),
+        'ElasticNet (alpha=0.001, l1_ratio=0.5)': ElasticNet(alpha=0.001, l1_ratio=0.5),
+    }
+    results = evaluate_models(models, X_train_p, y_train_p, X_test_p, y_test_p)
+    
+    print("### 1. Linear and Regularized Models on Polynomial Features ###")
+    
+    print("\n- Linear Regression (on Poly Features)")
+    print_evaluation(results['Linear Regression'])
     
     print("\n- Lasso Regression (alpha=0.001) (on Poly Features)")
-    lasso_regression_p = Lasso(alpha=0.001)
-    evaluate_model(lasso_regression_p, X_train_p, y_train_p, X_test_p, y_test_p)
+    print_evaluation(results['Lasso (alpha=0.001)'])
 
     print("\n- Ridge Regression (alpha=0.9) (on Poly Features)")
-    ridge_regression_p = Ridge(alpha=0.9)
-    evaluate_model(ridge_regression_p, X_train_p, y_train_p, X_test_p, y_test_p)
+    print_evaluation(results['Ridge (alpha=0.9)'])
 
     print("\n- ElasticNet Regression (alpha=0.001, l1_ratio=0.5) (on Poly Features)")
-    elastic_net_model_p = ElasticNet(alpha=0.001, l1_ratio=0.5)
-    evaluate_model(elastic_net_model_p, X_train_p, y_train_p, X_test_p, y_test_p)
+    print_evaluation(results['ElasticNet (alpha=0.001, l1_ratio=0.5)'])
+    
+    print_comparison(results)
 
     # ----------------------------------------------------------------------
     # Part 2: Polynomial Model Performance Comparison (Inference)
@@ -348,6 +481,13 @@ Lasso/Elastic Net: The L1 penalty causes a performance reduction (R² ≈ 0.77),
 Best Performing Model: Ridge regression with a small alpha (0.01) showed the best and most stable results after tuning.
     """)
 
+def fit_final_model(alpha=0.01):
+    """Fits the final Ridge model on the polynomial features; returns (y_pred, mse, r2)."""
+    ridge_final = Ridge(alpha=alpha, random_state=42)
+    ridge_final.fit(X_train_p, y_train_p)
+    y_pred_p = ridge_final.predict(X_test_p)
+    return y_pred_p, mean_squared_error(y_test_p, y_pred_p), r2_score(y_test_p, y_pred_p)
+
 def run_final_model():
     """Runs the final, best-performing Ridge model and displays plots."""
     
@@ -360,35 +500,16 @@ def run_final_model():
         return
 
     alpha = 0.01
-    ridge_final = Ridge(alpha=alpha, random_state=42)
-    ridge_final.fit(X_train_p, y_train_p)
-    y_pred_p = ridge_final.predict(X_test_p)
-    mse = mean_squared_error(y_test_p, y_pred_p)
-    r2 = r2_score(y_test_p, y_pred_p)
+    y_pred_p, mse, r2 = fit_final_model(alpha)
     
     print(f"Final Ridge Regression with alpha={alpha}: MSE={mse:.4f}, R^2={r2:.4f}")
 
     # Plot 1: Predictions vs Actual
-    plt.figure(figsize=(10, 6))
-    plt.scatter(y_test_p, y_pred_p, color='blue', label='Predicted vs Actual', alpha=0.6)
-    plt.plot([y_test_p.min(), y_test_p.max()], [y_test_p.min(), y_test_p.max()], color='red', linestyle='--', lw=2, label='Perfect Prediction')
-    plt.xlabel('Actual Values (Life Ladder)')
-    plt.ylabel('Predicted Values (Life Ladder)')
-    plt.title('Ridge Regression Predictions vs Actual Values')
-    plt.legend()
-    plt.grid()
+    plot_predictions(y_test_p, y_pred_p)
     plt.show()
 
     # Plot 2: Residuals
-    residuals = y_test_p - y_pred_p
-    plt.figure(figsize=(10, 6))
-    plt.scatter(y_test_p, residuals, alpha=0.6)
-    plt.axhline(0, color='red', linestyle='--', label='Zero Residuals')
-    plt.xlabel('Actual Values')
-    plt.ylabel('Residuals')
-    plt.title('Residual Plot')
-    plt.legend()
-    plt.grid()
+    plot_residuals(y_test_p, y_pred_p)
     plt.show()
 
     print("\n--- Residual Plot Analysis ---")
@@ -403,63 +524,196 @@ Future Work:
 3. Evaluate better models like Decision Trees, Random Forest, etc.
     """)
 
-# --- Setup Function ---
+# --- Setup Functions ---
+
+def file_hash(path):
+    """Returns the SHA-256 hash of a file, used as the cache key for the dataset."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+def log_outlier_columns(X_data):
+    """Applies log1p to the skewed columns that contain outliers (as per your notebook)."""
+    X_data = X_data.copy()
+    for col in OUTLIER_COLUMNS:
+        if col in X_data.columns:
+            X_data[col] = np.log1p(X_data[col])
+    return X_data
+
+def build_poly_pipeline():
+    """Log transformation, scaling and degree 2 polynomial features as one pipeline."""
+    return Pipeline([
+        ('log', FunctionTransformer(log_outlier_columns)),
+        ('scale', StandardScaler()),
+        ('poly', PolynomialFeatures(degree=2, include_bias=False)),
+    ])
+
+def preprocessing_hash():
+    """
+    SHA-256 over what prepare_datasets() depends on besides its own code:
+    the cache version, the preprocessing helpers and OUTLIER_COLUMNS.
+    """
+    digest = hashlib.sha256(f"v{CACHE_VERSION}".encode())
+    for func in (log_outlier_columns, build_poly_pipeline):
+        digest.update(inspect.getsource(func).encode())
+    digest.update(repr(OUTLIER_COLUMNS).encode())
+    return digest.hexdigest()
+
+@memory.cache(ignore=['csv_path'])
+def prepare_datasets(csv_hash, csv_path, preprocessing_key):
+    """
+    Loads the CSV once and builds every dataset used by the menu sections.
+    Results are cached on disk by joblib and keyed by csv_hash and
+    preprocessing_key, so the work is only redone when the CSV or the
+    preprocessing changes.
+    """
+    raw_data = pd.read_csv(csv_path)
+    
+    # 1. Impute the numeric data once; both the base and polynomial models use it
+    numeric_data = raw_data.select_dtypes(include=['float64'])
+    imputer = SimpleImputer(strategy='mean')
+    data_df = pd.DataFrame(imputer.fit_transform(numeric_data), columns=numeric_data.columns)
+    
+    features = data_df.drop(columns=['Life Ladder'])
+    target = data_df['Life Ladder']
+    
+    # Split data once; the polynomial models use the same rows
+    base_split = train_test_split(features, target, test_size=0.25, random_state=42)
+    
+    # 2. Polynomial modelling: the pipeline is fitted on the training rows only to prevent data leakage
+    X_train_raw_p, X_test_raw_p, y_train_poly, y_test_poly = base_split
+    pipeline = build_poly_pipeline()
+    X_train_poly = pipeline.fit_transform(X_train_raw_p)
+    X_test_poly = pipeline.transform(X_test_raw_p)
+    
+    return {
+        'data': raw_data,
+        'X': features,
+        'y': target,
+        'base_split': base_split,
+        'poly_split': (X_train_poly, X_test_poly, y_train_poly, y_test_poly),
+        'poly_pipeline': pipeline,
+    }
 
 def setup_data():
     """Initializes and preprocesses data for all subsequent functions."""
-    global data, X, y, X_train, X_test, y_train, y_test, X_poly, X_train_p, X_test_p, y_train_p, y_test_p
+    global data, data_hash, X, y, X_train, X_test, y_train, y_test, X_poly, X_train_p, X_test_p, y_train_p, y_test_p
+    global poly_pipeline
     
     try:
-        # Load Raw Data
-        data = pd.read_csv("happiness_data.csv")
-        
-        # 1. Impute and Get Numeric Data for Base Modeling (used in all non-poly sections)
-        numeric_data = data.select_dtypes(include=['float64'])
-        imputer = SimpleImputer(strategy='mean')
-        data_imputed = imputer.fit_transform(numeric_data)
-        data_df = pd.DataFrame(data_imputed, columns=numeric_data.columns)
-        
-        X = data_df.drop(columns=['Life Ladder'])
-        y = data_df['Life Ladder']
-        
-        # Split data for non-polynomial models
-        X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.25, random_state=42)
-        
-        # 2. Prepare Data for Polynomial Modeling (Impute, Log, Scale, Poly)
-        data_p = pd.read_csv('happiness_data.csv')
-        numeric_data_p = data_p.select_dtypes(include=['float64'])
-        imputer_p = SimpleImputer(strategy='mean')
-        data_imputed_p = imputer_p.fit_transform(numeric_data_p)
-        data_p = pd.DataFrame(data_imputed_p, columns=numeric_data_p.columns)
-        
-        X_p = data_p.drop(columns=['Life Ladder'])
-        y_p = data_p['Life Ladder']
-        
-        # Apply Log Transformation (as per your notebook)
-        outlier_columns = ['Social support', 'Healthy life expectancy at birth',
-                           'Freedom to make life choices', 'Perceptions of corruption', 
-                           'Positive affect', 'Negative affect']
-        for col in outlier_columns:
-            if col in X_p.columns:
-                X_p[col] = np.log1p(X_p[col])
-
-        # Split before Scaling/Poly to prevent data leakage
-        X_train_raw_p, X_test_raw_p, y_train_p, y_test_p = train_test_split(X_p, y_p, test_size=0.25, random_state=42)
-
-        # Scale and Generate Polynomial Features on Training Data only
-        scaler_p = StandardScaler()
-        X_train_scaled_p = scaler_p.fit_transform(X_train_raw_p)
-        X_test_scaled_p = scaler_p.transform(X_test_raw_p)
-
-        poly_features = PolynomialFeatures(degree=2, include_bias=False)
-        X_train_p = poly_features.fit_transform(X_train_scaled_p)
-        X_test_p = poly_features.transform(X_test_scaled_p)
-        
-        print("Data setup complete. Ready to run analysis sections.")
-
+        data_hash = file_hash(DATA_FILE)
+        datasets = prepare_datasets(data_hash, DATA_FILE, preprocessing_hash())
     except FileNotFoundError:
         print("FATAL ERROR: 'happiness_data.csv' not found. Please place the file in the script directory.")
         data = None
+        return
+    
+    data = datasets['data']
+    X = datasets['X']
+    y = datasets['y']
+    X_train, X_test, y_train, y_test = datasets['base_split']
+    X_train_p, X_test_p, y_train_p, y_test_p = datasets['poly_split']
+    poly_pipeline = datasets['poly_pipeline']
+    
+    print("Data setup complete. Ready to run analysis sections.")
+
+
+# --- Headless Report ---
+
+def report_figures(y_pred_p):
+    """Returns (name, title, plot function, arguments) for every figure in the report."""
+    return [
+        ('boxplots', 'Boxplots', plot_boxplots, (data,)),
+        ('histograms', 'Histograms', plot_histograms, (data,)),
+        ('correlation_heatmap', 'Pearson Correlation Heatmap', plot_correlation_heatmap, (data,)),
+        ('scatter_plots', 'Key Scatter Plots', plot_scatter_pairs, (data,)),
+        ('predictions', 'Final Ridge Model: Predictions vs Actual', plot_predictions, (y_test_p, y_pred_p)),
+        ('residuals', 'Final Ridge Model: Residuals', plot_residuals, (y_test_p, y_pred_p)),
+    ]
+
+def figure_key(plot_func):
+    """
+    What a rendered figure depends on: the report version, the data (CSV and
+    preprocessing) and the code of its plot function.
+    """
+    digest = hashlib.sha256(f"v{REPORT_VERSION}:{data_hash}:{preprocessing_hash()}".encode())
+    digest.update(inspect.getsource(plot_func).encode())
+    return digest.hexdigest()
+
+def render_figure(plot_func, args, path):
+    """Draws one figure with the non-interactive Agg backend and saves it as a PNG."""
+    plt.switch_backend('Agg')
+    # Some plots call sns.set(); start from the defaults so a figure looks the
+    # same whichever worker draws it and whatever that worker drew before
+    plt.rcdefaults()
+    fig = plot_func(*args)
+    fig.savefig(path, dpi=100)
+    plt.close('all')
+    return path
+
+def build_report(output_dir=REPORT_DIR, n_jobs=N_JOBS):
+    """
+    Renders every figure to a PNG in output_dir, in parallel worker processes,
+    and writes an index.html that shows them. A figure is only redrawn when
+    the key recorded for it in manifest.json (data, plot code and report
+    version) no longer matches.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    manifest_path = os.path.join(output_dir, 'manifest.json')
+    try:
+        with open(manifest_path) as f:
+            manifest = json.load(f)
+    except (OSError, ValueError):
+        manifest = {}
+    
+    # The final model is fitted once, for the figures and the metrics
+    y_pred_p, mse, r2 = fit_final_model()
+    figures = report_figures(y_pred_p)
+    keys = {name: figure_key(plot_func) for name, _, plot_func, _ in figures}
+    pending = [(name, plot_func, args) for name, _, plot_func, args in figures
+               if manifest.get(name) != keys[name]
+               or not os.path.exists(os.path.join(output_dir, f'{name}.png'))]
+    
+    Parallel(n_jobs=n_jobs)(
+        delayed(render_figure)(plot_func, args, os.path.join(output_dir, f'{name}.png'))
+        for name, plot_func, args in pending)
+    
+    for name, _, _ in pending:
+        manifest[name] = keys[name]
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2)
+    
+    sections = "\n".join(f'<h2>{title}</h2>\n<img src="{name}.png" alt="{title}">'
+                         for name, title, _, _ in figures)
+    index_path = os.path.join(output_dir, 'index.html')
+    with open(index_path, 'w', encoding='utf-8') as f:
+        f.write(f"""<!DOCTYPE html>
+<html>
+<head>
+<meta charset="utf-8">
+<title>Happiness Data Analysis Report</title>
+<style>body {{ font-family: sans-serif; margin: 2em; }} img {{ max-width: 100%; }}</style>
+</head>
+<body>
+<h1>Happiness Data Analysis Report</h1>
+<p>Final Ridge Regression (poly features, alpha=0.01): MSE={mse:.4f}, R^2={r2:.4f}</p>
+{sections}
+</body>
+</html>
+""")
+    
+    print(f"Rendered {len(pending)} figure(s), {len(figures) - len(pending)} unchanged and reused.")
+    print(f"Report written to {index_path}")
+    return index_path
+
+def run_report(output_dir=REPORT_DIR, n_jobs=N_JOBS):
+    """Non-interactive mode: prepares the data and writes the figure report."""
+    setup_data()
+    if data is None:
+        return
+    build_report(output_dir, n_jobs)
 
 
 # --- Main Interactive Menu ---
@@ -506,4 +760,15 @@ def main_menu():
             print("Invalid choice. Please enter a number between 0 and 6.")
 
 if __name__ == "__main__":
-    main_menu()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Happiness data analysis")
+    parser.add_argument('--report', nargs='?', const=REPORT_DIR, metavar='DIR',
+                        help="render all figures to a static HTML/PNG report instead of opening the menu "
+                             "(default folder: report)")
+    parser.add_argument('--jobs', type=int, default=N_JOBS,
+                        help="worker processes used to render the report (-1 uses every core)")
+    args = parser.parse_args()
+    
+    if args.report:
+        run_report(args.report, args.jobs)
+    else:
+        main_menu()
\ No newline at end of file
@@ -1,7 +1,14 @@
 import os
+import sys
+import time
+import errno
 import shutil
 import logging
-from mimetypes import guess_type
+import argparse
+import codecs
+import mimetypes
+import configparser
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
 from pathlib import Path
 
 logging.basicConfig(filename='file_organizer.log', level=logging.INFO,
@@ -17,64 +24,305 @@ file_types = {
     "Others": []
 }
 
-def organize_files(src_directory, dry_run=False):
+# Categories and extensions can be changed in this file (file_types above is used if it is missing)
+RULES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "file_types.ini")
+
+# File types recognized by their first bytes: (category, ((offset, signature), ...))
+MAGIC_NUMBERS = [
+    ("Images", ((0, b"\x89PNG\r\n\x1a\n"),)),
+    ("Images", ((0, b"\xff\xd8\xff"),)),
+    ("Images", ((0, b"GIF87a"),)),
+    ("Images", ((0, b"GIF89a"),)),
+    ("Images", ((0, b"RIFF"), (8, b"WEBP"))),
+    ("Documents", ((0, b"%PDF-"),)),
+    ("Archives", ((0, b"PK\x03\x04"),)),
+    ("Archives", ((0, b"Rar!\x1a\x07"),)),
+    ("Archives", ((0, b"7z\xbc\xaf\x27\x1c"),)),
+    ("Archives", ((0, b"\x1f\x8b"),)),
+    ("Archives", ((257, b"ustar"),)),
+    ("Audio", ((0, b"ID3"),)),
+    ("Audio", ((0, b"fLaC"),)),
+    ("Audio", ((0, b"OggS"),)),
+    ("Audio", ((0, b"RIFF"), (8, b"WAVE"))),
+    ("Audio", ((4, b"ftypM4A"),)),
+    ("Videos", ((4, b"ftyp"),)),
+    ("Videos", ((0, b"RIFF"), (8, b"AVI "))),
+    ("Videos", ((0, b"\x1a\x45\xdf\xa3"),)),
+    ("Videos", ((0, b"FLV\x01"),)),
+]
+# Bytes read from a file to sniff its type
+SNIFF_SIZE = max(offset + len(signature) for _, parts in MAGIC_NUMBERS for offset, signature in parts)
+
+# Files moved per task handed to the thread pool
+BATCH_SIZE = 256
+# Seconds between two progress lines
+PROGRESS_INTERVAL = 1.0
+
+def organize_files(src_directory, dry_run=False, recursive=True, workers=None, classifier=None):
     """
     Organizes files in the source directory into categorized folders.
+    With recursive=True the files of all subfolders are organized as well.
     If dry_run=True, the files will not be moved but only listed.
+    classifier defaults to Classifier(file_types).
     """
     if not os.path.exists(src_directory):
         logger.error(f"Error: The directory {src_directory} does not exist.")
         print(f"Error: The directory {src_directory} does not exist.")
         return
 
-    for folder in file_types.keys():
+    classifier = classifier or Classifier(file_types)
+    for folder in classifier.categories:
         folder_path = os.path.join(src_directory, folder)
         if not os.path.exists(folder_path):
             os.makedirs(folder_path)
 
-    for filename in os.listdir(src_directory):
-        file_path = os.path.join(src_directory, filename)
+    # Files already in a category folder are not organized again
+    skip = {os.path.join(src_directory, folder) for folder in classifier.categories}
+    targets = TargetNames()
+    progress = Progress()
+    # Paths are printed relative to the source directory
+    prefix = len(os.path.join(src_directory, ""))
+    workers = workers or min(32, (os.cpu_count() or 1) + 4)
 
-        if os.path.isdir(file_path):
-            continue
-        
-        file_extension = os.path.splitext(filename)[1].lower()
-        mime_type, _ = guess_type(filename)
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        pending = set()
+        batch = []
+        for entry in scan_files(src_directory, recursive, skip):
+            category = classifier.categorize(entry.name, entry.path)
+            target_path = targets.claim(os.path.join(src_directory, category), entry.name)
+            progress.scanned += 1
 
-        if mime_type:
-            category = categorize_by_mime(mime_type)
-        else:
-            category = categorize_by_extension(file_extension)
+            if dry_run:
+                print(f"Would move {entry.path[prefix:]} to {category}")
+                continue
 
-        if category is None:
-            category = 'Others'
+            batch.append((entry.path, target_path, category))
+            if len(batch) == BATCH_SIZE:
+                pending.add(pool.submit(move_batch, batch))
+                batch = []
+                # Keep scanning ahead of the moves, but not by more than a few batches
+                if len(pending) >= 2 * workers:
+                    done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                    report_moves(done, prefix, progress)
+        if batch:
+            pending.add(pool.submit(move_batch, batch))
+        if pending:
+            report_moves(wait(pending).done, prefix, progress)
 
-        target_folder = os.path.join(src_directory, category)
-        target_path = os.path.join(target_folder, filename)
-        
-        if dry_run:
-            print(f"Would move {filename} to {category}")
-        else:
-            try:
-                shutil.move(file_path, target_path)
-                logger.info(f"Moved {filename} to {category}")
-                print(f"Moved {filename} to {category}")
-            except PermissionError as e:
-                logger.error(f"Permission error moving {filename}: {e}")
-                print(f"Permission error moving {filename}: {e}")
-            except Exception as e:
-                logger.error(f"Failed to move {filename}: {e}")
-                print(f"Failed to move {filename}: {e}")
-
-    print("File organization complete!" if not dry_run else "Dry run complete!")
-
-def categorize_by_extension(extension):
-   
-    for category, extensions in file_types.items():
-        if extension in extensions:
+    if dry_run:
+        print("Dry run complete!")
+    else:
+        progress.finish()
+        print("File organization complete!")
+
+def scan_files(directory, recursive=True, skip=()):
+    """
+    Yields a DirEntry for every file in the directory (and its subfolders).
+    DirEntry keeps the file type from the directory listing, so unlike
+    os.path.isdir() there is no extra stat call per file.
+    """
+    pending = [directory]
+    while pending:
+        current = pending.pop()
+        try:
+            with os.scandir(current) as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        if recursive and entry.path not in skip:
+                            pending.append(entry.path)
+                    elif entry.is_symlink() and entry.is_dir():
+                        # Links to folders are skipped, like folders
+                        continue
+                    else:
+                        yield entry
+        except OSError as e:
+            logger.error(f"Cannot read {current}: {e}")
+            print(f"Cannot read {current}: {e}")
+
+def load_rules(path=RULES_FILE):
+    """
+    Categories from a rules file such as file_types.ini:
+
+        [categories]
+        Images = .jpg .jpeg .png
+
+    Returns file_types if the file does not exist or has no [categories] section.
+    """
+    if not os.path.exists(path):
+        return file_types
+    parser = configparser.ConfigParser()
+    parser.optionxform = str   # Keep the case of the category names
+    parser.read(path, encoding="utf-8")
+    if not parser.has_section("categories"):
+        logger.error(f"No [categories] section in {path}, using the default categories")
+        print(f"No [categories] section in {path}, using the default categories")
+        return file_types
+    rules = {
+        category: [extension if extension.startswith(".") else "." + extension
+                   for extension in extensions.lower().replace(",", " ").split()]
+        for category, extensions in parser["categories"].items()
+    }
+    rules.setdefault("Others", [])
+    return rules
+
+def build_extension_index(categories):
+    """
+    extension -> category for every extension in the rules and every extension
+    with a known MIME type, so a file is classified with one dict lookup
+    instead of guess_type() and a scan of every category's list.
+    """
+    mimetypes.init()
+    index = {}
+    for extension, mime_type in mimetypes.types_map.items():
+        category = categorize_by_mime(mime_type)
+        if category in categories:
+            index[extension.lower()] = category
+    # The rules file has the last word
+    for category, extensions in categories.items():
+        for extension in extensions:
+            index[extension] = category
+    return index
+
+def sniff_category(path):
+    """Category from the first bytes of a file (None if not recognized); reads at most SNIFF_SIZE bytes"""
+    try:
+        with open(path, "rb") as f:
+            head = f.read(SNIFF_SIZE)
+    except OSError:
+        return None
+
+    for category, parts in MAGIC_NUMBERS:
+        if all(head[offset:offset + len(signature)] == signature for offset, signature in parts):
             return category
+
+    # Text without a known extension (README, LICENSE, ...). The incremental
+    # decoder accepts a character cut off at the end of the bytes read.
+    if head and b"\0" not in head:
+        try:
+            codecs.getincrementaldecoder("utf-8")().decode(head)
+            return "Documents"
+        except UnicodeDecodeError:
+            pass
     return None
 
+class Classifier:
+    """
+    Category of a file by its extension, using an index built once from the
+    rules. With sniff=True, files with an unknown or no extension are
+    recognized by their first bytes instead of going to Others.
+    """
+
+    def __init__(self, categories, sniff=False):
+        self.categories = categories
+        self.index = build_extension_index(categories)
+        self.sniff = sniff
+
+    def categorize(self, filename, path=None):
+        dot = filename.rfind(".")
+        if dot > 0 and filename[0] != ".":
+            extension = filename[dot:]
+        else:
+            # No extension, or a name like .bashrc: leave it to splitext (a lot slower)
+            extension = os.path.splitext(filename)[1]
+        category = self.index.get(extension.lower())
+        if category is None and self.sniff and path is not None:
+            category = sniff_category(path)
+            if category not in self.categories:
+                category = None
+        return category or 'Others'
+
+class TargetNames:
+    """
+    Picks a free name in the category folder for every file, so files with the
+    same name from different subfolders (or already in the category folder) are
+    not overwritten: the second photo.jpg becomes photo (1).jpg.
+    """
+
+    def __init__(self):
+        self.taken = {}
+        # Next number to try for a name, so many files with the same name stay cheap
+        self.numbers = {}
+
+    @staticmethod
+    def _key(name):
+        # Windows and macOS file systems ignore case
+        return name.lower() if sys.platform in ("win32", "darwin") else name
+
+    def claim(self, folder, filename):
+        taken = self.taken.get(folder)
+        if taken is None:
+            with os.scandir(folder) as entries:
+                taken = self.taken[folder] = {self._key(entry.name) for entry in entries}
+
+        name = filename
+        if self._key(name) in taken:
+            stem, extension = os.path.splitext(filename)
+            counter = (folder, self._key(filename))
+            number = self.numbers.get(counter, 1)
+            name = f"{stem} ({number}){extension}"
+            while self._key(name) in taken:
+                number += 1
+                name = f"{stem} ({number}){extension}"
+            self.numbers[counter] = number + 1
+        taken.add(self._key(name))
+        return os.path.join(folder, name)
+
+def move_batch(moves):
+    """Runs in a worker thread: moves the files, returns (source, target, category, error) for each"""
+    results = []
+    for source, target, category in moves:
+        try:
+            try:
+                # A rename is a single metadata operation when both paths are on the same file system
+                os.rename(source, target)
+            except OSError as e:
+                if e.errno != errno.EXDEV:
+                    raise
+                shutil.move(source, target)
+            results.append((source, target, category, None))
+        except Exception as e:
+            results.append((source, target, category, e))
+    return results
+
+def report_moves(futures, prefix, progress):
+    for future in futures:
+        for source, target, category, error in future.result():
+            filename = source[prefix:]
+            if error is None:
+                logger.info(f"Moved {filename} to {target[prefix:]}")
+                progress.moved += 1
+            elif isinstance(error, PermissionError):
+                logger.error(f"Permission error moving {filename}: {error}")
+                print(f"\nPermission error moving {filename}: {error}")
+                progress.failed += 1
+            else:
+                logger.error(f"Failed to move {filename}: {error}")
+                print(f"\nFailed to move {filename}: {error}")
+                progress.failed += 1
+    progress.update()
+
+class Progress:
+    """Prints the number of moved files and the throughput at most once per PROGRESS_INTERVAL"""
+
+    def __init__(self):
+        self.start = self.last = time.perf_counter()
+        self.scanned = self.moved = self.failed = 0
+
+    def line(self):
+        elapsed = time.perf_counter() - self.start
+        rate = self.moved / elapsed if elapsed else 0
+        return f"Scanned {self.scanned}, moved {self.moved}, failed {self.failed} ({rate:.0f} files/s, {elapsed:.1f}s)"
+
+    def update(self):
+        now = time.perf_counter()
+        if now - self.last >= PROGRESS_INTERVAL:
+            self.last = now
+            print("\r" + self.line(), end="", flush=True)
+
+    def finish(self):
+        print("\r" + self.line())
+        logger.info(self.line())
+
 def categorize_by_mime(mime_type):
    
     if mime_type:
@@ -91,7 +339,21 @@ def categorize_by_mime(mime_type):
     return None
 
 if __name__ == "__main__":
-    src_dir = input("Enter the path to the folder you want to organize: ")
-    dry_run_input = input("Do you want a dry run? (yes/no): ").strip().lower()
-    dry_run = dry_run_input == 'yes'
-    organize_files(src_dir, dry_run)
+    parser = argparse.ArgumentParser(description="Organize files into folders by type")
+    parser.add_argument("path", nargs="?", help="folder to organize (asked for if not given)")
+    parser.add_argument("--dry-run", action="store_true", help="only list where every file would go")
+    parser.add_argument("--top-level", action="store_true", help="leave the files in subfolders alone")
+    parser.add_argument("--workers", type=int, help="threads moving files (default: CPUs + 4, at most 32)")
+    parser.add_argument("--rules", default=RULES_FILE, help="categories and extensions (default: file_types.ini next to this script)")
+    parser.add_argument("--sniff", action="store_true", help="recognize files with an unknown extension by their first bytes")
+    args = parser.parse_args()
+
+    if args.path:
+        src_dir = args.path
+        dry_run = args.dry_run
+    else:
+        src_dir = input("Enter the path to the folder you want to organize: ")
+        dry_run_input = input("Do you want a dry run? (yes/no): ").strip().lower()
+        dry_run = dry_run_input == 'yes'
+    classifier = Classifier(load_rules(args.rules), sniff=args.sniff)
+    organize_files(src_dir, dry_run, recursive=not args.top_level, workers=args.workers, classifier=classifier)
@@ -1,3 +1,9 @@
+import argparse
+import csv
+import re
+import sys
+import time
+
 import qrcode
 
 def generate_qr_code(data, file_name="qrcode.jpg", size=8, border=3):
@@ -16,9 +22,95 @@ def generate_qr_code(data, file_name="qrcode.jpg", size=8, border=3):
     img.save(file_name)
     print(f"QR code saved as {file_name}")
 
-# Get user input for QR code content
-data = input("Enter the URL for the QR code: ")
-file_name = input("Enter the output file name (e.g., qrcode.jpg): ")
+def read_batch(source, column="url", name_column=None):
+    """
+    (file name, url) pairs from a CSV file, or from a text file / stdin ("-")
+    with one URL per line. In a CSV the URL is taken from `column`, or from
+    the first column when there is no such header.
+    """
+    stream = sys.stdin if source == "-" else open(source, newline="", encoding="utf-8-sig")
+    try:
+        if source.lower().endswith(".csv"):
+            rows = list(csv.reader(stream))
+            header = rows[0] if rows else []
+            first_row = 1
+            if column in header:
+                rows = rows[1:]
+                first_row = 2
+                url_index = header.index(column)
+            else:
+                url_index = 0
+            name_index = header.index(name_column) if name_column in header else None
+
+            # Rows without the URL or name cell, or with an empty URL, are
+            # reported instead of stopping the batch
+            needed = max(url_index, name_index or 0) + 1
+            entries = []
+            skipped_rows = []
+            for number, row in enumerate(rows, first_row):
+                if not row:
+                    continue
+                if len(row) < needed or not row[url_index].strip():
+                    skipped_rows.append(number)
+                    continue
+                entries.append((row[name_index] if name_index is not None else "", row[url_index]))
+            if skipped_rows:
+                shown = ", ".join(map(str, skipped_rows[:10])) + (", ..." if len(skipped_rows) > 10 else "")
+                print(f"Skipped {len(skipped_rows)} row(s) with a missing column or an empty URL: row {shown}")
+        else:
+            entries = [("", line.strip()) for line in stream]
+    finally:
+        if stream is not sys.stdin:
+            stream.close()
+
+    items = []
+    used = set()
+    for number, (name, url) in enumerate(entry for entry in entries if entry[1].strip()):
+        # Only keep characters that are safe in file names and ZIP entries
+        name = re.sub(r"[^\w.-]+", "_", name).strip("._") or f"qr_{number + 1:06d}"
+        # Case-insensitive, as Windows and macOS file names are
+        while name.lower() in used:
+            name += "_"
+        used.add(name.lower())
+        items.append((name + ".png", url.strip()))
+    return items
+
+def generate_batch(args):
+    from qr_batch import generate_batch
+
+    items = read_batch(args.batch, args.column, args.name_column)
+    if not items:
+        print("No URLs found")
+        return
+
+    start = time.perf_counter()
+
+    def progress(done):
+        elapsed = time.perf_counter() - start
+        print(f"\r{done}/{len(items)} QR codes, {done / elapsed:.0f}/s", end="", flush=True)
+
+    version = generate_batch(items, args.output, box_size=args.size, border=args.border,
+                             workers=args.workers, progress=progress)
+    elapsed = time.perf_counter() - start
+    print(f"\nSaved {len(items)} QR codes (version {version}) to {args.output} in {elapsed:.1f}s")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Generate QR codes")
+    parser.add_argument("--batch", metavar="FILE", help="CSV or text file with URLs, or - for stdin (one URL per line)")
+    parser.add_argument("--column", default="url", help="CSV column with the URLs (default: url, else the first column)")
+    parser.add_argument("--name-column", help="CSV column used for the image file names")
+    parser.add_argument("-o", "--output", default="qrcodes.zip", help="a .zip file or a folder (default: qrcodes.zip)")
+    parser.add_argument("--workers", type=int, help="processes used for a batch (default: one per CPU)")
+    parser.add_argument("--size", type=int, default=8, help="pixels per module")
+    parser.add_argument("--border", type=int, default=3, help="border width in modules")
+    args = parser.parse_args()
+
+    if args.batch:
+        generate_batch(args)
+    else:
+        # Get user input for QR code content
+        data = input("Enter the URL for the QR code: ")
+        file_name = input("Enter the output file name (e.g., qrcode.jpg): ")
 
-# Generate the QR code
-generate_qr_code(data, file_name)
\ No newline at end of file
+        # Generate the QR code
+        generate_qr_code(data, file_name, args.size, args.border)
@@ -1,7 +1,12 @@
 import ctypes
 import time
 
-SendInput = ctypes.windll.user32.SendInput
+try:
+    SendInput = ctypes.windll.user32.SendInput
+except AttributeError:
+    # Not on Windows: the module can still be imported, but only a stub
+    # (main.py --dry-run) can be used instead of PressKey/ReleaseKey
+    SendInput = None
 
 
 right_pressed=0x4D	
@@ -44,14 +49,14 @@ def PressKey(hexKeyCode):
 	ii_ = Input_I()
 	ii_.ki = KeyBdInput( 0, hexKeyCode, 0x0008, 0, ctypes.pointer(extra) )
 	x = Input( ctypes.c_ulong(1), ii_ )
-	ctypes.windll.user32.SendInput(1, ctypes.pointer(x), ctypes.sizeof(x))
+	SendInput(1, ctypes.pointer(x), ctypes.sizeof(x))
 
 def ReleaseKey(hexKeyCode):
     extra = ctypes.c_ulong(0)
     ii_ = Input_I()
     ii_.ki = KeyBdInput( 0, hexKeyCode, 0x0008 | 0x0002, 0, ctypes.pointer(extra) )
     x = Input( ctypes.c_ulong(1), ii_ )
-    ctypes.windll.user32.SendInput(1, ctypes.pointer(x), ctypes.sizeof(x))
+    SendInput(1, ctypes.pointer(x), ctypes.sizeof(x))
 
 if __name__=='__main__':
 	while (True):
@@ -0,0 +1,111 @@
+# Gesture -> key logic of the hill climb controller, kept free of camera and
+# mediapipe code so it can be tested with recorded clips or fake landmarks.
+
+import time
+
+from directkeys import right_pressed, left_pressed
+
+tipIds = [4, 8, 12, 16, 20]
+
+# Open palm = gas, fist = brake
+GAS = 'GAS'
+BRAKE = 'BRAKE'
+GESTURE_KEYS = {GAS: right_pressed, BRAKE: left_pressed}
+
+
+def count_fingers(landmarks):
+    """
+    Number of raised fingers of one hand. Works directly on mediapipe's
+    normalized landmarks, so no pixel list has to be built for every frame.
+    """
+    # Thumb: tip to the right of the joint below it
+    total = int(landmarks[tipIds[0]].x > landmarks[tipIds[0] - 1].x)
+    # Other fingers: tip above the middle joint
+    for tip in tipIds[1:]:
+        total += int(landmarks[tip].y < landmarks[tip - 2].y)
+    return total
+
+
+def gesture_for(fingers):
+    if fingers == 0:
+        return BRAKE
+    if fingers == 5:
+        return GAS
+    return None
+
+
+# "No candidate yet"; not None, because None (no gesture) can be a candidate too
+_NO_CANDIDATE = object()
+
+
+class GestureDebouncer:
+    """
+    A gesture (or no gesture) only becomes active after it has been seen in
+    `hold_frames` consecutive frames, so a single misdetected frame does not
+    tap the gas or let go of the brake.
+    """
+
+    def __init__(self, hold_frames=3):
+        self.hold_frames = hold_frames
+        self.active = None
+        self.candidate = _NO_CANDIDATE
+        self.count = 0
+        self.candidate_since = None
+
+    def update(self, gesture, now):
+        """Feed the gesture of one frame; returns True when the active gesture changed"""
+        if gesture == self.active:
+            self.candidate = _NO_CANDIDATE
+            self.count = 0
+            return False
+        if gesture != self.candidate:
+            self.candidate = gesture
+            self.count = 0
+            self.candidate_since = now
+        self.count += 1
+        if self.count >= self.hold_frames:
+            self.active = gesture
+            self.candidate = _NO_CANDIDATE
+            self.count = 0
+            return True
+        return False
+
+
+class KeyController:
+    """Holds at most one key: the one of the active gesture"""
+
+    def __init__(self, press, release):
+        self.press = press
+        self.release = release
+        self.held = None
+
+    def apply(self, gesture):
+        key = GESTURE_KEYS.get(gesture)
+        if key == self.held:
+            return
+        if self.held is not None:
+            self.release(self.held)
+        if key is not None:
+            self.press(key)
+        self.held = key
+
+    def release_all(self):
+        self.apply(None)
+
+
+class RecordingKeys:
+    """Stand-in for PressKey/ReleaseKey that records the key events instead of sending them"""
+
+    def __init__(self):
+        self.events = []
+
+    def press(self, key):
+        self.events.append((time.perf_counter(), 'press', key))
+
+    def release(self, key):
+        self.events.append((time.perf_counter(), 'release', key))
+
+
+def percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
@@ -1,102 +1,124 @@
+import sys
+import time
+import argparse
+
 import cv2
 import mediapipe as mp
-import time
-from directkeys import right_pressed, left_pressed
+
 from directkeys import PressKey, ReleaseKey
+from gesture_control import (GESTURE_KEYS, count_fingers, gesture_for, GestureDebouncer, KeyController,
+                             RecordingKeys, percentile)
+
+mp_draw = mp.solutions.drawing_utils
+mp_hand = mp.solutions.hands
 
 
-break_key_pressed = left_pressed
-accelerato_key_pressed = right_pressed
+def draw(image, hand_landmarks, gesture):
+    # Landmarks are normalized, so they can be drawn on the full-size frame
+    # even though mediapipe only saw the downscaled copy
+    if hand_landmarks is not None:
+        mp_draw.draw_landmarks(image, hand_landmarks, mp_hand.HAND_CONNECTIONS)
+    if gesture is not None:
+        cv2.rectangle(image, (20, 300), (270, 425), (0, 255, 0), cv2.FILLED)
+        cv2.putText(image, gesture.rjust(5), (45, 375), cv2.FONT_HERSHEY_SIMPLEX, 2, (255, 0, 0), 5)
 
-time.sleep(2.0)
-current_key_pressed = set()
 
-mp_draw = mp.solutions.drawing_utils
-mp_hand = mp.solutions.hands
+def main():
+    parser = argparse.ArgumentParser(description="Play Hill Climb Racing with hand gestures")
+    parser.add_argument("--video", help="recorded clip to use instead of the webcam")
+    parser.add_argument("--camera", type=int, default=0, help="webcam index")
+    parser.add_argument("--width", type=int, default=320,
+                        help="width of the frame given to mediapipe (0 = full size)")
+    parser.add_argument("--headless", action="store_true", help="no window and no drawing, only key presses")
+    parser.add_argument("--dry-run", action="store_true",
+                        help="record key presses instead of sending them (always on outside Windows)")
+    parser.add_argument("--hold-frames", type=int, default=3,
+                        help="frames a gesture has to be seen before the key changes")
+    parser.add_argument("--start-delay", type=float, default=2.0,
+                        help="seconds to wait before starting, to switch to the game window")
+    args = parser.parse_args()
+
+    dry_run = args.dry_run or sys.platform != 'win32'
+    recorder = RecordingKeys()
+    if dry_run:
+        keys = KeyController(recorder.press, recorder.release)
+    else:
+        keys = KeyController(PressKey, ReleaseKey)
+    debouncer = GestureDebouncer(args.hold_frames)
+
+    time.sleep(args.start_delay)
+    video = cv2.VideoCapture(args.video if args.video else args.camera)
+    if not video.isOpened():
+        print("Error: could not open the video source.")
+        return
+
+    frames = 0
+    processing = []      # capture -> decision, every frame
+    key_latency = []     # capture of the deciding frame -> key event
+    gesture_latency = [] # first frame showing the new gesture -> key event (includes debouncing)
+
+    # One hand and the lite model: only the first hand was ever used
+    with mp_hand.Hands(max_num_hands=1, model_complexity=0,
+                       min_detection_confidence=0.5,
+                       min_tracking_confidence=0.5) as hands:
+        try:
+            while True:
+                ret, image = video.read()
+                if not ret:
+                    break
+                captured_at = time.perf_counter()
+                frames += 1
+
+                small = image
+                if args.width and image.shape[1] > args.width:
+                    scale = args.width / image.shape[1]
+                    small = cv2.resize(image, None, fx=scale, fy=scale, interpolation=cv2.INTER_AREA)
+                rgb = cv2.cvtColor(small, cv2.COLOR_BGR2RGB)
+                rgb.flags.writeable = False
+                results = hands.process(rgb)
+
+                hand_landmarks = None
+                gesture = None
+                if results.multi_hand_landmarks:
+                    hand_landmarks = results.multi_hand_landmarks[0]
+                    gesture = gesture_for(count_fingers(hand_landmarks.landmark))
+
+                if debouncer.update(gesture, captured_at):
+                    keys.apply(debouncer.active)
+                    now = time.perf_counter()
+                    key_latency.append(now - captured_at)
+                    gesture_latency.append(now - debouncer.candidate_since)
+                processing.append(time.perf_counter() - captured_at)
+
+                if args.headless:
+                    continue
+                draw(image, hand_landmarks, debouncer.active)
+                cv2.imshow("Frame", image)
+                if cv2.waitKey(1) == ord('q'):
+                    break
+        except KeyboardInterrupt:
+            pass
+        finally:
+            # Never leave the gas or brake held down
+            keys.release_all()
+
+    video.release()
+    if not args.headless:
+        cv2.destroyAllWindows()
+
+    if frames:
+        average = sum(processing) / len(processing)
+        print(f"Processed {frames} frames: avg {average * 1000:.1f} ms, "
+              f"p95 {percentile(processing, 0.95) * 1000:.1f} ms per frame ({1 / average:.1f} FPS)")
+    if key_latency:
+        print(f"{len(key_latency)} key changes. Frame to key: avg {sum(key_latency) / len(key_latency) * 1000:.1f} ms, "
+              f"gesture to key (with debouncing): avg {sum(gesture_latency) / len(gesture_latency) * 1000:.1f} ms")
+    if dry_run:
+        names = {key: gesture for gesture, key in GESTURE_KEYS.items()}
+        start = recorder.events[0][0] if recorder.events else 0
+        for timestamp, action, key in recorder.events:
+            print(f"  {timestamp - start:8.3f}s  {action:<7} {names[key]}")
 
 
-tipIds = [4, 8, 12, 16, 20]
-
-video = cv2.VideoCapture(0)
-
-with mp_hand.Hands(min_detection_confidence=0.5,
-                   min_tracking_confidence=0.5) as hands:
-    while True:
-        keyPressed = False
-        break_pressed = False
-        accelerator_pressed = False
-        key_count = 0
-        key_pressed = 0
-        ret, image = video.read()
-        image = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        image.flags.writeable = False
-        results = hands.process(image)
-        image.flags.writeable = True
-        image = cv2.cvtColor(image, cv2.COLOR_RGB2BGR)
-        lmList = []
-        if results.multi_hand_landmarks:
-            for hand_landmark in results.multi_hand_landmarks:
-                myHands = results.multi_hand_landmarks[0]
-                for id, lm in enumerate(myHands.landmark):
-                    h, w, c = image.shape
-                    cx, cy = int(lm.x*w), int(lm.y*h)
-                    lmList.append([id, cx, cy])
-                mp_draw.draw_landmarks(
-                    image, hand_landmark, mp_hand.HAND_CONNECTIONS)
-        fingers = []
-        if len(lmList) != 0:
-            if lmList[tipIds[0]][1] > lmList[tipIds[0]-1][1]:
-                fingers.append(1)
-            else:
-                fingers.append(0)
-            for id in range(1, 5):
-                if lmList[tipIds[id]][2] < lmList[tipIds[id]-2][2]:
-                    fingers.append(1)
-                else:
-                    fingers.append(0)
-            total = fingers.count(1)
-            if total == 0:
-                cv2.rectangle(image, (20, 300), (270, 425),
-                              (0, 255, 0), cv2.FILLED)
-                cv2.putText(image, "BRAKE", (45, 375), cv2.FONT_HERSHEY_SIMPLEX,
-                            2, (255, 0, 0), 5)
-                PressKey(break_key_pressed)
-                break_pressed = True
-                current_key_pressed.add(break_key_pressed)
-                key_pressed = break_key_pressed
-                keyPressed = True
-                key_count = key_count+1
-            elif total == 5:
-                cv2.rectangle(image, (20, 300), (270, 425),
-                              (0, 255, 0), cv2.FILLED)
-                cv2.putText(image, " GAS", (45, 375), cv2.FONT_HERSHEY_SIMPLEX,
-                            2, (255, 0, 0), 5)
-                PressKey(accelerato_key_pressed)
-                key_pressed = accelerato_key_pressed
-                accelerator_pressed = True
-                keyPressed = True
-                current_key_pressed.add(accelerato_key_pressed)
-                key_count = key_count+1
-        if not keyPressed and len(current_key_pressed) != 0:
-            for key in current_key_pressed:
-                ReleaseKey(key)
-            current_key_pressed = set()
-        elif key_count == 1 and len(current_key_pressed) == 2:
-            for key in current_key_pressed:
-                if key_pressed != key:
-                    ReleaseKey(key)
-            current_key_pressed = set()
-            for key in current_key_pressed:
-                ReleaseKey(key)
-            current_key_pressed = set()
-
-            # if lmList[8][2] < lmList[6][2]:
-            #     print("Open")
-            # else:
-            #     print("Close")
-        cv2.imshow("Frame", image)
-        k = cv2.waitKey(1)
-        if k == ord('q'):
-            break
-video.release()
-cv2.destroyAllWindows()
+if __name__ == "__main__":
+    main()